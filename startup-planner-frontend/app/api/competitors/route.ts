@@ -1,7 +1,6 @@
 import { cookies } from "next/headers";
 import { NextRequest, NextResponse } from "next/server";
 
-
 export async function POST(request: NextRequest) {
 
   const cookieStore = cookies();
@@ -37,9 +36,11 @@ export async function POST(request: NextRequest) {
 
     }
 
-    const successData = await response.json();
+    // Research runs in a background job; the browser polls
+    // /api/research-jobs/<id> until it finishes.
+    const job = await response.json();
 
-    return NextResponse.json(successData, { status: response.status })
+    return NextResponse.json(job, { status: 202 })
 
   } catch (err: any) {
 
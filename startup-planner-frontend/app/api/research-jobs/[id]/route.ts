@@ -0,0 +1,45 @@
+import { cookies } from "next/headers";
+import { NextRequest, NextResponse } from "next/server";
+
+export async function GET(request: NextRequest, { params }: { params: { id: string } }) {
+
+  const jobId = params.id;
+
+  const cookieStore = cookies();
+
+  const SESSION_ID = cookieStore.get('sessionid');
+  const CSRF_TOKEN = cookieStore.get('csrftoken');
+
+  if (!SESSION_ID || !CSRF_TOKEN) {
+    return NextResponse.json({ "message": "Not authorized to access this endpoint." }, { status: 401 })
+  }
+
+  try {
+
+    const response = await fetch(`${process.env.NEXT_PUBLIC_API_URL}/research-jobs/${jobId}/`, {
+      headers: {
+        'Content-Type': 'application/json',
+        'Cookie': `sessionid=${SESSION_ID.value}`
+      },
+      method: 'GET',
+      cache: 'no-store'
+    })
+
+    if (!response.ok) {
+      const errorData = await response.json();
+
+      return NextResponse.json(errorData, { status: response.status })
+    }
+
+    const job = await response.json();
+
+    return NextResponse.json(job, { status: 200 })
+
+  } catch (err: any) {
+
+    console.log("Research Job GET Server Error: ", err);
+
+    return NextResponse.json({ "message": "Internal server error occured." }, { status: 500 })
+
+  }
+}
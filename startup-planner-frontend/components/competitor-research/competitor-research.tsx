@@ -34,6 +34,51 @@ type Competitor = {
   growth_trend: 'Steady' | 'Increasing' | 'Decreasing';
 };
 
+type ResearchJob = {
+  id: number;
+  status: 'Pending' | 'Running' | 'Completed' | 'Failed';
+  error: string;
+  competitors: Competitor[];
+};
+
+const RESEARCH_POLL_INTERVAL_MS = 2000;
+const RESEARCH_TIMEOUT_MS = 10 * 60 * 1000;
+
+const sleep = (ms: number) => new Promise(resolve => setTimeout(resolve, ms));
+
+// Research runs in a background job on the server; poll its status until it
+// finishes, without holding a server request open in the meantime.
+const waitForResearchJob = async (job: ResearchJob): Promise<ResearchJob> => {
+  const deadline = Date.now() + RESEARCH_TIMEOUT_MS;
+
+  while (job.status === 'Pending' || job.status === 'Running') {
+    if (Date.now() >= deadline) {
+      throw new Error("Competitor research is taking longer than expected. Check back later.");
+    }
+
+    await sleep(RESEARCH_POLL_INTERVAL_MS);
+
+    const response = await fetch(`/api/research-jobs/${job.id}`, { method: 'GET' });
+
+    if (!response.ok) {
+      const errorData = await response.json();
+      throw new Error(errorData.message || "Failed to fetch competitor research status");
+    }
+
+    job = await response.json();
+  }
+
+  if (job.status === 'Failed') {
+    throw new Error(job.error || "Competitor research failed.");
+  }
+
+  if (job.status !== 'Completed') {
+    throw new Error(`Unexpected research job status: ${job.status}`);
+  }
+
+  return job;
+};
+
 const CompetitorResearch: React.FC = () => {
   const [competitors, setCompetitors] = useState<Competitor[]>([]);
   const [selectedCompetitor, setSelectedCompetitor] = useState<Competitor | null>(null);
@@ -86,7 +131,8 @@ const CompetitorResearch: React.FC = () => {
         throw new Error(errorData.message || "Failed to generate competitors");
       }
 
-      const newCompetitors = await response.json();
+      const job = await waitForResearchJob(await response.json());
+      const newCompetitors = job.competitors;
       console.log("New competitors: ", newCompetitors);
 
       setCompetitors(prevCompetitors => {
@@ -0,0 +1,107 @@
+import statistics
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from business.models import Business, Competitor
+
+User = get_user_model()
+
+SEED_EMAIL_DOMAIN = 'benchmark.startup-planner.test'
+
+
+class Command(BaseCommand):
+    help = (
+        "Seeds a large synthetic dataset and measures the latency of the business and "
+        "competitor list queries. To compare indexes, run it once, migrate business back "
+        "to 0008, rerun with --no-seed, then migrate forward again."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--businesses', type=int, default=100_000)
+        parser.add_argument('--competitors', type=int, default=1_000_000)
+        parser.add_argument('--businesses-per-user', type=int, default=10)
+        parser.add_argument('--batch-size', type=int, default=10_000)
+        parser.add_argument('--samples', type=int, default=500)
+        parser.add_argument('--no-seed', action='store_true',
+                            help="Reuse previously seeded data")
+        parser.add_argument('--explain', action='store_true',
+                            help="Print the query plan of each benchmarked query")
+
+    def handle(self, *args, **options):
+        if not options['no_seed']:
+            self._seed(options)
+
+        samples = list(Business.objects.filter(user__email__endswith=SEED_EMAIL_DOMAIN)
+                       .order_by('?').values_list('id', 'user_id')[:options['samples']])
+        if not samples:
+            self.stderr.write("No seeded businesses found, run without --no-seed first.")
+            return
+
+        queries = {
+            'business list': lambda business_id, user_id: Business.objects.filter(user_id=user_id)[:10],
+            'competitor list': lambda business_id, user_id: (
+                Competitor.objects.for_user(user_id).filter(business_id=business_id)
+                .order_by('id').with_details()[:10]),
+            'competitor count': lambda business_id, user_id: [
+                Competitor.objects.for_user(user_id).filter(business_id=business_id).count()],
+            'competitor by name': lambda business_id, user_id: Competitor.objects.filter(
+                business_id=business_id, name='Competitor 0'),
+        }
+
+        for name, build_query in queries.items():
+            if options['explain']:
+                queryset = build_query(*samples[0])
+                if hasattr(queryset, 'explain'):
+                    self.stdout.write(f"{name} plan:\n{queryset.explain()}")
+            self._report(name, [self._time(build_query, *sample)
+                         for sample in samples])
+
+    def _seed(self, options):
+        batch_size = options['batch_size']
+        business_count = options['businesses']
+        user_count = max(1, business_count // options['businesses_per_user'])
+
+        started = time.monotonic()
+        with transaction.atomic():
+            users = User.objects.bulk_create(
+                (User(email=f'user{index}@{SEED_EMAIL_DOMAIN}', password='!')
+                 for index in range(user_count)),
+                batch_size=batch_size)
+
+            for offset in range(0, business_count, batch_size):
+                Business.objects.bulk_create(
+                    Business(user=users[index % user_count], name=f'Business {index}',
+                             industry='Benchmark', description='Seeded for benchmarking',
+                             stage=Business.Stage.IDEA)
+                    for index in range(offset, min(offset + batch_size, business_count)))
+
+            business_ids = list(Business.objects.filter(
+                user__email__endswith=SEED_EMAIL_DOMAIN).values_list('id', flat=True))
+            for offset in range(0, options['competitors'], batch_size):
+                Competitor.objects.bulk_create(
+                    Competitor(business_id=business_ids[index % len(business_ids)],
+                               name=f'Competitor {index // len(business_ids)}',
+                               industry='Benchmark', product='Product', market_share=1,
+                               website='https://example.com',
+                               growth_trend=Competitor.GrowthTrend.STEADY)
+                    for index in range(offset, min(offset + batch_size, options['competitors'])))
+
+        self.stdout.write(
+            f"Seeded {user_count} users, {business_count} businesses and "
+            f"{options['competitors']} competitors in {time.monotonic() - started:.1f}s")
+
+    @staticmethod
+    def _time(build_query, business_id, user_id) -> float:
+        started = time.perf_counter()
+        list(build_query(business_id, user_id))
+        return (time.perf_counter() - started) * 1000
+
+    def _report(self, name, timings):
+        timings.sort()
+        p95 = timings[min(len(timings) - 1, int(len(timings) * 0.95))]
+        self.stdout.write(
+            f"{name:<20} mean {statistics.mean(timings):7.2f}ms  "
+            f"p50 {statistics.median(timings):7.2f}ms  p95 {p95:7.2f}ms")
@@ -0,0 +1,177 @@
+import os
+import signal
+import socket
+import statistics
+import subprocess
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from importlib import import_module
+
+import requests
+from django.conf import settings
+from django.contrib.auth import BACKEND_SESSION_KEY, HASH_SESSION_KEY, SESSION_KEY, get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.urls import reverse
+from django.utils.crypto import get_random_string
+
+from business.models import Business, Competitor, ResearchJob
+
+User = get_user_model()
+
+BENCHMARK_EMAIL = 'server@benchmark.startup-planner.test'
+PROFILES = ('sync', 'gthread', 'uvicorn')
+ENDPOINTS = ('business list', 'competitor list', 'research request', 'check auth')
+
+
+class Command(BaseCommand):
+    help = (
+        "Load tests the API endpoints, either against a running server (--url) or by starting "
+        "gunicorn with each server profile in turn (--profile, see gunicorn.conf.py). Research "
+        "requests only queue jobs, and the OpenAI client of the started servers points at an "
+        "unreachable address, so no OpenAI calls are made."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--profile', action='append', dest='profiles', choices=PROFILES,
+                            help="Start gunicorn with this worker class and benchmark it (repeatable)")
+        parser.add_argument('--url', default='http://127.0.0.1:8000',
+                            help="Server to benchmark when no --profile is given")
+        parser.add_argument('--conn-max-age', action='append', dest='conn_max_ages', type=int, metavar='SECONDS',
+                            help="DATABASE_CONN_MAX_AGE of started servers; repeat to compare values")
+        parser.add_argument('--pool', action='store_true',
+                            help="Also benchmark each profile with DATABASE_POOL enabled")
+        parser.add_argument('--endpoint', action='append', dest='endpoints', choices=ENDPOINTS,
+                            help="Only benchmark this endpoint (repeatable)")
+        parser.add_argument('--workers', type=int, help="WEB_CONCURRENCY of started servers")
+        parser.add_argument('--threads', type=int, help="GUNICORN_THREADS of started gthread servers")
+        parser.add_argument('--requests', type=int, default=500, help="Requests per endpoint")
+        parser.add_argument('--concurrency', type=int, default=16, help="Concurrent clients")
+        parser.add_argument('--competitors', type=int, default=50,
+                            help="Competitors seeded for the benchmark business")
+
+    def handle(self, *args, **options):
+        business, session_key, csrf_token = self._prepare(options['competitors'])
+        endpoints = {
+            'business list': ('GET', reverse('business:business-list-create'), None),
+            'competitor list': ('GET', f"{reverse('business:competitor-list')}?businessId={business.id}", None),
+            'research request': ('POST', reverse('business:competitor-list'), {'id': business.id}),
+            'check auth': ('GET', reverse('canva_auth:check_auth'), None),
+        }
+        if options['endpoints']:
+            endpoints = {name: endpoint for name, endpoint in endpoints.items() if name in options['endpoints']}
+        cookies = {settings.SESSION_COOKIE_NAME: session_key, settings.CSRF_COOKIE_NAME: csrf_token}
+
+        try:
+            if not options['profiles']:
+                self._benchmark(options['url'], endpoints, cookies, csrf_token, options)
+                return
+            for profile, database_env in self._server_variants(options):
+                port = self._free_port()
+                server = self._start_server(profile, port, options, database_env)
+                try:
+                    self._wait_until_ready(server, f"http://127.0.0.1:{port}")
+                    variant = ', '.join(f"{key}={value}" for key, value in database_env.items())
+                    self.stdout.write(self.style.MIGRATE_HEADING(
+                        f"Profile {profile}" + (f" ({variant})" if variant else '')))
+                    self._benchmark(f"http://127.0.0.1:{port}", endpoints, cookies, csrf_token, options)
+                finally:
+                    server.send_signal(signal.SIGTERM)
+                    server.wait(timeout=60)
+        finally:
+            # Never leave benchmark jobs for the research workers.
+            ResearchJob.objects.filter(business=business).delete()
+
+    def _prepare(self, competitor_count):
+        user, _ = User.objects.get_or_create(email=BENCHMARK_EMAIL, defaults={'password': '!'})
+        business, _ = Business.objects.get_or_create(
+            user=user, name='Benchmark Business',
+            defaults={'industry': 'Benchmark', 'description': 'Seeded for benchmarking',
+                      'stage': Business.Stage.IDEA})
+        existing = Competitor.objects.filter(business=business).count()
+        Competitor.objects.bulk_create(
+            Competitor(business=business, name=f'Competitor {index}', industry='Benchmark',
+                       product='Product', market_share=1, website='https://example.com',
+                       growth_trend=Competitor.GrowthTrend.STEADY)
+            for index in range(existing, competitor_count))
+
+        session = import_module(settings.SESSION_ENGINE).SessionStore()
+        session[SESSION_KEY] = str(user.pk)
+        session[BACKEND_SESSION_KEY] = settings.AUTHENTICATION_BACKENDS[0]
+        session[HASH_SESSION_KEY] = user.get_session_auth_hash()
+        session.save()
+        return business, session.session_key, get_random_string(32)
+
+    @staticmethod
+    def _free_port() -> int:
+        with socket.socket() as sock:
+            sock.bind(('127.0.0.1', 0))
+            return sock.getsockname()[1]
+
+    @staticmethod
+    def _server_variants(options):
+        """
+        Yields each profile with the database settings to start it with.
+        """
+        database_envs = [{'DATABASE_CONN_MAX_AGE': str(max_age)} for max_age in options['conn_max_ages'] or []]
+        if options['pool']:
+            database_envs.append({'DATABASE_POOL': 'true'})
+        for profile in options['profiles']:
+            for database_env in database_envs or [{}]:
+                yield profile, database_env
+
+    def _start_server(self, profile, port, options, database_env) -> subprocess.Popen:
+        env = dict(os.environ, GUNICORN_WORKER_CLASS=profile, GUNICORN_BIND=f'127.0.0.1:{port}',
+                   GUNICORN_ACCESS_LOG='', OPENAI_BASE_URL='http://127.0.0.1:9', **database_env)
+        env.setdefault('OPENAI_API_KEY', 'sk-benchmark')
+        if options['workers']:
+            env['WEB_CONCURRENCY'] = str(options['workers'])
+        if options['threads']:
+            env['GUNICORN_THREADS'] = str(options['threads'])
+        return subprocess.Popen(['gunicorn'], cwd=settings.BASE_DIR, env=env)
+
+    @staticmethod
+    def _wait_until_ready(server, base_url, timeout=60):
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if server.poll() is not None:
+                raise CommandError(f"Server exited with status {server.returncode}")
+            try:
+                requests.get(base_url, timeout=1)
+                return
+            except (requests.ConnectionError, requests.Timeout):
+                time.sleep(0.2)
+        raise CommandError(f"Server did not start within {timeout}s")
+
+    def _benchmark(self, base_url, endpoints, cookies, csrf_token, options):
+        local = threading.local()
+
+        def get_session():
+            if not hasattr(local, 'session'):
+                local.session = requests.Session()
+                local.session.cookies.update(cookies)
+                local.session.headers.update({'X-CSRFToken': csrf_token, 'Referer': base_url})
+            return local.session
+
+        def send(method, path, payload):
+            started = time.perf_counter()
+            response = get_session().request(method, f"{base_url}{path}", json=payload, timeout=30)
+            return (time.perf_counter() - started) * 1000, response.status_code
+
+        for name, (method, path, payload) in endpoints.items():
+            with ThreadPoolExecutor(max_workers=options['concurrency']) as executor:
+                # Warm up each client's connection and the server's workers first.
+                list(executor.map(lambda _: send(method, path, payload), range(options['concurrency'])))
+                started = time.perf_counter()
+                results = list(executor.map(lambda _: send(method, path, payload), range(options['requests'])))
+                elapsed = time.perf_counter() - started
+            self._report(name, results, elapsed)
+
+    def _report(self, name, results, elapsed):
+        timings = sorted(timing for timing, _ in results)
+        errors = sum(1 for _, status_code in results if status_code >= 400)
+        p95 = timings[min(len(timings) - 1, int(len(timings) * 0.95))]
+        p99 = timings[min(len(timings) - 1, int(len(timings) * 0.99))]
+        self.stdout.write(
+            f"{name:<18} {len(results) / elapsed:8.1f} req/s  mean {statistics.mean(timings):7.2f}ms  "
+            f"p50 {statistics.median(timings):7.2f}ms  p95 {p95:7.2f}ms  p99 {p99:7.2f}ms  errors {errors}")
@@ -0,0 +1,97 @@
+from datetime import datetime
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from business.services.competitor_research_service import CompetitorResearchService
+from business.services.rate_limiter import RateLimiter
+from business.services.research_batch_service import ResearchBatch, ResearchCheckpoint
+
+
+class Command(BaseCommand):
+    help = (
+        "Researches competitors for a batch of businesses, selected by owner, industry or how long ago "
+        "they were last researched, with bounded concurrency and shared rate limits. Progress is "
+        "checkpointed to a file so an interrupted batch can be resumed by rerunning the same command; "
+        "the file is removed once every selected business was researched."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--user', action='append', dest='users', metavar='EMAIL',
+                            help="Only businesses of this user (repeatable)")
+        parser.add_argument('--industry', action='append', dest='industries',
+                            help="Only businesses in this industry (repeatable)")
+        parser.add_argument('--business', action='append', dest='business_ids', type=int, metavar='ID',
+                            help="Only this business (repeatable)")
+        parser.add_argument('--stale-since', metavar='YYYY-MM-DD',
+                            help="Only businesses not successfully researched since this date")
+        parser.add_argument('--limit', type=int, help="Research at most this many businesses")
+        parser.add_argument('--concurrency', type=int,
+                            help="Businesses researched at once (defaults to RESEARCH_WORKER_CONCURRENCY)")
+        parser.add_argument('--openai-rpm', type=float, default=settings.RESEARCH_OPENAI_RPM,
+                            help="OpenAI requests per minute across all workers (0 for no limit)")
+        parser.add_argument('--search-rpm', type=float, default=settings.RESEARCH_SEARCH_RPM,
+                            help="Internet searches per minute across all workers (0 for no limit)")
+        parser.add_argument('--checkpoint', default='research_checkpoint.json',
+                            help="File recording finished businesses; reused to resume the same selection")
+        parser.add_argument('--fresh', action='store_true',
+                            help="Ignore and remove an existing checkpoint")
+        parser.add_argument('--dry-run', action='store_true',
+                            help="Only print how many businesses would be researched")
+
+    def handle(self, *args, **options):
+        stale_since = None
+        if options['stale_since']:
+            try:
+                stale_since = timezone.make_aware(datetime.strptime(options['stale_since'], '%Y-%m-%d'))
+            except ValueError:
+                raise CommandError("--stale-since must be a date in YYYY-MM-DD format")
+
+        businesses = ResearchBatch.select_businesses(
+            user_emails=options['users'], industries=options['industries'],
+            stale_since=stale_since, business_ids=options['business_ids'])
+        business_ids = businesses.values_list('id', flat=True)
+        if options['limit']:
+            business_ids = business_ids[:options['limit']]
+        business_ids = list(business_ids)
+
+        checkpoint = ResearchCheckpoint(options['checkpoint'], selection={
+            'users': sorted(options['users'] or []), 'industries': sorted(options['industries'] or []),
+            'business_ids': sorted(options['business_ids'] or []), 'stale_since': options['stale_since'],
+            'limit': options['limit'],
+        })
+        if options['fresh']:
+            checkpoint.clear()
+        remaining = sum(1 for business_id in business_ids if not checkpoint.is_done(business_id))
+        self.stdout.write(
+            f"Selected {len(business_ids)} businesses, {remaining} left to research")
+        if options['dry_run'] or not remaining:
+            return
+
+        openai_limiter = RateLimiter.per_minute(options['openai_rpm'])
+        search_limiter = RateLimiter.per_minute(options['search_rpm'])
+        research_service = CompetitorResearchService(
+            openai_rate_limiter=openai_limiter, search_rate_limiter=search_limiter)
+
+        def report(result, batch):
+            done = batch.processed + batch.skipped
+            self.stdout.write(
+                f"[{done}/{remaining}] business {result.business_id}: {result.status} "
+                f"({result.competitors} competitors, {result.seconds:.1f}s) "
+                f"- {batch.throughput:.1f} businesses/min")
+
+        batch = ResearchBatch(research_service, concurrency=options['concurrency'],
+                              checkpoint=checkpoint, on_result=report).run(business_ids)
+
+        self.stdout.write(self.style.SUCCESS(f"Finished: {batch.summary()}"))
+        if not batch.failed and not batch.skipped:
+            # Nothing left to resume; a later run must not treat these as done.
+            checkpoint.clear()
+        else:
+            self.stdout.write(f"Rerun the same command to retry the rest, checkpoint: {options['checkpoint']}")
+        for name, limiter in (('OpenAI', openai_limiter), ('search', search_limiter)):
+            if limiter is not None:
+                self.stdout.write(f"Waited {limiter.waited:.1f}s on the {name} rate limit")
+        if research_service.search_cache is not None:
+            self.stdout.write(f"Search cache: {research_service.search_cache.stats()}")
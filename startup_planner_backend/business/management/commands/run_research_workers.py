@@ -0,0 +1,93 @@
+import asyncio
+import signal
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from business.services.async_competitor_research_service import AsyncCompetitorResearchService
+from business.services.competitor_research_service import CompetitorResearchService
+from business.services.rate_limiter import RateLimiter
+from business.services.research_job_service import AsyncResearchWorker, ResearchWorkerPool
+
+
+class Command(BaseCommand):
+    help = "Runs a pool of workers that process queued competitor research jobs."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--concurrency', type=int,
+                            help="Number of worker threads (defaults to RESEARCH_WORKER_CONCURRENCY)")
+        parser.add_argument('--poll-interval', type=float,
+                            help="Seconds an idle worker waits before checking the queue again")
+        parser.add_argument('--once', action='store_true',
+                            help="Process the jobs currently queued and exit")
+        parser.add_argument('--async', action='store_true', dest='use_async',
+                            help="Run jobs concurrently on an event loop instead of worker threads")
+        parser.add_argument('--max-in-flight', type=int,
+                            help="Jobs run at once with --async (defaults to RESEARCH_ASYNC_MAX_IN_FLIGHT)")
+        parser.add_argument('--openai-rpm', type=float, default=settings.RESEARCH_OPENAI_RPM,
+                            help="OpenAI requests per minute with --async (0 for no limit)")
+        parser.add_argument('--search-rpm', type=float, default=settings.RESEARCH_SEARCH_RPM,
+                            help="Internet searches per minute with --async (0 for no limit)")
+
+    def handle(self, *args, **options):
+        if options['use_async']:
+            asyncio.run(self.handle_async(options))
+            return
+
+        pool = ResearchWorkerPool(
+            CompetitorResearchService(),
+            concurrency=options['concurrency'],
+            poll_interval=options['poll_interval'],
+        )
+
+        if options['once']:
+            processed = pool.run_until_empty()
+            self.stdout.write(self.style.SUCCESS(
+                f"Processed {processed} research jobs"))
+            return
+
+        shutdown = threading.Event()
+        signal.signal(signal.SIGTERM, lambda *_: shutdown.set())
+        signal.signal(signal.SIGINT, lambda *_: shutdown.set())
+
+        pool.start()
+        self.stdout.write(self.style.SUCCESS(
+            f"Started {pool.concurrency} research workers"))
+        shutdown.wait()
+
+        self.stdout.write("Shutting down research workers...")
+        pool.stop()
+
+    async def handle_async(self, options):
+        max_in_flight = options['max_in_flight'] or settings.RESEARCH_ASYNC_MAX_IN_FLIGHT
+        # Every job in flight may be searching at once; tool calls are timed
+        # from when their search starts, so calls queued here are not failed.
+        search_executor = ThreadPoolExecutor(max_workers=max_in_flight, thread_name_prefix='internet-search')
+        research_service = AsyncCompetitorResearchService(
+            search_executor=search_executor,
+            openai_rate_limiter=RateLimiter.per_minute(options['openai_rpm']),
+            search_rate_limiter=RateLimiter.per_minute(options['search_rpm']),
+        )
+        worker = AsyncResearchWorker(
+            research_service,
+            max_in_flight=max_in_flight,
+            poll_interval=options['poll_interval'],
+        )
+
+        if options['once']:
+            processed = await worker.run(once=True)
+            self.stdout.write(self.style.SUCCESS(
+                f"Processed {processed} research jobs"))
+            return
+
+        shutdown = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        loop.add_signal_handler(signal.SIGTERM, shutdown.set)
+        loop.add_signal_handler(signal.SIGINT, shutdown.set)
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Started async research worker with up to {worker.max_in_flight} jobs in flight"))
+        await worker.run(stop=shutdown)
+        self.stdout.write("Research worker stopped")
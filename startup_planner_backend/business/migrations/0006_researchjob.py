@@ -0,0 +1,35 @@
+# Generated by Django 5.2.18 on 2026-10-18 13:05
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('business', '0005_alter_competitor_market_share'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ResearchJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('status', models.CharField(choices=[('Pending', 'Pending'), ('Running', 'Running'), ('Completed', 'Completed'), ('Failed', 'Failed')], default='Pending', max_length=10, verbose_name='Status')),
+                ('progress', models.CharField(blank=True, max_length=255, verbose_name='Progress')),
+                ('error', models.TextField(blank=True, verbose_name='Error')),
+                ('attempts', models.PositiveSmallIntegerField(default=0, verbose_name='Attempts')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Created At')),
+                ('started_at', models.DateTimeField(blank=True, null=True, verbose_name='Started At')),
+                ('finished_at', models.DateTimeField(blank=True, null=True, verbose_name='Finished At')),
+                ('business', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='research_jobs', to='business.business', verbose_name='Business')),
+                ('competitors', models.ManyToManyField(blank=True, related_name='research_jobs', to='business.competitor', verbose_name='Competitors')),
+            ],
+            options={
+                'verbose_name': 'Research Job',
+                'verbose_name_plural': 'Research Jobs',
+                'ordering': ['created_at'],
+                'indexes': [models.Index(fields=['status', 'created_at'], name='research_job_queue_idx')],
+            },
+        ),
+    ]
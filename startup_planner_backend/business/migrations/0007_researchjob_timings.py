@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 13:07
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('business', '0006_researchjob'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='researchjob',
+            name='timings',
+            field=models.JSONField(blank=True, default=dict, verbose_name='Phase Timings (ms)'),
+        ),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 5.2.18 on 2026-10-18 13:11
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('business', '0007_researchjob_timings'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AssistantRegistration',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('definition_hash', models.CharField(max_length=64, unique=True, verbose_name='Definition Hash')),
+                ('assistant_id', models.CharField(max_length=255, verbose_name='Assistant ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Created At')),
+            ],
+            options={
+                'verbose_name': 'Assistant Registration',
+                'verbose_name_plural': 'Assistant Registrations',
+            },
+        ),
+    ]
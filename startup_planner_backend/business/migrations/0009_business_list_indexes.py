@@ -0,0 +1,36 @@
+# Generated by Django 5.2.18 on 2026-10-18 13:15
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('business', '0008_assistantregistration'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        # Create the composite indexes before dropping the single column
+        # foreign key indexes they make redundant.
+        migrations.AddIndex(
+            model_name='business',
+            index=models.Index(fields=['user', '-created_at'], name='business_user_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='competitor',
+            index=models.Index(fields=['business', 'id'], name='competitor_business_id_idx'),
+        ),
+        migrations.AlterField(
+            model_name='business',
+            name='user',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='businesses', to=settings.AUTH_USER_MODEL, verbose_name='Owner'),
+        ),
+        migrations.AlterField(
+            model_name='competitor',
+            name='business',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='competitors', to='business.business', verbose_name='Business'),
+        ),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 5.2.18 on 2026-10-18 13:36
+
+import django.core.serializers.json
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('business', '0009_business_list_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ResearchSnapshot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('industry_fingerprint', models.CharField(max_length=64, verbose_name='Industry Fingerprint')),
+                ('description_shingles', models.JSONField(default=list, verbose_name='Description Shingles')),
+                ('competitors', models.JSONField(encoder=django.core.serializers.json.DjangoJSONEncoder, verbose_name='Competitors')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Created At')),
+                ('business', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='research_snapshots', to='business.business', verbose_name='Business')),
+            ],
+            options={
+                'verbose_name': 'Research Snapshot',
+                'verbose_name_plural': 'Research Snapshots',
+                'indexes': [models.Index(fields=['industry_fingerprint', '-created_at'], name='research_snapshot_lookup_idx')],
+            },
+        ),
+    ]
@@ -1,4 +1,5 @@
 from django.db import models
+from django.core.serializers.json import DjangoJSONEncoder
 from django.contrib.auth import get_user_model
 from django.utils.translation import gettext_lazy as _
 from django.core.validators import MinValueValidator, MaxValueValidator
@@ -18,7 +19,9 @@ class Business(models.Model):
         User,
         on_delete=models.CASCADE,
         related_name='businesses',
-        verbose_name=_("Owner")
+        verbose_name=_("Owner"),
+        # Covered by the (user, -created_at) index below.
+        db_index=False
     )
     name = models.CharField(_("Business Name"), max_length=255)
     industry = models.CharField(_("Industry"), max_length=255)
@@ -38,11 +41,32 @@ class Business(models.Model):
         verbose_name = _("Business")
         verbose_name_plural = _("Businesses")
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['user', '-created_at'],
+                         name='business_user_created_idx'),
+        ]
 
     def __str__(self):
         return self.name
 
 
+class CompetitorQuerySet(models.QuerySet):
+    def for_user(self, user):
+        return self.filter(business__user=user)
+
+    def with_details(self):
+        """
+        Prefetches strengths and weaknesses (only the columns the API returns)
+        so serializing any number of competitors takes a constant number of queries.
+        """
+        return self.prefetch_related(
+            models.Prefetch('strengths', queryset=CompetitorStrength.objects.only(
+                'id', 'competitor_id', 'description')),
+            models.Prefetch('weaknesses', queryset=CompetitorWeakness.objects.only(
+                'id', 'competitor_id', 'description')),
+        )
+
+
 class Competitor(models.Model):
     class GrowthTrend(models.TextChoices):
         STEADY = 'Steady', _('Steady')
@@ -53,7 +77,9 @@ class Competitor(models.Model):
         Business,
         on_delete=models.CASCADE,
         related_name="competitors",
-        verbose_name=_("Business")
+        verbose_name=_("Business"),
+        # Covered by the (business, name) and (business, id) indexes.
+        db_index=False
     )
     name = models.CharField(_("Name"), max_length=255)
     industry = models.CharField(_("Industry"), max_length=255)
@@ -72,11 +98,17 @@ class Competitor(models.Model):
     growth_trend = models.CharField(
         _("Growth Trend"), max_length=10, choices=GrowthTrend.choices)
 
+    objects = CompetitorQuerySet.as_manager()
+
     def __str__(self):
         return self.name
 
     class Meta:
         unique_together = ('business', 'name')
+        indexes = [
+            models.Index(fields=['business', 'id'],
+                         name='competitor_business_id_idx'),
+        ]
 
 
 class CompetitorStrength(models.Model):
@@ -95,3 +127,104 @@ class CompetitorWeakness(models.Model):
 
     def __str__(self):
         return f"{self.competitor.name} - {self.description}"
+
+
+class ResearchJob(models.Model):
+    class Status(models.TextChoices):
+        PENDING = 'Pending', _('Pending')
+        RUNNING = 'Running', _('Running')
+        COMPLETED = 'Completed', _('Completed')
+        FAILED = 'Failed', _('Failed')
+
+    business = models.ForeignKey(
+        Business,
+        on_delete=models.CASCADE,
+        related_name='research_jobs',
+        verbose_name=_("Business")
+    )
+    status = models.CharField(
+        _("Status"), max_length=10, choices=Status.choices, default=Status.PENDING)
+    progress = models.CharField(_("Progress"), max_length=255, blank=True)
+    error = models.TextField(_("Error"), blank=True)
+    attempts = models.PositiveSmallIntegerField(_("Attempts"), default=0)
+    timings = models.JSONField(_("Phase Timings (ms)"), default=dict, blank=True)
+    competitors = models.ManyToManyField(
+        Competitor,
+        related_name='research_jobs',
+        blank=True,
+        verbose_name=_("Competitors")
+    )
+    created_at = models.DateTimeField(_("Created At"), auto_now_add=True)
+    started_at = models.DateTimeField(_("Started At"), null=True, blank=True)
+    # Touched periodically while the job runs, so long runs are not mistaken for crashed ones.
+    heartbeat_at = models.DateTimeField(_("Heartbeat At"), null=True, blank=True)
+    finished_at = models.DateTimeField(_("Finished At"), null=True, blank=True)
+
+    class Meta:
+        verbose_name = _("Research Job")
+        verbose_name_plural = _("Research Jobs")
+        ordering = ['created_at']
+        indexes = [
+            models.Index(fields=['status', 'created_at'],
+                         name='research_job_queue_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.business.name} - {self.status}"
+
+    @property
+    def is_finished(self):
+        return self.status in (self.Status.COMPLETED, self.Status.FAILED)
+
+
+class AssistantRegistration(models.Model):
+    """
+    OpenAI assistant created for a given assistant definition, so workers can
+    reuse it without listing assistants and only recreate it when the
+    definition (instructions, model, tools) changes.
+    """
+    definition_hash = models.CharField(
+        _("Definition Hash"), max_length=64, unique=True)
+    assistant_id = models.CharField(_("Assistant ID"), max_length=255)
+    created_at = models.DateTimeField(_("Created At"), auto_now_add=True)
+
+    class Meta:
+        verbose_name = _("Assistant Registration")
+        verbose_name_plural = _("Assistant Registrations")
+
+    def __str__(self):
+        return self.assistant_id
+
+
+class ResearchSnapshot(models.Model):
+    """
+    Competitors found by a research run, kept so that a business in the same
+    industry with a similar description can reuse them instead of paying for
+    a new assistant run.
+    """
+    business = models.ForeignKey(
+        Business,
+        on_delete=models.SET_NULL,
+        related_name='research_snapshots',
+        verbose_name=_("Business"),
+        null=True,
+    )
+    industry_fingerprint = models.CharField(
+        _("Industry Fingerprint"), max_length=64)
+    # Hashed word shingles of the business description.
+    description_shingles = models.JSONField(
+        _("Description Shingles"), default=list)
+    competitors = models.JSONField(
+        _("Competitors"), encoder=DjangoJSONEncoder)
+    created_at = models.DateTimeField(_("Created At"), auto_now_add=True)
+
+    class Meta:
+        verbose_name = _("Research Snapshot")
+        verbose_name_plural = _("Research Snapshots")
+        indexes = [
+            models.Index(fields=['industry_fingerprint', '-created_at'],
+                         name='research_snapshot_lookup_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.industry_fingerprint[:12]} - {self.created_at}"
@@ -0,0 +1,76 @@
+from rest_framework.pagination import CursorPagination, PageNumberPagination
+
+
+class StandardResultsSetPagination(PageNumberPagination):
+    page_size = 10
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+
+
+class StandardCursorPagination(CursorPagination):
+    page_size = 10
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+
+
+class SwitchablePagination:
+    """
+    Page-number pagination by default, keyset (cursor) pagination when the
+    client sends ``?pagination=cursor`` or a ``cursor`` token. Cursor pages
+    avoid the COUNT(*) and OFFSET scans of page numbers, so deep pages stay
+    as cheap as the first one.
+
+    Subclasses set ``ordering`` to a unique, indexed ordering for cursors.
+    """
+    page_number_class = StandardResultsSetPagination
+    cursor_class = StandardCursorPagination
+    ordering = ('id',)
+    # When False, responses are only paginated if the client asks for it.
+    paginate_by_default = True
+
+    def __init__(self):
+        self.paginator = None
+
+    def get_paginator(self, request):
+        params = request.query_params
+        if params.get('pagination') == 'cursor' or 'cursor' in params:
+            paginator = self.cursor_class()
+            paginator.ordering = self.ordering
+            return paginator
+
+        if self.paginate_by_default or 'page' in params or 'page_size' in params:
+            return self.page_number_class()
+        return None
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.paginator = self.get_paginator(request)
+        if self.paginator is None:
+            return None
+        return self.paginator.paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        return self.paginator.get_paginated_response(data)
+
+    @property
+    def display_page_controls(self):
+        return self.paginator is not None and self.paginator.display_page_controls
+
+    def to_html(self):
+        return self.paginator.to_html()
+
+    def get_paginated_response_schema(self, schema):
+        return self.page_number_class().get_paginated_response_schema(schema)
+
+    def get_schema_operation_parameters(self, view):
+        return self.page_number_class().get_schema_operation_parameters(view)
+
+
+class CompetitorPagination(SwitchablePagination):
+    ordering = ('id',)
+
+
+class BusinessPagination(SwitchablePagination):
+    ordering = ('-created_at', '-id')
+    # Business lists were historically unpaginated; keep returning the full
+    # list unless the client asks for a page.
+    paginate_by_default = False
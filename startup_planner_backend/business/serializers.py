@@ -1,6 +1,6 @@
 from decimal import Decimal
 from rest_framework import serializers
-from .models import Business, Competitor, CompetitorStrength, CompetitorWeakness
+from .models import Business, Competitor, CompetitorStrength, CompetitorWeakness, ResearchJob
 
 
 class BusinessSerializer(serializers.ModelSerializer):
@@ -48,11 +48,31 @@ class CompetitorSerializer(serializers.ModelSerializer):
 
         competitor = Competitor.objects.create(**validated_data)
 
-        for strength_data in strengths_data:
-            CompetitorStrength.objects.create(
-                competitor=competitor, **strength_data)
-        for weakness_data in weaknesses_data:
-            CompetitorWeakness.objects.create(
-                competitor=competitor, **weakness_data)
+        CompetitorStrength.objects.bulk_create(
+            CompetitorStrength(competitor=competitor, **strength_data) for strength_data in strengths_data)
+        CompetitorWeakness.objects.bulk_create(
+            CompetitorWeakness(competitor=competitor, **weakness_data) for weakness_data in weaknesses_data)
 
         return competitor
+
+
+class CompetitorDataSerializer(CompetitorSerializer):
+    """
+    Validates competitor data for a business that is already known, without
+    the per-item business lookup and uniqueness queries of CompetitorSerializer.
+    """
+    business = None
+
+    class Meta(CompetitorSerializer.Meta):
+        fields = [field for field in CompetitorSerializer.Meta.fields
+                  if field not in ('business', 'id')]
+
+
+class ResearchJobSerializer(serializers.ModelSerializer):
+    competitors = CompetitorSerializer(many=True, read_only=True)
+
+    class Meta:
+        model = ResearchJob
+        fields = ['id', 'business', 'status', 'progress', 'error', 'competitors',
+                  'timings', 'created_at', 'started_at', 'finished_at']
+        read_only_fields = fields
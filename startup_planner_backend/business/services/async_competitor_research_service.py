@@ -0,0 +1,256 @@
+import asyncio
+import logging
+import os
+import time
+from dataclasses import dataclass
+from typing import Awaitable, Callable, List, Optional
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from openai import AsyncOpenAI, APIError, BadRequestError
+
+from ..models import Business, Competitor
+from .competitor_research_service import CompetitorResearchService
+from .response_parser import get_competitor_response_format
+from startup_planner_backend.metrics import PhaseTimer
+
+logger = logging.getLogger(__name__)
+
+async_client = AsyncOpenAI(api_key=os.getenv('OPENAI_API_KEY'))
+
+
+async def _ignore_progress(phase: str):
+    pass
+
+
+@dataclass
+class AsyncCompetitorResearchService(CompetitorResearchService):
+    """
+    Event loop based variant of ``CompetitorResearchService``.
+
+    OpenAI calls go through ``AsyncOpenAI`` and run polling awaits instead of
+    sleeping, so one process can hold many runs in flight while they wait on
+    the assistant. Searches still use the shared search executor (DuckDuckGo
+    has no native async client) and database work is handed to Django's sync
+    thread.
+    """
+
+    async def _athrottle_openai(self):
+        if self.openai_rate_limiter is not None:
+            await self.openai_rate_limiter.aacquire()
+
+    async def aresearch_competitors(self, business: Business,
+                                    on_progress: Optional[Callable[[str], Awaitable[None]]] = None,
+                                    timer: Optional[PhaseTimer] = None) -> List[Competitor]:
+        report = on_progress or _ignore_progress
+        timer = timer or PhaseTimer()
+
+        existing_competitors = [name async for name in Competitor.objects.filter(
+            business=business).values_list('name', flat=True)]
+
+        match = None
+        if self.research_reuse is not None:
+            with timer.phase('reuse_lookup'):
+                match = await sync_to_async(self.research_reuse.find_similar)(
+                    business, exclude_names=existing_competitors)
+        if match and self.research_reuse.mode == 'replace':
+            await report("Reusing research of a similar business")
+            with timer.phase('persist'):
+                competitors = await sync_to_async(self._create_competitors)(match.competitors, business)
+            if competitors:
+                logger.info(f"Research latency for business {business.id}: {timer.summary()}")
+                return competitors
+
+        await report("Creating research thread")
+        with timer.phase('thread_create'):
+            await self._athrottle_openai()
+            thread = await async_client.beta.threads.create()
+            prompt = self._build_prompt(business, existing_competitors,
+                                        similar_competitors=match.competitors if match else None)
+            await self._athrottle_openai()
+            await async_client.beta.threads.messages.create(
+                thread_id=thread.id, role="user", content=prompt)
+        await report("Researching competitors")
+        messages = await self._acreate_and_wait_for_run(thread.id, timer)
+        await report("Saving competitors")
+        with timer.phase('persist'):
+            competitors = await sync_to_async(self._process_response)(messages, business)
+
+        logger.info(f"Research latency for business {business.id}: {timer.summary()}")
+        return competitors
+
+    async def _acreate_and_wait_for_run(self, thread_id: str, timer: PhaseTimer):
+        if settings.RESEARCH_RUN_MODE == 'stream':
+            try:
+                return await self._astream_run(thread_id, timer)
+            except APIError as e:
+                logger.warning(
+                    f"Could not stream run, falling back to polling: {e}")
+
+        with timer.phase('run_create'):
+            run = await self._acreate_run(thread_id)
+        return await self._apoll_run(thread_id, run.id, timer)
+
+    async def _acreate_run(self, thread_id: str, **kwargs):
+        assistant_id = await sync_to_async(self.get_assistant_id)()
+        await self._athrottle_openai()
+        if self.use_response_format:
+            try:
+                return await async_client.beta.threads.runs.create(
+                    thread_id=thread_id,
+                    assistant_id=assistant_id,
+                    response_format=get_competitor_response_format(),
+                    **kwargs,
+                )
+            except BadRequestError as e:
+                if not self._is_response_format_unsupported(e):
+                    raise
+                logger.warning(
+                    f"Structured outputs are not supported, falling back to text responses: {e}")
+                self.use_response_format = False
+
+        return await async_client.beta.threads.runs.create(
+            thread_id=thread_id,
+            assistant_id=assistant_id,
+            **kwargs,
+        )
+
+    async def _astream_run(self, thread_id: str, timer: PhaseTimer):
+        """
+        Async counterpart of ``_stream_run``.
+        """
+        run_id = None
+        stream = await self._acreate_run(thread_id, stream=True)
+
+        try:
+            while stream is not None:
+                next_stream = None
+                waiting_since = time.monotonic()
+
+                try:
+                    async for event in stream:
+                        if event.event == 'thread.run.created':
+                            run_id = event.data.id
+
+                        elif event.event == 'thread.run.requires_action':
+                            timer.record(
+                                'assistant', time.monotonic() - waiting_since)
+                            tool_outputs = await self._arun_tool_calls(
+                                event.data, timer)
+                            with timer.phase('submit_tool_outputs'):
+                                await self._athrottle_openai()
+                                next_stream = await async_client.beta.threads.runs.submit_tool_outputs(
+                                    thread_id=thread_id,
+                                    run_id=event.data.id,
+                                    tool_outputs=tool_outputs,
+                                    stream=True,
+                                )
+                            break
+
+                        elif event.event == 'thread.run.completed':
+                            timer.record(
+                                'assistant', time.monotonic() - waiting_since)
+                            return await self._aget_messages(thread_id, timer)
+
+                        elif event.event in ('thread.run.failed', 'thread.run.cancelled',
+                                             'thread.run.expired', 'thread.run.incomplete'):
+                            logger.error(
+                                f"Run failed with status: {event.data.status}")
+                            return None
+
+                        elif event.event == 'error':
+                            logger.error(f"Run stream error: {event.data}")
+                            return None
+                finally:
+                    await stream.close()
+
+                stream = next_stream
+        except APIError as e:
+            if run_id is None:
+                raise
+            logger.warning(
+                f"Run stream interrupted, continuing by polling: {e}")
+            return await self._apoll_run(thread_id, run_id, timer)
+
+        logger.error("Run stream ended before the run finished")
+        return await self._apoll_run(thread_id, run_id, timer) if run_id else None
+
+    async def _apoll_run(self, thread_id: str, run_id: str, timer: PhaseTimer):
+        """
+        Async counterpart of ``_poll_run``; waiting between polls yields to
+        the other runs on the event loop.
+        """
+        interval = settings.RESEARCH_POLL_INITIAL_INTERVAL
+        last_status = None
+        waiting_since = time.monotonic()
+
+        while True:
+            await self._athrottle_openai()
+            run = await async_client.beta.threads.runs.retrieve(
+                thread_id=thread_id, run_id=run_id)
+
+            if run.status != last_status:
+                last_status = run.status
+                interval = settings.RESEARCH_POLL_INITIAL_INTERVAL
+
+            if run.status == 'completed':
+                timer.record('assistant', time.monotonic() - waiting_since)
+                return await self._aget_messages(thread_id, timer)
+
+            elif run.status == 'requires_action':
+                timer.record('assistant', time.monotonic() - waiting_since)
+                tool_outputs = await self._arun_tool_calls(run, timer)
+                with timer.phase('submit_tool_outputs'):
+                    await self._athrottle_openai()
+                    await async_client.beta.threads.runs.submit_tool_outputs(
+                        thread_id=thread_id,
+                        run_id=run.id,
+                        tool_outputs=tool_outputs
+                    )
+                waiting_since = time.monotonic()
+
+            elif run.status in ['failed', 'cancelled', 'expired', 'incomplete']:
+                logger.error(f"Run failed with status: {run.status}")
+                return None
+
+            else:
+                logger.info(f"Run Status: {run.status}")
+                await asyncio.sleep(interval)
+                interval = min(
+                    interval * 2, settings.RESEARCH_POLL_MAX_INTERVAL)
+
+    async def _arun_tool_calls(self, run, timer: PhaseTimer) -> List[dict]:
+        """
+        Runs at most RESEARCH_SEARCH_CONCURRENCY of the run's tool calls at
+        once, so a run with many calls cannot take over the search executor
+        shared by every job in flight.
+        """
+        tool_calls = run.required_action.submit_tool_outputs.tool_calls
+        loop = asyncio.get_running_loop()
+        slots = asyncio.Semaphore(settings.RESEARCH_SEARCH_CONCURRENCY)
+        started = {}
+
+        async def run_tool_call(tool_call):
+            async with slots:
+                return await loop.run_in_executor(
+                    self.search_executor, self._start_tool_call, tool_call, started)
+
+        with timer.phase('tool_calls'):
+            futures = {
+                tool_call.id: asyncio.ensure_future(run_tool_call(tool_call))
+                for tool_call in tool_calls
+            }
+            while True:
+                pending, timeout = self._pending_tool_calls(futures, started)
+                if not pending:
+                    break
+                await asyncio.wait(pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+
+        return self._collect_tool_outputs(futures)
+
+    async def _aget_messages(self, thread_id: str, timer: PhaseTimer):
+        with timer.phase('messages_fetch'):
+            await self._athrottle_openai()
+            messages = await async_client.beta.threads.messages.list(thread_id=thread_id)
+        logger.info(f"Messages: {messages}")
+        return messages
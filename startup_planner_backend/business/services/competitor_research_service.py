@@ -1,16 +1,23 @@
 import os
-from dataclasses import dataclass
-from openai import OpenAI
-from ..models import Competitor, Business
+import hashlib
+import threading
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from openai import OpenAI, APIError, BadRequestError
+from ..models import AssistantRegistration, Competitor, CompetitorStrength, CompetitorWeakness, Business
 import json
-from ..serializers import CompetitorSerializer
+from ..serializers import CompetitorDataSerializer
+from .response_parser import CompetitorResponseParser, get_competitor_response_format
+from .search_cache import SearchCache, get_search_cache
+from .rate_limiter import RateLimiter
+from .research_reuse_service import ResearchReuseService, get_research_reuse
+from .search_client_pool import SearchClientPool
 import logging
-from duckduckgo_search import DDGS
 import time
+from django.conf import settings
 from django.db import transaction
-from pydantic import BaseModel, Field
-from typing import Optional, List
-from datetime import datetime
+from startup_planner_backend.metrics import PhaseTimer
+from typing import Callable, Optional, List
 # Set up logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -22,46 +29,76 @@ if not api_key:
 client = OpenAI(api_key=api_key)
 
 
-class Tool(BaseModel):
-    type: str
-
-
-class Assistant(BaseModel):
-    id: str
-    object: str
-    created_at: datetime = Field(..., alias="created_at")
-    name: str
-    description: Optional[str] = None
-    model: str
-    instructions: str
-    tools: List[Tool]
-    metadata: dict = {}
-    top_p: float
-    temperature: float
-    response_format: str = "auto"
-
-    class Config:
-        allow_population_by_field_name = True
-
-
 @dataclass
 class CompetitorResearchService:
-    assistant: Assistant = None
+    ASSISTANT_NAME = "Competitor Researcher"
+    COMPETITOR_UPDATE_FIELDS = ['industry', 'product', 'market_share',
+                                'website', 'customer_reviews', 'growth_trend']
+
+    assistant_id: Optional[str] = None
+    search_executor: ThreadPoolExecutor = field(default=None, repr=False)
+    search_cache: Optional[SearchCache] = field(
+        default_factory=get_search_cache, repr=False)
+    search_client_pool: SearchClientPool = field(
+        default_factory=SearchClientPool, repr=False)
+    research_reuse: Optional[ResearchReuseService] = field(
+        default_factory=get_research_reuse, repr=False)
+    # Optional limits shared by every thread using this service.
+    openai_rate_limiter: Optional[RateLimiter] = field(default=None, repr=False)
+    search_rate_limiter: Optional[RateLimiter] = field(default=None, repr=False)
 
     def __post_init__(self):
-        if self.assistant is None:
-            self.assistant = self._get_or_create_assistant()
-
-    def _get_or_create_assistant(self):
-        assistants = client.beta.assistants.list()
-        for assistant in assistants:
-            if assistant.name == "Competitor Researcher":
-                return assistant
-        return self._create_assistant()
-
-    def _create_assistant(self):
-        return client.beta.assistants.create(
-            name="Competitor Researcher",
+        self._assistant_lock = threading.Lock()
+        self.use_response_format = settings.RESEARCH_RESPONSE_FORMAT == 'json_schema'
+        if self.search_executor is None:
+            self.search_executor = ThreadPoolExecutor(
+                max_workers=settings.RESEARCH_SEARCH_CONCURRENCY,
+                thread_name_prefix='internet-search')
+
+    def _throttle_openai(self):
+        if self.openai_rate_limiter is not None:
+            self.openai_rate_limiter.acquire()
+
+    def get_assistant_id(self) -> str:
+        """
+        Resolves the assistant on first use rather than at startup, so creating
+        the service does no network I/O.
+        """
+        if self.assistant_id is None:
+            with self._assistant_lock:
+                if self.assistant_id is None:
+                    self.assistant_id = self._get_or_create_assistant_id()
+        return self.assistant_id
+
+    def _get_or_create_assistant_id(self) -> str:
+        if settings.OPENAI_ASSISTANT_ID:
+            return settings.OPENAI_ASSISTANT_ID
+
+        definition = self._get_assistant_definition()
+        definition_hash = self._hash_definition(definition)
+
+        registration = AssistantRegistration.objects.filter(
+            definition_hash=definition_hash).first()
+        if registration:
+            return registration.assistant_id
+
+        assistant = client.beta.assistants.create(
+            **definition, metadata={'definition_hash': definition_hash})
+        registration, created = AssistantRegistration.objects.get_or_create(
+            definition_hash=definition_hash, defaults={'assistant_id': assistant.id})
+        if not created:
+            logger.warning(
+                f"Assistant {assistant.id} was created concurrently, using {registration.assistant_id}")
+        logger.info(f"Registered assistant {registration.assistant_id}")
+        return registration.assistant_id
+
+    @staticmethod
+    def _hash_definition(definition: dict) -> str:
+        return hashlib.sha256(json.dumps(definition, sort_keys=True).encode('utf-8')).hexdigest()
+
+    def _get_assistant_definition(self) -> dict:
+        return dict(
+            name=self.ASSISTANT_NAME,
             instructions="""
             You are an excellent researcher for the client that researches competitors.
             Your task is to find and analyze competitors based on the given business information.
@@ -103,20 +140,45 @@ class CompetitorResearchService:
             tools=[self._get_internet_search_tool()]
         )
 
-    def internet_search(self, query: str, recent_days: int = None):
-        with DDGS() as ddgs:
+    @staticmethod
+    def _get_timelimit(recent_days: Optional[int]) -> Optional[str]:
+        if not recent_days:
+            return None
+        if recent_days <= 1:
+            return 'd'
+        if recent_days <= 7:
+            return 'w'
+        if recent_days <= 30:
+            return 'm'
+        return 'y'
+
+    def internet_search(self, query: str, recent_days: int = None,
+                        on_start: Optional[Callable[[], None]] = None):
+        """
+        Searches DuckDuckGo unless the results are cached. ``on_start`` is
+        called once the search rate limit allowed the search, so a tool call's
+        timeout does not include the time spent waiting for it.
+        """
+        timelimit = self._get_timelimit(recent_days)
+
+        if self.search_cache is not None:
+            cached_results = self.search_cache.get(query, timelimit)
+            if cached_results is not None:
+                return cached_results
+
+        if self.search_rate_limiter is not None:
+            self.search_rate_limiter.acquire()
+        if on_start is not None:
+            on_start()
+        results = self._search_duckduckgo(query, timelimit)
+
+        if self.search_cache is not None and results:
+            self.search_cache.set(query, timelimit, results)
+        return results
+
+    def _search_duckduckgo(self, query: str, timelimit: Optional[str]) -> List[dict]:
+        with self.search_client_pool.client() as ddgs:
             results = []
-            timelimit = None
-
-            if recent_days:
-                if recent_days <= 1:
-                    timelimit = 'd'
-                elif recent_days <= 7:
-                    timelimit = 'w'
-                elif recent_days <= 30:
-                    timelimit = 'm'
-                else:
-                    timelimit = 'y'
 
             search_results = ddgs.text(
                 keywords=query,
@@ -157,15 +219,56 @@ class CompetitorResearchService:
             },
         }
 
-    def research_competitors(self, business: Business) -> List[Competitor]:
-        existing_competitors = Competitor.objects.filter(
-            business=business).values_list('name', flat=True)
-        thread = client.beta.threads.create()
-        self._create_message(thread.id, business, existing_competitors)
-        messages = self._create_and_wait_for_run(thread.id)
-        return self._process_response(messages, business)
+    def research_competitors(self, business: Business, on_progress: Optional[Callable[[str], None]] = None,
+                             timer: Optional[PhaseTimer] = None) -> List[Competitor]:
+        report = on_progress or (lambda phase: None)
+        timer = timer or PhaseTimer()
+
+        existing_competitors = list(Competitor.objects.filter(
+            business=business).values_list('name', flat=True))
+
+        match = None
+        if self.research_reuse is not None:
+            with timer.phase('reuse_lookup'):
+                match = self.research_reuse.find_similar(business, exclude_names=existing_competitors)
+        if match and self.research_reuse.mode == 'replace':
+            report("Reusing research of a similar business")
+            with timer.phase('persist'):
+                competitors = self._create_competitors(match.competitors, business)
+            if competitors:
+                logger.info(f"Research latency for business {business.id}: {timer.summary()}")
+                return competitors
+
+        report("Creating research thread")
+        with timer.phase('thread_create'):
+            self._throttle_openai()
+            thread = client.beta.threads.create()
+            self._create_message(thread.id, business, existing_competitors,
+                                 similar_competitors=match.competitors if match else None)
+        report("Researching competitors")
+        messages = self._create_and_wait_for_run(thread.id, timer)
+        report("Saving competitors")
+        with timer.phase('persist'):
+            competitors = self._process_response(messages, business)
+
+        logger.info(f"Research latency for business {business.id}: {timer.summary()}")
+        if self.search_cache is not None:
+            logger.info(f"Search cache stats: {self.search_cache.stats()}")
+        return competitors
+
+    def _create_message(self, thread_id: str, business: Business, existing_competitors: List[str],
+                        similar_competitors: Optional[List[dict]] = None):
+        prompt = self._build_prompt(business, existing_competitors, similar_competitors)
+        self._throttle_openai()
+        client.beta.threads.messages.create(
+            thread_id=thread_id,
+            role="user",
+            content=prompt
+        )
 
-    def _create_message(self, thread_id: str, business: Business, existing_competitors: List[str]):
+    @staticmethod
+    def _build_prompt(business: Business, existing_competitors: List[str],
+                      similar_competitors: Optional[List[dict]] = None) -> str:
         existing_competitors_str = ", ".join(existing_competitors)
         prompt = f"""
         Research new competitors for the following business that are not the existing competitors:
@@ -174,58 +277,255 @@ class CompetitorResearchService:
         Description: {business.description}
         Existing Competitors: {existing_competitors_str}
         """
-        client.beta.threads.messages.create(
-            thread_id=thread_id,
-            role="user",
-            content=prompt
-        )
+        if similar_competitors:
+            similar_competitors_str = ", ".join(competitor['name'] for competitor in similar_competitors)
+            prompt += f"""
+        Competitors recently found for a similar business, to verify and include if relevant: {similar_competitors_str}
+        """
+        return prompt
+
+    def _create_and_wait_for_run(self, thread_id: str, timer: Optional[PhaseTimer] = None):
+        timer = timer or PhaseTimer()
+
+        if settings.RESEARCH_RUN_MODE == 'stream':
+            try:
+                return self._stream_run(thread_id, timer)
+            except APIError as e:
+                logger.warning(
+                    f"Could not stream run, falling back to polling: {e}")
+
+        with timer.phase('run_create'):
+            run = self._create_run(thread_id)
+        return self._poll_run(thread_id, run.id, timer)
 
-    def _create_and_wait_for_run(self, thread_id: str):
-        run = client.beta.threads.runs.create(
+    def _create_run(self, thread_id: str, **kwargs):
+        """
+        Starts a run that answers with schema validated competitors, or with
+        free text when the model does not support structured outputs.
+        """
+        self._throttle_openai()
+        if self.use_response_format:
+            try:
+                return client.beta.threads.runs.create(
+                    thread_id=thread_id,
+                    assistant_id=self.get_assistant_id(),
+                    response_format=get_competitor_response_format(),
+                    **kwargs,
+                )
+            except BadRequestError as e:
+                if not self._is_response_format_unsupported(e):
+                    raise
+                logger.warning(
+                    f"Structured outputs are not supported, falling back to text responses: {e}")
+                self.use_response_format = False
+
+        return client.beta.threads.runs.create(
             thread_id=thread_id,
-            assistant_id=self.assistant.id,
+            assistant_id=self.get_assistant_id(),
+            **kwargs,
         )
 
+    @staticmethod
+    def _is_response_format_unsupported(error: BadRequestError) -> bool:
+        """
+        Tells a rejected response_format apart from other bad requests, such as
+        an unknown thread or a run already active on it, which must not turn
+        structured outputs off for every thread using the service.
+        """
+        return error.param == 'response_format' or 'response_format' in error.message
+
+    def _stream_run(self, thread_id: str, timer: PhaseTimer):
+        """
+        Executes the run by consuming its event stream, dispatching tool calls
+        as soon as the run requires action. If the stream breaks after the run
+        was created, the run is finished by polling instead.
+        """
+        run_id = None
+        stream = self._create_run(thread_id, stream=True)
+
+        try:
+            while stream is not None:
+                next_stream = None
+                waiting_since = time.monotonic()
+
+                try:
+                    for event in stream:
+                        if event.event == 'thread.run.created':
+                            run_id = event.data.id
+
+                        elif event.event == 'thread.run.requires_action':
+                            timer.record(
+                                'assistant', time.monotonic() - waiting_since)
+                            tool_outputs = self._run_tool_calls(
+                                event.data, timer)
+                            with timer.phase('submit_tool_outputs'):
+                                self._throttle_openai()
+                                next_stream = client.beta.threads.runs.submit_tool_outputs(
+                                    thread_id=thread_id,
+                                    run_id=event.data.id,
+                                    tool_outputs=tool_outputs,
+                                    stream=True,
+                                )
+                            break
+
+                        elif event.event == 'thread.run.completed':
+                            timer.record(
+                                'assistant', time.monotonic() - waiting_since)
+                            return self._get_messages(thread_id, timer)
+
+                        elif event.event in ('thread.run.failed', 'thread.run.cancelled',
+                                             'thread.run.expired', 'thread.run.incomplete'):
+                            logger.error(
+                                f"Run failed with status: {event.data.status}")
+                            return None
+
+                        elif event.event == 'error':
+                            logger.error(f"Run stream error: {event.data}")
+                            return None
+                finally:
+                    stream.close()
+
+                stream = next_stream
+        except APIError as e:
+            if run_id is None:
+                raise
+            logger.warning(
+                f"Run stream interrupted, continuing by polling: {e}")
+            return self._poll_run(thread_id, run_id, timer)
+
+        logger.error("Run stream ended before the run finished")
+        return self._poll_run(thread_id, run_id, timer) if run_id else None
+
+    def _poll_run(self, thread_id: str, run_id: str, timer: PhaseTimer):
+        """
+        Polls the run with exponential backoff, resetting the interval whenever
+        the run changes state.
+        """
+        interval = settings.RESEARCH_POLL_INITIAL_INTERVAL
+        last_status = None
+        waiting_since = time.monotonic()
+
         while True:
+            self._throttle_openai()
             run = client.beta.threads.runs.retrieve(
-                thread_id=thread_id, run_id=run.id)
+                thread_id=thread_id, run_id=run_id)
+
+            if run.status != last_status:
+                last_status = run.status
+                interval = settings.RESEARCH_POLL_INITIAL_INTERVAL
 
             if run.status == 'completed':
-                messages = client.beta.threads.messages.list(
-                    thread_id=thread_id)
-                logger.info(f"Messages: {messages}")
-                return messages
+                timer.record('assistant', time.monotonic() - waiting_since)
+                return self._get_messages(thread_id, timer)
 
             elif run.status == 'requires_action':
-                tool_calls = run.required_action.submit_tool_outputs.tool_calls
-                tool_outputs = []
-
-                for tool_call in tool_calls:
-                    if tool_call.function.name == 'internet_search':
-                        function_args = json.loads(
-                            tool_call.function.arguments)
-                        search_results = self.internet_search(
-                            query=function_args['query'],
-                            recent_days=function_args.get('recent_days')
-                        )
-                        tool_outputs.append({
-                            "tool_call_id": tool_call.id,
-                            "output": json.dumps(search_results)
-                        })
-
-                client.beta.threads.runs.submit_tool_outputs(
-                    thread_id=thread_id,
-                    run_id=run.id,
-                    tool_outputs=tool_outputs
-                )
-
-            elif run.status in ['failed', 'cancelled', 'expired']:
+                timer.record('assistant', time.monotonic() - waiting_since)
+                tool_outputs = self._run_tool_calls(run, timer)
+                with timer.phase('submit_tool_outputs'):
+                    self._throttle_openai()
+                    client.beta.threads.runs.submit_tool_outputs(
+                        thread_id=thread_id,
+                        run_id=run.id,
+                        tool_outputs=tool_outputs
+                    )
+                waiting_since = time.monotonic()
+
+            elif run.status in ['failed', 'cancelled', 'expired', 'incomplete']:
                 logger.error(f"Run failed with status: {run.status}")
                 return None
 
             else:
                 logger.info(f"Run Status: {run.status}")
-                time.sleep(1)  # Wait for a second before checking again
+                time.sleep(interval)
+                interval = min(
+                    interval * 2, settings.RESEARCH_POLL_MAX_INTERVAL)
+
+    def _run_tool_calls(self, run, timer: PhaseTimer) -> List[dict]:
+        """
+        Executes the run's tool calls concurrently on the search executor.
+        Calls that fail or exceed RESEARCH_SEARCH_TIMEOUT get an error output
+        so the results that did arrive can still be submitted.
+        """
+        tool_calls = run.required_action.submit_tool_outputs.tool_calls
+        started = {}
+
+        with timer.phase('tool_calls'):
+            futures = {
+                tool_call.id: self.search_executor.submit(
+                    self._start_tool_call, tool_call, started)
+                for tool_call in tool_calls
+            }
+            while True:
+                pending, timeout = self._pending_tool_calls(futures, started)
+                if not pending:
+                    break
+                wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+
+        return self._collect_tool_outputs(futures)
+
+    def _start_tool_call(self, tool_call, started: dict):
+        # Searches are timed once they hit the network, not while they wait
+        # for a thread or the search rate limit.
+        def on_start():
+            started[tool_call.id] = time.monotonic()
+
+        return self._execute_tool_call(tool_call, on_start=on_start)
+
+    @staticmethod
+    def _pending_tool_calls(futures: dict, started: dict):
+        """
+        Returns the tool calls still worth waiting for, and how long to wait
+        before checking again. Each call is timed from when its search starts,
+        so time spent queued behind other runs' searches on the shared executor
+        does not count against its RESEARCH_SEARCH_TIMEOUT.
+        """
+        now = time.monotonic()
+        remaining = {
+            tool_call_id: settings.RESEARCH_SEARCH_TIMEOUT - (now - started.get(tool_call_id, now))
+            for tool_call_id, future in futures.items() if not future.done()
+        }
+        pending = [futures[tool_call_id] for tool_call_id, left in remaining.items() if left > 0]
+        return pending, min((left for left in remaining.values() if left > 0), default=0)
+
+    @staticmethod
+    def _collect_tool_outputs(futures: dict) -> List[dict]:
+        tool_outputs = []
+        for tool_call_id, future in futures.items():
+            if not future.done():
+                future.cancel()
+                logger.warning(f"Tool call {tool_call_id} timed out")
+                output = {"error": "Search timed out"}
+            elif future.exception():
+                logger.error(
+                    f"Tool call {tool_call_id} failed: {future.exception()}")
+                output = {"error": "Search failed"}
+            else:
+                output = future.result()
+
+            tool_outputs.append({
+                "tool_call_id": tool_call_id,
+                "output": json.dumps(output)
+            })
+
+        return tool_outputs
+
+    def _execute_tool_call(self, tool_call, on_start: Optional[Callable[[], None]] = None):
+        if tool_call.function.name != 'internet_search':
+            return {"error": f"Unknown tool: {tool_call.function.name}"}
+
+        function_args = json.loads(tool_call.function.arguments)
+        return self.internet_search(
+            query=function_args['query'],
+            recent_days=function_args.get('recent_days'),
+            on_start=on_start,
+        )
+
+    def _get_messages(self, thread_id: str, timer: PhaseTimer):
+        with timer.phase('messages_fetch'):
+            self._throttle_openai()
+            messages = client.beta.threads.messages.list(thread_id=thread_id)
+        logger.info(f"Messages: {messages}")
+        return messages
 
     def _process_response(self, messages, business: Business) -> List[Competitor]:
         if not messages:
@@ -237,43 +537,68 @@ class CompetitorResearchService:
             logger.error("No assistant message found")
             return []
 
-        try:
-            content = assistant_message.content[0].text.value
-            json_str = content.strip().lstrip('```json').rstrip('```').strip()
-            competitor_data = json.loads(json_str)
-
-            logger.info(f"Competitor Data: {competitor_data}")
-            return self._create_competitors(competitor_data, business)
-        except json.JSONDecodeError as e:
-            logger.error(
-                f"Failed to parse competitor data from assistant's response {e}")
+        content = assistant_message.content[0].text.value
+        competitor_data = CompetitorResponseParser.parse(content)
+        if not competitor_data:
             return []
 
+        logger.info(f"Competitor Data: {competitor_data}")
+        competitors = self._create_competitors(competitor_data, business)
+        if self.research_reuse is not None and competitors:
+            created = {competitor.name for competitor in competitors}
+            self.research_reuse.save(
+                business, [data for data in competitor_data if data['name'] in created])
+        return competitors
+
     @transaction.atomic
     def _create_competitors(self, competitor_data: List[dict], business: Business) -> List[Competitor]:
-        competitors = []
+        """
+        Validates the assistant's competitors and upserts them in a constant
+        number of queries: one lookup of existing names, one upsert on the
+        (business, name) constraint, and bulk replacement of strengths and
+        weaknesses.
+        """
+        validated = {}
         for comp in competitor_data:
-            comp['business'] = business.id
+            serializer = CompetitorDataSerializer(data=comp)
+            if serializer.is_valid():
+                validated[serializer.validated_data['name']] = serializer.validated_data
+            else:
+                logger.error(f"Invalid competitor data: {serializer.errors}")
 
-            try:
-                existing_competitor = Competitor.objects.filter(
-                    business=business, name=comp['name']).first()
-
-                if existing_competitor:
-                    serializer = CompetitorSerializer(
-                        existing_competitor, data=comp)
-                else:
-                    serializer = CompetitorSerializer(data=comp)
-
-                if serializer.is_valid():
-                    competitor = serializer.save()
-                    competitors.append(competitor)
-                else:
-                    logger.error(
-                        f"Invalid competitor data: {serializer.errors}")
-            except Exception as e:
-                logger.error(
-                    f"Error creating/updating competitor: {str(e)}")
+        if not validated:
+            return []
+
+        existing_ids = list(Competitor.objects.filter(
+            business=business, name__in=validated.keys()).values_list('id', flat=True))
+        if existing_ids:
+            CompetitorStrength.objects.filter(
+                competitor_id__in=existing_ids).delete()
+            CompetitorWeakness.objects.filter(
+                competitor_id__in=existing_ids).delete()
+
+        competitors = Competitor.objects.bulk_create(
+            [
+                Competitor(business=business, **{
+                    key: value for key, value in data.items() if key not in ('strengths', 'weaknesses')
+                })
+                for data in validated.values()
+            ],
+            update_conflicts=True,
+            unique_fields=['business', 'name'],
+            update_fields=self.COMPETITOR_UPDATE_FIELDS,
+        )
 
-            logger.info(f"Competitors processed: {len(competitors)}")
-            return competitors
+        strengths = []
+        weaknesses = []
+        for competitor in competitors:
+            data = validated[competitor.name]
+            strengths.extend(CompetitorStrength(competitor=competitor, **strength)
+                             for strength in data['strengths'])
+            weaknesses.extend(CompetitorWeakness(competitor=competitor, **weakness)
+                              for weakness in data['weaknesses'])
+        CompetitorStrength.objects.bulk_create(strengths)
+        CompetitorWeakness.objects.bulk_create(weaknesses)
+
+        logger.info(f"Competitors processed: {len(competitors)}")
+        return competitors
@@ -0,0 +1,67 @@
+import asyncio
+import threading
+import time
+from typing import Optional
+
+
+class RateLimiter:
+    """
+    Thread-safe token bucket shared by every thread calling an external API.
+
+    Tokens refill continuously at ``rate`` per second up to ``burst``; callers
+    block in ``acquire`` (or await ``aacquire``) until a token is available,
+    so concurrent workers together never exceed the configured rate.
+    """
+
+    def __init__(self, rate: float, burst: Optional[int] = None):
+        if rate <= 0:
+            raise ValueError("Rate must be positive")
+        self.rate = rate
+        self.burst = burst or max(1, int(rate))
+        self.waited = 0.0
+        self._tokens = float(self.burst)
+        self._updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def per_minute(cls, requests: Optional[float]) -> Optional['RateLimiter']:
+        """
+        Builds a limiter allowing the given requests per minute, or None for
+        no limit.
+        """
+        if not requests:
+            return None
+        return cls(rate=requests / 60, burst=max(1, int(requests // 60)))
+
+    def acquire(self):
+        while True:
+            delay = self._reserve()
+            if not delay:
+                return
+            time.sleep(delay)
+
+    async def aacquire(self):
+        """
+        Waits for a token without blocking the event loop.
+        """
+        while True:
+            delay = self._reserve()
+            if not delay:
+                return
+            await asyncio.sleep(delay)
+
+    def _reserve(self) -> float:
+        """
+        Takes a token if one is available and returns 0, otherwise returns how
+        long to wait before trying again.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated_at) * self.rate)
+            self._updated_at = now
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return 0
+            delay = (1 - self._tokens) / self.rate
+            self.waited += delay
+            return delay
@@ -0,0 +1,226 @@
+import json
+import logging
+import os
+import statistics
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Callable, Iterable, List, Optional
+
+from django.conf import settings
+from django.db import close_old_connections
+from django.db.models import Exists, OuterRef, QuerySet
+
+from ..models import Business, ResearchJob
+from .research_job_service import ResearchJobService
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class BusinessResearchResult:
+    business_id: int
+    status: str
+    competitors: int = 0
+    seconds: float = 0.0
+    error: str = ''
+
+
+@dataclass
+class BatchResult:
+    completed: int = 0
+    failed: int = 0
+    skipped: int = 0
+    resumed: int = 0
+    competitors: int = 0
+    elapsed: float = 0.0
+    latencies: List[float] = field(default_factory=list)
+
+    @property
+    def processed(self) -> int:
+        return self.completed + self.failed
+
+    @property
+    def throughput(self) -> float:
+        """
+        Businesses researched per minute.
+        """
+        return self.processed / self.elapsed * 60 if self.elapsed else 0.0
+
+    def latency_percentile(self, quantile: float) -> Optional[float]:
+        if not self.latencies:
+            return None
+        latencies = sorted(self.latencies)
+        return latencies[min(len(latencies) - 1, int(len(latencies) * quantile))]
+
+    def add(self, result: BusinessResearchResult):
+        if result.status == 'skipped':
+            self.skipped += 1
+            return
+        self.latencies.append(result.seconds)
+        if result.status == ResearchJob.Status.COMPLETED:
+            self.completed += 1
+            self.competitors += result.competitors
+        else:
+            self.failed += 1
+
+    def summary(self) -> str:
+        latency = ''
+        if self.latencies:
+            latency = (f", latency mean {statistics.mean(self.latencies):.1f}s "
+                       f"p95 {self.latency_percentile(0.95):.1f}s")
+        return (f"{self.completed} researched, {self.failed} failed, {self.skipped} skipped, "
+                f"{self.resumed} already done; {self.competitors} competitors in {self.elapsed:.1f}s "
+                f"({self.throughput:.1f} businesses/min{latency})")
+
+
+class ResearchCheckpoint:
+    """
+    JSON file recording which businesses a batch has finished, so an
+    interrupted batch can resume where it stopped. Failed businesses are
+    retried on resume.
+
+    The file also records the ``selection`` it was written for; a checkpoint
+    of a different selection, such as an earlier refresh, is ignored.
+    """
+
+    def __init__(self, path: Optional[str] = None, selection: Optional[dict] = None):
+        self.path = path
+        self.selection = selection
+        self.completed = set()
+        self.failed = {}
+        self._lock = threading.Lock()
+        if path and os.path.exists(path):
+            with open(path) as checkpoint:
+                data = json.load(checkpoint)
+            if data.get('selection') != selection:
+                logger.info(f"Ignoring checkpoint {path} of a different selection")
+                return
+            self.completed = set(data.get('completed', []))
+            self.failed = {int(business_id): error for business_id, error in data.get('failed', {}).items()}
+
+    def is_done(self, business_id: int) -> bool:
+        return business_id in self.completed
+
+    def record(self, result: BusinessResearchResult):
+        with self._lock:
+            if result.status == ResearchJob.Status.COMPLETED:
+                self.completed.add(result.business_id)
+                self.failed.pop(result.business_id, None)
+            elif result.status == ResearchJob.Status.FAILED:
+                self.failed[result.business_id] = result.error
+            else:
+                return
+            self._save()
+
+    def clear(self):
+        """
+        Forgets every business and removes the file.
+        """
+        with self._lock:
+            self.completed = set()
+            self.failed = {}
+            if self.path and os.path.exists(self.path):
+                os.remove(self.path)
+
+    def _save(self):
+        if not self.path:
+            return
+        # Write then rename, so a crash never leaves a truncated checkpoint.
+        temporary_path = f"{self.path}.tmp"
+        with open(temporary_path, 'w') as checkpoint:
+            json.dump({'selection': self.selection, 'completed': sorted(self.completed),
+                       'failed': self.failed}, checkpoint)
+        os.replace(temporary_path, self.path)
+
+
+class ResearchBatch:
+    """
+    Researches many businesses with a bounded number of concurrent runs.
+
+    Each business is researched through a research job, so results show up
+    in the same place as requested research and a business that already has
+    an active job is skipped.
+    """
+
+    def __init__(self, research_service, concurrency: Optional[int] = None,
+                 checkpoint: Optional[ResearchCheckpoint] = None,
+                 on_result: Optional[Callable[[BusinessResearchResult, BatchResult], None]] = None):
+        self.research_service = research_service
+        self.concurrency = concurrency or settings.RESEARCH_WORKER_CONCURRENCY
+        self.checkpoint = checkpoint or ResearchCheckpoint()
+        self.on_result = on_result or (lambda result, batch: None)
+
+    @staticmethod
+    def select_businesses(user_emails: Optional[List[str]] = None, industries: Optional[List[str]] = None,
+                          stale_since: Optional[datetime] = None,
+                          business_ids: Optional[List[int]] = None) -> QuerySet:
+        """
+        Filters businesses by owner, industry, and whether their competitors
+        were last researched before ``stale_since``.
+        """
+        businesses = Business.objects.order_by('id')
+        if business_ids:
+            businesses = businesses.filter(id__in=business_ids)
+        if user_emails:
+            businesses = businesses.filter(user__email__in=user_emails)
+        if industries:
+            businesses = businesses.filter(industry__in=industries)
+        if stale_since:
+            businesses = businesses.exclude(Exists(ResearchJob.objects.filter(
+                business=OuterRef('pk'), status=ResearchJob.Status.COMPLETED,
+                finished_at__gte=stale_since)))
+        return businesses
+
+    def run(self, business_ids: Iterable[int]) -> BatchResult:
+        batch = BatchResult()
+        started = time.monotonic()
+        pending = set()
+
+        with ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix='research-batch') as executor:
+            for business_id in business_ids:
+                if self.checkpoint.is_done(business_id):
+                    batch.resumed += 1
+                    continue
+                # Submit lazily so a large selection is not queued up front.
+                if len(pending) >= self.concurrency * 2:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    self._collect(done, batch, started)
+                pending.add(executor.submit(self._research, business_id))
+
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                self._collect(done, batch, started)
+
+        batch.elapsed = time.monotonic() - started
+        return batch
+
+    def _collect(self, futures, batch: BatchResult, started: float):
+        for future in futures:
+            result = future.result()
+            batch.add(result)
+            batch.elapsed = time.monotonic() - started
+            self.checkpoint.record(result)
+            self.on_result(result, batch)
+
+    def _research(self, business_id: int) -> BusinessResearchResult:
+        close_old_connections()
+        started = time.monotonic()
+        try:
+            business = Business.objects.filter(pk=business_id).first()
+            job = ResearchJobService.start(business) if business else None
+            if job is None:
+                return BusinessResearchResult(business_id, 'skipped')
+
+            ResearchJobService.run(job, self.research_service)
+            return BusinessResearchResult(
+                business_id, job.status, competitors=job.competitors.count(),
+                seconds=time.monotonic() - started, error=job.error)
+        except Exception as e:
+            logger.exception(f"Batch research failed for business {business_id}")
+            return BusinessResearchResult(
+                business_id, ResearchJob.Status.FAILED, seconds=time.monotonic() - started, error=str(e))
+        finally:
+            close_old_connections()
@@ -0,0 +1,364 @@
+import asyncio
+import logging
+import threading
+from datetime import timedelta
+from typing import Optional
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import close_old_connections, connection, transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from startup_planner_backend.metrics import PhaseTimer
+
+from ..models import Business, ResearchJob
+
+logger = logging.getLogger(__name__)
+
+
+class ResearchJobService:
+    """
+    Database-backed queue for competitor research jobs.
+
+    Requests enqueue a job and return immediately; a pool of workers
+    (see ``ResearchWorkerPool``) claims pending jobs and runs the research.
+    """
+
+    ACTIVE_STATUSES = (ResearchJob.Status.PENDING, ResearchJob.Status.RUNNING)
+
+    @staticmethod
+    def enqueue(business: Business) -> ResearchJob:
+        """
+        Queues research for a business, reusing an already active job if there is one.
+        """
+        with transaction.atomic():
+            ResearchJobService._lock_business(business)
+            active_job = ResearchJob.objects.filter(
+                business=business, status__in=ResearchJobService.ACTIVE_STATUSES).first()
+            if active_job:
+                return active_job
+            return ResearchJob.objects.create(business=business)
+
+    @staticmethod
+    def start(business: Business) -> Optional[ResearchJob]:
+        """
+        Creates an already running job for research run outside the queue,
+        or returns None when the business has an active job.
+        """
+        with transaction.atomic():
+            ResearchJobService._lock_business(business)
+            if ResearchJob.objects.filter(
+                    business=business, status__in=ResearchJobService.ACTIVE_STATUSES).exists():
+                return None
+            now = timezone.now()
+            return ResearchJob.objects.create(
+                business=business, status=ResearchJob.Status.RUNNING, started_at=now, heartbeat_at=now,
+                attempts=1, progress="Starting")
+
+    @staticmethod
+    def _lock_business(business: Business):
+        """
+        Locks the business row until the transaction ends, so the request
+        queue and batch research cannot both see no active job and each
+        create one for the same business.
+        """
+        Business.objects.select_for_update().filter(pk=business.pk).values_list('pk').first()
+
+    @staticmethod
+    def claim_next() -> Optional[ResearchJob]:
+        """
+        Atomically moves the oldest pending job to running and returns it.
+        The conditional UPDATE guarantees a job is only claimed by one worker,
+        even on databases without SELECT ... FOR UPDATE SKIP LOCKED.
+        """
+        while True:
+            with transaction.atomic():
+                job = (ResearchJob.objects
+                       .select_for_update(skip_locked=True)
+                       .filter(status=ResearchJob.Status.PENDING)
+                       .order_by('created_at')
+                       .first())
+                if job is None:
+                    return None
+
+                now = timezone.now()
+                claimed = ResearchJob.objects.filter(
+                    pk=job.pk, status=ResearchJob.Status.PENDING
+                ).update(
+                    status=ResearchJob.Status.RUNNING,
+                    started_at=now,
+                    heartbeat_at=now,
+                    attempts=F('attempts') + 1,
+                    progress="Starting",
+                )
+            if claimed:
+                job.refresh_from_db()
+                return job
+
+    @staticmethod
+    def update_progress(job: ResearchJob, progress: str):
+        job.progress = progress
+        ResearchJob.objects.filter(pk=job.pk).update(progress=progress, heartbeat_at=timezone.now())
+
+    @staticmethod
+    def heartbeat(job: ResearchJob):
+        """
+        Records that the job is still being worked on, so ``requeue_stale``
+        leaves it running.
+        """
+        ResearchJob.objects.filter(pk=job.pk, status=ResearchJob.Status.RUNNING).update(
+            heartbeat_at=timezone.now())
+
+    @staticmethod
+    def run(job: ResearchJob, research_service) -> ResearchJob:
+        """
+        Runs the research for a claimed job and records the outcome along with
+        the latency of each research phase.
+        """
+        timer = PhaseTimer()
+        try:
+            with JobHeartbeat(job):
+                competitors = research_service.research_competitors(
+                    job.business,
+                    on_progress=lambda progress: ResearchJobService.update_progress(
+                        job, progress),
+                    timer=timer,
+                )
+        except Exception as e:
+            logger.exception(f"Research job {job.pk} failed")
+            ResearchJobService._finish(
+                job, ResearchJob.Status.FAILED, progress="Failed", timer=timer, error=str(e))
+            return job
+
+        job.competitors.set(competitors)
+        ResearchJobService._finish(
+            job, ResearchJob.Status.COMPLETED, progress="Completed", timer=timer)
+        return job
+
+    @staticmethod
+    async def arun(job: ResearchJob, research_service) -> ResearchJob:
+        """
+        Async counterpart of ``run`` for an ``AsyncCompetitorResearchService``.
+        """
+        timer = PhaseTimer()
+
+        async def report(progress: str):
+            await sync_to_async(ResearchJobService.update_progress)(job, progress)
+
+        async def beat():
+            while True:
+                await asyncio.sleep(settings.RESEARCH_JOB_HEARTBEAT_INTERVAL)
+                try:
+                    await sync_to_async(ResearchJobService.heartbeat)(job)
+                except Exception:
+                    logger.exception(f"Failed to record a heartbeat for research job {job.pk}")
+
+        heartbeat = asyncio.create_task(beat())
+        try:
+            business = await Business.objects.aget(pk=job.business_id)
+            competitors = await research_service.aresearch_competitors(
+                business, on_progress=report, timer=timer)
+        except Exception as e:
+            logger.exception(f"Research job {job.pk} failed")
+            await sync_to_async(ResearchJobService._finish)(
+                job, ResearchJob.Status.FAILED, progress="Failed", timer=timer, error=str(e))
+            return job
+        finally:
+            heartbeat.cancel()
+
+        await job.competitors.aset(competitors)
+        await sync_to_async(ResearchJobService._finish)(
+            job, ResearchJob.Status.COMPLETED, progress="Completed", timer=timer)
+        return job
+
+    @staticmethod
+    def requeue_stale(stale_after: Optional[int] = None) -> int:
+        """
+        Returns jobs stuck in running (e.g. after a worker crash) to the queue,
+        or fails them once they have used up their attempts. A job is stuck
+        once it has not recorded a heartbeat for ``stale_after`` seconds, so
+        long runs, e.g. of ``research_competitors`` batches, are left alone.
+        """
+        stale_after = stale_after or settings.RESEARCH_JOB_STALE_AFTER
+        cutoff = timezone.now() - timedelta(seconds=stale_after)
+        stale_jobs = ResearchJob.objects.filter(
+            Q(heartbeat_at__lt=cutoff) | Q(heartbeat_at__isnull=True, started_at__lt=cutoff),
+            status=ResearchJob.Status.RUNNING)
+
+        failed = stale_jobs.filter(attempts__gte=settings.RESEARCH_JOB_MAX_ATTEMPTS).update(
+            status=ResearchJob.Status.FAILED,
+            progress="Failed",
+            error="Research job timed out",
+            finished_at=timezone.now(),
+        )
+        requeued = stale_jobs.update(
+            status=ResearchJob.Status.PENDING, progress="Retrying")
+        if failed or requeued:
+            logger.warning(
+                f"Requeued {requeued} and failed {failed} stale research jobs")
+        return requeued
+
+    @staticmethod
+    def _finish(job: ResearchJob, status: str, progress: str, timer: PhaseTimer, error: str = ''):
+        job.status = status
+        job.progress = progress
+        job.error = error
+        job.timings = timer.summary()
+        job.finished_at = timezone.now()
+        job.save(update_fields=['status', 'progress',
+                 'error', 'timings', 'finished_at'])
+
+
+class JobHeartbeat:
+    """
+    Records a heartbeat for a running job every RESEARCH_JOB_HEARTBEAT_INTERVAL
+    seconds from a background thread, for as long as the ``with`` block runs.
+    """
+
+    def __init__(self, job: ResearchJob, interval: Optional[float] = None):
+        self.job = job
+        self.interval = interval or settings.RESEARCH_JOB_HEARTBEAT_INTERVAL
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    def __enter__(self):
+        self._thread = threading.Thread(
+            target=self._beat, name=f"research-job-{self.job.pk}-heartbeat", daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._stop_event.set()
+        self._thread.join()
+
+    def _beat(self):
+        try:
+            while not self._stop_event.wait(self.interval):
+                try:
+                    ResearchJobService.heartbeat(self.job)
+                except Exception:
+                    logger.exception(f"Failed to record a heartbeat for research job {self.job.pk}")
+        finally:
+            connection.close()
+
+
+class ResearchWorkerPool:
+    """
+    Fixed-size pool of threads that drain the research job queue.
+    """
+
+    def __init__(self, research_service, concurrency: Optional[int] = None, poll_interval: Optional[float] = None):
+        self.research_service = research_service
+        self.concurrency = concurrency or settings.RESEARCH_WORKER_CONCURRENCY
+        self.poll_interval = poll_interval or settings.RESEARCH_WORKER_POLL_INTERVAL
+        self._stop_event = threading.Event()
+        self._threads = []
+
+    def start(self):
+        ResearchJobService.requeue_stale()
+        for index in range(self.concurrency):
+            thread = threading.Thread(
+                target=self._work, name=f"research-worker-{index}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def stop(self, timeout: Optional[float] = None):
+        self._stop_event.set()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+
+    def run_until_empty(self) -> int:
+        """
+        Processes pending jobs on the calling thread until the queue is empty.
+        """
+        processed = 0
+        while self._run_once():
+            processed += 1
+        return processed
+
+    def _work(self):
+        while not self._stop_event.is_set():
+            try:
+                worked = self._run_once()
+            except Exception:
+                logger.exception("Research worker crashed while processing a job")
+                worked = False
+            if not worked:
+                self._stop_event.wait(self.poll_interval)
+
+    def _run_once(self) -> bool:
+        close_old_connections()
+        try:
+            job = ResearchJobService.claim_next()
+            if job is None:
+                return False
+            logger.info(f"Processing research job {job.pk}")
+            ResearchJobService.run(job, self.research_service)
+            return True
+        finally:
+            close_old_connections()
+
+
+class AsyncResearchWorker:
+    """
+    Drains the research job queue on a single event loop, keeping up to
+    ``max_in_flight`` jobs running at once. Research spends nearly all of its
+    time waiting on the assistant, so one process can hold far more runs than
+    a thread per job would allow.
+    """
+
+    def __init__(self, research_service, max_in_flight: Optional[int] = None,
+                 poll_interval: Optional[float] = None):
+        self.research_service = research_service
+        self.max_in_flight = max_in_flight or settings.RESEARCH_ASYNC_MAX_IN_FLIGHT
+        self.poll_interval = poll_interval or settings.RESEARCH_WORKER_POLL_INTERVAL
+
+    @staticmethod
+    def _claim_next() -> Optional[ResearchJob]:
+        close_old_connections()
+        return ResearchJobService.claim_next()
+
+    async def run(self, stop: Optional[asyncio.Event] = None, once: bool = False) -> int:
+        """
+        Claims and runs jobs until ``stop`` is set, or until the queue is empty
+        when ``once`` is true, then waits for the jobs in flight. Returns the
+        number of jobs processed.
+        """
+        stop = stop or asyncio.Event()
+        await sync_to_async(ResearchJobService.requeue_stale)()
+        in_flight = set()
+        processed = 0
+
+        while not stop.is_set():
+            if len(in_flight) >= self.max_in_flight:
+                _, in_flight = await asyncio.wait(in_flight, return_when=asyncio.FIRST_COMPLETED)
+                continue
+
+            try:
+                job = await sync_to_async(self._claim_next)()
+            except Exception:
+                # Keep the jobs in flight running through a transient database error.
+                logger.exception("Research worker failed to claim a job")
+                await self._sleep(stop)
+                continue
+            if job is None:
+                if once:
+                    break
+                await self._sleep(stop)
+                continue
+
+            logger.info(f"Processing research job {job.pk}")
+            in_flight.add(asyncio.create_task(ResearchJobService.arun(job, self.research_service)))
+            processed += 1
+
+        if in_flight:
+            await asyncio.wait(in_flight)
+        return processed
+
+    async def _sleep(self, stop: asyncio.Event):
+        try:
+            await asyncio.wait_for(stop.wait(), self.poll_interval)
+        except asyncio.TimeoutError:
+            pass
@@ -0,0 +1,126 @@
+import hashlib
+import logging
+import re
+from dataclasses import dataclass
+from datetime import timedelta
+from typing import Iterable, List, Optional
+
+from django.conf import settings
+from django.utils import timezone
+
+from ..models import Business, ResearchSnapshot
+
+logger = logging.getLogger(__name__)
+
+WORD_PATTERN = re.compile(r'[a-z0-9]+')
+# Words that do not tell industries apart ("Food and Beverage" == "Food & Beverage").
+INDUSTRY_STOP_WORDS = frozenset(['and', 'the', 'of', 'for', 'industry', 'sector'])
+
+
+@dataclass
+class ResearchMatch:
+    snapshot: ResearchSnapshot
+    similarity: float
+    competitors: List[dict]
+
+
+class ResearchReuseService:
+    """
+    Finds recent research for a similar business so its competitors can be
+    reused.
+
+    Snapshots are looked up by an exact fingerprint of the normalized
+    industry, then ranked by the Jaccard similarity of the hashed word
+    shingles of the descriptions. Only snapshots younger than ``max_age``
+    seconds and at least ``threshold`` similar are used.
+    """
+
+    SHINGLE_SIZE = 3
+
+    def __init__(self, mode: Optional[str] = None, threshold: Optional[float] = None,
+                 max_age: Optional[int] = None, max_candidates: Optional[int] = None):
+        self.mode = mode or settings.RESEARCH_REUSE_MODE
+        self.threshold = threshold if threshold is not None else settings.RESEARCH_REUSE_THRESHOLD
+        self.max_age = max_age or settings.RESEARCH_REUSE_MAX_AGE
+        self.max_candidates = max_candidates or settings.RESEARCH_REUSE_MAX_CANDIDATES
+
+    @staticmethod
+    def industry_fingerprint(industry: str) -> str:
+        words = sorted(set(WORD_PATTERN.findall(industry.lower())) - INDUSTRY_STOP_WORDS)
+        return hashlib.sha256(' '.join(words).encode('utf-8')).hexdigest()
+
+    @classmethod
+    def shingles(cls, text: str) -> List[int]:
+        """
+        Hashes the overlapping word n-grams of the text to 32-bit integers,
+        so descriptions are compared without storing their text twice.
+        """
+        words = WORD_PATTERN.findall(text.lower())
+        size = min(cls.SHINGLE_SIZE, len(words))
+        grams = {' '.join(words[index:index + size]) for index in range(len(words) - size + 1)} if size else set()
+        return sorted(
+            int.from_bytes(hashlib.blake2b(gram.encode('utf-8'), digest_size=4).digest(), 'big')
+            for gram in grams)
+
+    @staticmethod
+    def similarity(first: Iterable[int], second: Iterable[int]) -> float:
+        first, second = set(first), set(second)
+        if not first or not second:
+            return 0.0
+        return len(first & second) / len(first | second)
+
+    def find_similar(self, business: Business, exclude_names: Iterable[str] = ()) -> Optional[ResearchMatch]:
+        """
+        Returns the most similar fresh snapshot of another business, with the
+        competitors the business does not already have, or None.
+        """
+        shingles = self.shingles(business.description)
+        excluded = {name.lower() for name in exclude_names} | {business.name.lower()}
+        candidates = (ResearchSnapshot.objects
+                      .filter(industry_fingerprint=self.industry_fingerprint(business.industry),
+                              created_at__gte=timezone.now() - timedelta(seconds=self.max_age))
+                      .exclude(business=business)
+                      .order_by('-created_at')[:self.max_candidates])
+
+        best = None
+        for snapshot in candidates:
+            similarity = self.similarity(shingles, snapshot.description_shingles)
+            if similarity < self.threshold or (best and similarity <= best.similarity):
+                continue
+            competitors = [competitor for competitor in snapshot.competitors
+                           if competitor['name'].lower() not in excluded]
+            if competitors:
+                best = ResearchMatch(snapshot, similarity, competitors)
+
+        if best:
+            logger.info(
+                f"Research for business {business.id} matches snapshot {best.snapshot.id} "
+                f"({best.similarity:.2f} similar)")
+        return best
+
+    def save(self, business: Business, competitor_data: List[dict]) -> Optional[ResearchSnapshot]:
+        """
+        Records a research result and drops snapshots of the industry that are
+        too old to be reused.
+        """
+        if not competitor_data:
+            return None
+        fingerprint = self.industry_fingerprint(business.industry)
+        ResearchSnapshot.objects.filter(
+            industry_fingerprint=fingerprint,
+            created_at__lt=timezone.now() - timedelta(seconds=self.max_age)).delete()
+        return ResearchSnapshot.objects.create(
+            business=business, industry_fingerprint=fingerprint,
+            description_shingles=self.shingles(business.description), competitors=competitor_data)
+
+
+def get_research_reuse() -> Optional[ResearchReuseService]:
+    """
+    Builds the research reuse service selected by the RESEARCH_REUSE_MODE setting.
+    """
+    mode = settings.RESEARCH_REUSE_MODE
+    if mode in ('replace', 'seed'):
+        return ResearchReuseService(mode=mode)
+    if mode == 'off':
+        return None
+    raise ValueError(f"Unknown RESEARCH_REUSE_MODE: {mode}")
@@ -0,0 +1,219 @@
+import json
+import logging
+from decimal import Decimal
+from functools import lru_cache
+from typing import Any, List, Optional
+
+from django.conf import settings
+from django.core.validators import MaxValueValidator, MinValueValidator
+from django.db import models
+from pydantic import BaseModel, ConfigDict, Field, ValidationError, field_validator
+
+from ..models import Competitor, CompetitorStrength
+
+logger = logging.getLogger(__name__)
+
+
+def _max_length(model, field_name: str) -> int:
+    return model._meta.get_field(field_name).max_length
+
+
+TRAIT_MAX_LENGTH = _max_length(CompetitorStrength, 'description')
+
+
+class CompetitorTraitSchema(BaseModel):
+    model_config = ConfigDict(str_strip_whitespace=True)
+
+    description: str = Field(min_length=1)
+
+    @field_validator('description', mode='after')
+    @classmethod
+    def truncate(cls, value: str) -> str:
+        # A slightly long strength is still worth keeping.
+        return value[:TRAIT_MAX_LENGTH]
+
+
+class CompetitorSchema(BaseModel):
+    """
+    Shape of one competitor in the assistant's answer, with the limits of the
+    Competitor model so invalid items are caught before touching the database.
+    """
+    model_config = ConfigDict(str_strip_whitespace=True, extra='ignore', use_enum_values=True)
+
+    name: str = Field(min_length=1, max_length=_max_length(Competitor, 'name'))
+    industry: str = Field(min_length=1, max_length=_max_length(Competitor, 'industry'))
+    product: str = Field(min_length=1, max_length=_max_length(Competitor, 'product'))
+    market_share: Decimal = Field(ge=0, le=100, decimal_places=2)
+    strengths: List[CompetitorTraitSchema] = []
+    weaknesses: List[CompetitorTraitSchema] = []
+    website: str = Field(min_length=1, max_length=_max_length(Competitor, 'website'))
+    customer_reviews: int = Field(default=0, ge=0)
+    growth_trend: Competitor.GrowthTrend
+
+    @field_validator('market_share', mode='before')
+    @classmethod
+    def parse_percentage(cls, value: Any) -> Any:
+        if isinstance(value, str):
+            value = value.strip().rstrip('%').strip()
+        if isinstance(value, (int, float, str)):
+            try:
+                return Decimal(str(value)).quantize(Decimal('0.01'))
+            except ArithmeticError:
+                return value
+        return value
+
+    @field_validator('growth_trend', mode='before')
+    @classmethod
+    def normalize_growth_trend(cls, value: Any) -> Any:
+        return value.strip().capitalize() if isinstance(value, str) else value
+
+
+# Competitor fields the assistant fills in, in the order it should write them.
+COMPETITOR_FIELDS = ['name', 'industry', 'product', 'market_share', 'strengths', 'weaknesses',
+                     'website', 'customer_reviews', 'growth_trend']
+
+
+def _describe_field(field: models.Field) -> dict:
+    """
+    Translates a model field into a strict mode JSON schema. Strict mode does
+    not support length or range keywords, so those limits are described.
+    """
+    limits = []
+    if field.choices:
+        schema = {'type': 'string', 'enum': [value for value, _ in field.choices]}
+    elif isinstance(field, (models.DecimalField, models.FloatField)):
+        schema = {'type': 'number'}
+        if isinstance(field, models.DecimalField):
+            limits.append(f"up to {field.decimal_places} decimal places")
+    elif isinstance(field, models.IntegerField):
+        schema = {'type': 'integer'}
+        if isinstance(field, (models.PositiveIntegerField, models.PositiveSmallIntegerField)):
+            limits.append("at least 0")
+    else:
+        schema = {'type': 'string'}
+        if isinstance(field, models.URLField):
+            limits.append("an absolute URL")
+        if field.max_length:
+            limits.append(f"at most {field.max_length} characters")
+
+    # Integer fields carry the database range as validators, which is noise.
+    validators = field.validators if not isinstance(field, models.IntegerField) else []
+    for validator in validators:
+        if isinstance(validator, MinValueValidator):
+            limits.append(f"at least {validator.limit_value}")
+        elif isinstance(validator, MaxValueValidator):
+            limits.append(f"at most {validator.limit_value}")
+
+    description = str(field.verbose_name).capitalize()
+    schema['description'] = f"{description}, {', '.join(limits)}" if limits else description
+    return schema
+
+
+def _object_schema(properties: dict) -> dict:
+    return {'type': 'object', 'properties': properties,
+            'required': list(properties), 'additionalProperties': False}
+
+
+@lru_cache(maxsize=None)
+def get_competitor_response_format() -> dict:
+    """
+    Builds the structured output response format for research runs from the
+    Competitor, CompetitorStrength and CompetitorWeakness models.
+    """
+    properties = {}
+    for name in COMPETITOR_FIELDS:
+        if name in ('strengths', 'weaknesses'):
+            trait_model = Competitor._meta.get_field(name).related_model
+            trait = _object_schema({'description': _describe_field(trait_model._meta.get_field('description'))})
+            properties[name] = {'type': 'array', 'items': trait}
+        else:
+            properties[name] = _describe_field(Competitor._meta.get_field(name))
+
+    competitors = {'type': 'array', 'items': _object_schema(properties)}
+    return {
+        'type': 'json_schema',
+        'json_schema': {
+            'name': 'competitor_research',
+            'strict': True,
+            'schema': _object_schema({'competitors': competitors}),
+        },
+    }
+
+
+class CompetitorResponseParser:
+    """
+    Pulls the competitors out of the assistant's free text answer.
+
+    Structured output answers ({"competitors": [...]}) are decoded directly.
+    Otherwise the first JSON array is decoded item by item, so fences, prose
+    around the array and a truncated or corrupt tail do not discard the items
+    before it. Each item is validated on its own and only invalid items are
+    dropped.
+    """
+
+    decoder = json.JSONDecoder()
+
+    @classmethod
+    def parse(cls, content: str, max_chars: Optional[int] = None) -> List[dict]:
+        max_chars = max_chars or settings.RESEARCH_RESPONSE_MAX_CHARS
+        if len(content) > max_chars:
+            logger.warning(
+                f"Assistant response is {len(content)} characters, parsing the first {max_chars}")
+            content = content[:max_chars]
+
+        items = cls._decode_structured(content)
+        if items is None:
+            items = cls.extract_items(content)
+        if items is None:
+            logger.error("No JSON array found in the assistant's response")
+            return []
+
+        competitors = []
+        for item in items:
+            try:
+                competitors.append(CompetitorSchema.model_validate(item).model_dump())
+            except ValidationError as e:
+                logger.error(f"Dropping invalid competitor from the assistant's response: {e}")
+        return competitors
+
+    @staticmethod
+    def _decode_structured(content: str) -> Optional[List[Any]]:
+        if not content.lstrip().startswith('{'):
+            return None
+        try:
+            data = json.loads(content)
+        except json.JSONDecodeError:
+            return None
+        competitors = data.get('competitors') if isinstance(data, dict) else None
+        return competitors if isinstance(competitors, list) else None
+
+    @classmethod
+    def extract_items(cls, content: str) -> Optional[List[Any]]:
+        """
+        Returns the items of the first JSON array in the content that holds
+        objects, or None when there is none.
+        """
+        start = content.find('[')
+        while start != -1:
+            items = cls._decode_items(content, start + 1)
+            if any(isinstance(item, dict) for item in items):
+                return items
+            start = content.find('[', start + 1)
+        return None
+
+    @classmethod
+    def _decode_items(cls, content: str, index: int) -> List[Any]:
+        items = []
+        length = len(content)
+        while index < length:
+            while index < length and content[index] in ' \t\r\n,':
+                index += 1
+            if index >= length or content[index] == ']':
+                break
+            try:
+                item, index = cls.decoder.raw_decode(content, index)
+            except json.JSONDecodeError:
+                # Keep what was decoded before the broken item.
+                break
+            items.append(item)
+        return items
@@ -0,0 +1,140 @@
+import hashlib
+from abc import ABC, abstractmethod
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import List, Optional
+
+from django.conf import settings
+from django.core.cache import caches
+
+
+class SearchCache(ABC):
+    """
+    Base class for internet search result caches.
+
+    Entries are keyed by the normalized query plus the search time window, and
+    expire sooner for narrower windows so "recent" results stay recent.
+    """
+
+    # Seconds to keep results for each DuckDuckGo ``timelimit`` bucket.
+    TTLS = {
+        'd': 60 * 60,
+        'w': 6 * 60 * 60,
+        'm': 24 * 60 * 60,
+        'y': 7 * 24 * 60 * 60,
+        None: 7 * 24 * 60 * 60,
+    }
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self._counter_lock = threading.Lock()
+
+    @staticmethod
+    def normalize_query(query: str) -> str:
+        return re.sub(r'\s+', ' ', query).strip().lower()
+
+    def make_key(self, query: str, timelimit: Optional[str]) -> str:
+        digest = hashlib.sha1(self.normalize_query(
+            query).encode('utf-8')).hexdigest()
+        return f"internet_search:{timelimit or 'any'}:{digest}"
+
+    def ttl_for(self, timelimit: Optional[str]) -> int:
+        return self.TTLS.get(timelimit, self.TTLS[None])
+
+    def get(self, query: str, timelimit: Optional[str]) -> Optional[List[dict]]:
+        results = self._get(self.make_key(query, timelimit))
+        with self._counter_lock:
+            if results is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return results
+
+    def set(self, query: str, timelimit: Optional[str], results: List[dict]):
+        self._set(self.make_key(query, timelimit),
+                  results, self.ttl_for(timelimit))
+
+    def stats(self) -> dict:
+        with self._counter_lock:
+            return {'hits': self.hits, 'misses': self.misses}
+
+    @abstractmethod
+    def _get(self, key: str) -> Optional[List[dict]]:
+        ...
+
+    @abstractmethod
+    def _set(self, key: str, results: List[dict], ttl: int):
+        ...
+
+
+class InMemorySearchCache(SearchCache):
+    """
+    Process-local LRU cache that evicts the least recently used entry once
+    ``max_entries`` is reached.
+    """
+
+    def __init__(self, max_entries: int = 1024):
+        super().__init__()
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _get(self, key: str) -> Optional[List[dict]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, results = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return results
+
+    def _set(self, key: str, results: List[dict], ttl: int):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, results)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def stats(self) -> dict:
+        stats = super().stats()
+        with self._lock:
+            stats['size'] = len(self._entries)
+        return stats
+
+
+class DjangoSearchCache(SearchCache):
+    """
+    Cache shared between processes through a configured Django cache backend
+    (database, Redis, ...). Size bounds are enforced by the backend's
+    ``MAX_ENTRIES`` option.
+    """
+
+    def __init__(self, alias: str = 'default'):
+        super().__init__()
+        self.alias = alias
+
+    def _get(self, key: str) -> Optional[List[dict]]:
+        return caches[self.alias].get(key)
+
+    def _set(self, key: str, results: List[dict], ttl: int):
+        caches[self.alias].set(key, results, ttl)
+
+
+def get_search_cache() -> Optional[SearchCache]:
+    """
+    Builds the search cache selected by the SEARCH_CACHE_BACKEND setting.
+    """
+    backend = settings.SEARCH_CACHE_BACKEND
+    if backend == 'memory':
+        return InMemorySearchCache(max_entries=settings.SEARCH_CACHE_MAX_ENTRIES)
+    if backend == 'django':
+        return DjangoSearchCache(alias=settings.SEARCH_CACHE_ALIAS)
+    if backend == 'none':
+        return None
+    raise ValueError(f"Unknown SEARCH_CACHE_BACKEND: {backend}")
@@ -0,0 +1,98 @@
+import logging
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Callable, Optional
+
+from django.conf import settings
+from duckduckgo_search import DDGS
+from duckduckgo_search.exceptions import TimeoutException
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class PooledClient:
+    client: DDGS
+    created_at: float = field(default_factory=time.monotonic)
+    uses: int = 0
+    healthy: bool = True
+
+
+class SearchClientPool:
+    """
+    Thread-safe pool of long-lived DDGS clients, so repeated searches reuse
+    the client's keep-alive connections instead of paying for a new TLS
+    session each time.
+
+    At most ``max_size`` clients exist at once. A client is recycled after it
+    raised (DDGS refuses further requests after an error, and a fresh client
+    also gets a new browser fingerprint after a rate limit), once it is older
+    than ``max_age`` seconds, or after ``max_uses`` searches.
+    """
+
+    def __init__(self, max_size: Optional[int] = None, max_age: Optional[float] = None,
+                 max_uses: Optional[int] = None, timeout: Optional[int] = None,
+                 client_factory: Optional[Callable[[], DDGS]] = None):
+        self.max_size = max_size or settings.SEARCH_CLIENT_POOL_SIZE
+        self.max_age = max_age or settings.SEARCH_CLIENT_MAX_AGE
+        self.max_uses = max_uses or settings.SEARCH_CLIENT_MAX_USES
+        self.timeout = timeout or settings.SEARCH_CLIENT_TIMEOUT
+        self.client_factory = client_factory or (
+            lambda: DDGS(timeout=self.timeout))
+        self.created = 0
+        self.recycled = 0
+        self._idle = deque()
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(self.max_size)
+
+    @contextmanager
+    def client(self):
+        """
+        Checks out a healthy client for the duration of the block.
+        """
+        if not self._slots.acquire(timeout=self.timeout):
+            raise TimeoutException("Timed out waiting for a free search client")
+
+        try:
+            pooled = self._checkout()
+            try:
+                yield pooled.client
+            except Exception:
+                pooled.healthy = False
+                raise
+            finally:
+                self._checkin(pooled)
+        finally:
+            self._slots.release()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {'idle': len(self._idle), 'created': self.created, 'recycled': self.recycled}
+
+    def _checkout(self) -> PooledClient:
+        with self._lock:
+            while self._idle:
+                pooled = self._idle.pop()
+                if self._is_healthy(pooled):
+                    return pooled
+                self.recycled += 1
+            self.created += 1
+
+        return PooledClient(client=self.client_factory())
+
+    def _checkin(self, pooled: PooledClient):
+        pooled.uses += 1
+        with self._lock:
+            if self._is_healthy(pooled):
+                self._idle.append(pooled)
+            else:
+                self.recycled += 1
+                logger.debug(f"Recycled search client after {pooled.uses} uses")
+
+    def _is_healthy(self, pooled: PooledClient) -> bool:
+        return (pooled.healthy
+                and pooled.uses < self.max_uses
+                and time.monotonic() - pooled.created_at < self.max_age)
@@ -1,17 +1,43 @@
-from unittest.mock import patch, MagicMock
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch, AsyncMock, MagicMock
 from rest_framework import status
 from rest_framework.test import APITestCase
 from django.urls import reverse
+from .services.async_competitor_research_service import AsyncCompetitorResearchService
 from .services.competitor_research_service import CompetitorResearchService
-from .models import Business, Competitor, CompetitorStrength, CompetitorWeakness
+from .services.rate_limiter import RateLimiter
+from .services.research_batch_service import ResearchBatch, ResearchCheckpoint
+from .services.research_job_service import AsyncResearchWorker, ResearchJobService, ResearchWorkerPool
+from .services.research_reuse_service import ResearchReuseService, get_research_reuse
+from .services.response_parser import CompetitorResponseParser, get_competitor_response_format
+from .services.search_cache import InMemorySearchCache, DjangoSearchCache, SearchCache
+from .services.search_client_pool import SearchClientPool
+from .models import (AssistantRegistration, Business, Competitor, CompetitorStrength, CompetitorWeakness, ResearchJob,
+                     ResearchSnapshot)
 import unittest
 from .serializers import BusinessSerializer, CompetitorSerializer, CompetitorStrengthSerializer, CompetitorWeaknessSerializer
 from rest_framework.test import APIRequestFactory
-from django.test import TestCase
+from django.test import TestCase, TransactionTestCase, skipUnlessDBFeature
 from django.contrib.auth import get_user_model
 from django.core.exceptions import ValidationError
+from django.test import override_settings
+from django.db import OperationalError, connection
+from openai import APIConnectionError, BadRequestError
+import httpx
+from duckduckgo_search.exceptions import TimeoutException
+from startup_planner_backend.metrics import PhaseTimer
 from decimal import Decimal
-from datetime import date
+from datetime import date, timedelta
+import asyncio
+import json
+import os
+import tempfile
+import threading
+import time
+from io import StringIO
+from asgiref.sync import async_to_sync
+from django.core.management import call_command
+from django.utils import timezone
 
 
 User = get_user_model()
@@ -307,11 +333,12 @@ class CompetitorResearchServiceTestCase(TestCase):
         self.service = CompetitorResearchService()
 
     def test_process_response(self):
+        competitor = self.make_competitor_data(1)[0]
         mock_messages = MagicMock()
         mock_message = MagicMock(
             role='assistant',
             content=[MagicMock(text=MagicMock(
-                value='```json\n[{"name": "Competitor 1"}]\n```'))]
+                value=f'```json\n{json.dumps([competitor])}\n```'))]
         )
         mock_messages.data = [mock_message]
 
@@ -320,8 +347,10 @@ class CompetitorResearchServiceTestCase(TestCase):
             result = self.service._process_response(
                 mock_messages, self.business)
 
-            mock_create.assert_called_once_with(
-                [{"name": "Competitor 1"}], self.business)
+            mock_create.assert_called_once()
+            competitor_data = mock_create.call_args.args[0]
+            self.assertEqual([data['name'] for data in competitor_data], ["Competitor 0"])
+            self.assertEqual(competitor_data[0]['market_share'], Decimal('10.50'))
             self.assertEqual(len(result), 1)
 
     def test_create_competitors(self):
@@ -347,6 +376,797 @@ class CompetitorResearchServiceTestCase(TestCase):
         self.assertEqual(result[0].name, "Competitor 1")
         self.assertEqual(result[0].business, self.business)
 
+    def make_competitor_data(self, count, prefix="Competitor"):
+        return [
+            {
+                "name": f"{prefix} {index}",
+                "industry": "Test Industry",
+                "product": "Test Product",
+                "market_share": 10.5,
+                "strengths": [{"description": "Strength 1"}, {"description": "Strength 2"}],
+                "weaknesses": [{"description": "Weakness 1"}],
+                "website": f"https://competitor{index}.com",
+                "customer_reviews": 4,
+                "growth_trend": "Increasing"
+            }
+            for index in range(count)
+        ]
+
+    def test_create_competitors_uses_constant_queries(self):
+        with self.assertNumQueries(6):
+            self.service._create_competitors(
+                self.make_competitor_data(3), self.business)
+        with self.assertNumQueries(6):
+            self.service._create_competitors(
+                self.make_competitor_data(9, prefix="Other"), self.business)
+
+        self.assertEqual(Competitor.objects.count(), 12)
+        self.assertEqual(CompetitorStrength.objects.count(), 24)
+        self.assertEqual(CompetitorWeakness.objects.count(), 12)
+
+    def test_create_competitors_updates_existing(self):
+        self.service._create_competitors(
+            self.make_competitor_data(3), self.business)
+
+        updated_data = self.make_competitor_data(3)
+        updated_data[0]["product"] = "New Product"
+        updated_data[0]["strengths"] = [{"description": "New Strength"}]
+        with self.assertNumQueries(8):
+            result = self.service._create_competitors(
+                updated_data, self.business)
+
+        self.assertEqual(len(result), 3)
+        self.assertEqual(Competitor.objects.count(), 3)
+        competitor = Competitor.objects.get(name="Competitor 0")
+        self.assertEqual(competitor.product, "New Product")
+        self.assertEqual(
+            list(competitor.strengths.values_list('description', flat=True)), ["New Strength"])
+        self.assertEqual(CompetitorWeakness.objects.count(), 3)
+
+    def test_create_competitors_skips_invalid_items(self):
+        competitor_data = self.make_competitor_data(2)
+        competitor_data[1]["growth_trend"] = "Exploding"
+
+        result = self.service._create_competitors(
+            competitor_data, self.business)
+
+        self.assertEqual([competitor.name for competitor in result], [
+                         "Competitor 0"])
+
+
+@patch('business.services.competitor_research_service.client')
+class AssistantRegistryTestCase(TestCase):
+    def test_service_creation_does_no_network_io(self, mock_client):
+        CompetitorResearchService()
+        mock_client.beta.assistants.create.assert_not_called()
+        mock_client.beta.assistants.list.assert_not_called()
+
+    def test_assistant_created_once_and_registered(self, mock_client):
+        mock_client.beta.assistants.create.return_value = MagicMock(id='asst_new')
+
+        self.assertEqual(CompetitorResearchService().get_assistant_id(), 'asst_new')
+        self.assertEqual(CompetitorResearchService().get_assistant_id(), 'asst_new')
+
+        mock_client.beta.assistants.create.assert_called_once()
+        mock_client.beta.assistants.list.assert_not_called()
+        self.assertEqual(AssistantRegistration.objects.get().assistant_id, 'asst_new')
+
+    def test_assistant_recreated_when_definition_changes(self, mock_client):
+        mock_client.beta.assistants.create.side_effect = [
+            MagicMock(id='asst_old'), MagicMock(id='asst_new')]
+        CompetitorResearchService().get_assistant_id()
+
+        with patch.object(CompetitorResearchService, 'ASSISTANT_NAME', 'Competitor Researcher v2'):
+            self.assertEqual(CompetitorResearchService().get_assistant_id(), 'asst_new')
+        self.assertEqual(AssistantRegistration.objects.count(), 2)
+
+    @override_settings(OPENAI_ASSISTANT_ID='asst_pinned')
+    def test_assistant_id_from_settings(self, mock_client):
+        self.assertEqual(CompetitorResearchService().get_assistant_id(), 'asst_pinned')
+        mock_client.beta.assistants.create.assert_not_called()
+
+
+class FakeStream(list):
+    def close(self):
+        pass
+
+
+class FakeAsyncStream:
+    def __init__(self, events):
+        self.events = events
+
+    async def __aiter__(self):
+        for event in self.events:
+            yield event
+
+    async def close(self):
+        pass
+
+
+def make_event(event, **data):
+    return MagicMock(event=event, data=MagicMock(**data))
+
+
+def make_search_run(run_id='run_1', status='requires_action'):
+    tool_call = MagicMock(id='call_1')
+    tool_call.function.name = 'internet_search'
+    tool_call.function.arguments = '{"query": "fintech competitors"}'
+    run = MagicMock(id=run_id, status=status)
+    run.required_action.submit_tool_outputs.tool_calls = [tool_call]
+    return run
+
+
+class CompetitorResponseParserTestCase(TestCase):
+    def make_competitor(self, name="Competitor 1", **overrides):
+        competitor = {
+            "name": name,
+            "industry": "Test Industry",
+            "product": "Test Product",
+            "market_share": 10.5,
+            "strengths": [{"description": "Strength 1"}],
+            "weaknesses": [{"description": "Weakness 1"}],
+            "website": "https://competitor1.com",
+            "customer_reviews": 4,
+            "growth_trend": "Increasing",
+        }
+        competitor.update(overrides)
+        return competitor
+
+    def test_parses_array_surrounded_by_prose(self):
+        content = (f"Here are the competitors [see sources]:\n```json\n"
+                   f"{json.dumps([self.make_competitor()])}\n```\nLet me know if you need more.")
+
+        competitors = CompetitorResponseParser.parse(content)
+
+        self.assertEqual([competitor['name'] for competitor in competitors], ["Competitor 1"])
+
+    def test_leading_characters_are_not_stripped(self):
+        content = json.dumps([self.make_competitor(name="json Analytics")])
+
+        self.assertEqual(CompetitorResponseParser.parse(content)[0]['name'], "json Analytics")
+
+    def test_salvages_items_before_truncation(self):
+        content = json.dumps([self.make_competitor(), self.make_competitor(name="Competitor 2")])
+        content = content[:-40]
+
+        competitors = CompetitorResponseParser.parse(content)
+
+        self.assertEqual([competitor['name'] for competitor in competitors], ["Competitor 1"])
+
+    def test_drops_only_invalid_items(self):
+        content = json.dumps([
+            self.make_competitor(growth_trend="Exploding"),
+            self.make_competitor(name="Competitor 2", market_share="12.5%", growth_trend="steady"),
+            self.make_competitor(name="Competitor 3", market_share=150),
+        ])
+
+        competitors = CompetitorResponseParser.parse(content)
+
+        self.assertEqual(len(competitors), 1)
+        self.assertEqual(competitors[0]['name'], "Competitor 2")
+        self.assertEqual(competitors[0]['market_share'], Decimal('12.50'))
+        self.assertEqual(competitors[0]['growth_trend'], "Steady")
+
+    def test_long_traits_are_truncated(self):
+        content = json.dumps([self.make_competitor(strengths=[{"description": "x" * 300}])])
+
+        self.assertEqual(len(CompetitorResponseParser.parse(content)[0]['strengths'][0]['description']), 100)
+
+    def test_parses_structured_output(self):
+        content = json.dumps({"competitors": [self.make_competitor(), self.make_competitor(name="Competitor 2")]})
+
+        competitors = CompetitorResponseParser.parse(content)
+
+        self.assertEqual([competitor['name'] for competitor in competitors], ["Competitor 1", "Competitor 2"])
+
+    def test_response_format_is_generated_from_models(self):
+        response_format = get_competitor_response_format()
+
+        self.assertEqual(response_format['type'], 'json_schema')
+        self.assertTrue(response_format['json_schema']['strict'])
+        competitor = response_format['json_schema']['schema']['properties']['competitors']['items']
+        self.assertFalse(competitor['additionalProperties'])
+        self.assertEqual(competitor['required'], list(competitor['properties']))
+        self.assertEqual(competitor['properties']['growth_trend']['enum'], Competitor.GrowthTrend.values)
+        self.assertEqual(competitor['properties']['market_share']['type'], 'number')
+        self.assertIn('at most 100 characters',
+                      competitor['properties']['strengths']['items']['properties']['description']['description'])
+
+    def test_no_array(self):
+        self.assertEqual(CompetitorResponseParser.parse("I could not find any competitors."), [])
+
+    def test_input_is_bounded(self):
+        content = json.dumps([self.make_competitor(), self.make_competitor(name="Competitor 2")])
+
+        competitors = CompetitorResponseParser.parse(content, max_chars=len(content) // 2 + 50)
+
+        self.assertEqual(len(competitors), 1)
+
+
+@patch('business.services.competitor_research_service.client')
+class CompetitorRunExecutionTestCase(TestCase):
+    def setUp(self):
+        self.service = CompetitorResearchService(assistant_id='asst_1')
+        self.search_patcher = patch.object(
+            CompetitorResearchService, 'internet_search', return_value=[{'title': 'Result'}])
+        self.search_patcher.start()
+        self.addCleanup(self.search_patcher.stop)
+
+    @override_settings(RESEARCH_RUN_MODE='stream')
+    def test_stream_dispatches_tool_calls_on_requires_action(self, mock_client):
+        requires_action = make_event(
+            'thread.run.requires_action', id='run_1')
+        requires_action.data = make_search_run()
+        mock_client.beta.threads.runs.create.return_value = FakeStream([
+            make_event('thread.run.created', id='run_1'),
+            requires_action,
+        ])
+        mock_client.beta.threads.runs.submit_tool_outputs.return_value = FakeStream([
+            make_event('thread.run.completed', id='run_1', status='completed'),
+        ])
+
+        timer = PhaseTimer()
+        messages = self.service._create_and_wait_for_run('thread_1', timer)
+
+        self.assertEqual(
+            messages, mock_client.beta.threads.messages.list.return_value)
+        submit_kwargs = mock_client.beta.threads.runs.submit_tool_outputs.call_args.kwargs
+        self.assertTrue(submit_kwargs['stream'])
+        self.assertEqual(submit_kwargs['tool_outputs'][0]['tool_call_id'], 'call_1')
+        mock_client.beta.threads.runs.retrieve.assert_not_called()
+        self.assertIn('tool_calls', timer.summary())
+        self.assertIn('assistant', timer.summary())
+
+    @override_settings(RESEARCH_RUN_MODE='stream', RESEARCH_POLL_INITIAL_INTERVAL=0)
+    def test_stream_failure_falls_back_to_polling(self, mock_client):
+        mock_client.beta.threads.runs.create.side_effect = [
+            APIConnectionError(request=MagicMock()),
+            MagicMock(id='run_2'),
+        ]
+        mock_client.beta.threads.runs.retrieve.return_value = MagicMock(
+            id='run_2', status='completed')
+
+        messages = self.service._create_and_wait_for_run('thread_1')
+
+        self.assertEqual(
+            messages, mock_client.beta.threads.messages.list.return_value)
+        mock_client.beta.threads.runs.retrieve.assert_called_once_with(
+            thread_id='thread_1', run_id='run_2')
+
+    @override_settings(RESEARCH_RUN_MODE='poll', RESEARCH_POLL_INITIAL_INTERVAL=0.1, RESEARCH_POLL_MAX_INTERVAL=0.3)
+    @patch('business.services.competitor_research_service.time.sleep')
+    def test_poll_backs_off_exponentially(self, mock_sleep, mock_client):
+        mock_client.beta.threads.runs.create.return_value = MagicMock(id='run_1')
+        mock_client.beta.threads.runs.retrieve.side_effect = [
+            MagicMock(id='run_1', status='queued'),
+            MagicMock(id='run_1', status='queued'),
+            MagicMock(id='run_1', status='queued'),
+            make_search_run(),
+            MagicMock(id='run_1', status='in_progress'),
+            MagicMock(id='run_1', status='completed'),
+        ]
+
+        messages = self.service._create_and_wait_for_run('thread_1')
+
+        self.assertEqual(
+            messages, mock_client.beta.threads.messages.list.return_value)
+        self.assertEqual([c.args[0] for c in mock_sleep.call_args_list],
+                         [0.1, 0.2, 0.3, 0.1])
+        mock_client.beta.threads.runs.submit_tool_outputs.assert_called_once()
+
+    @override_settings(RESEARCH_RUN_MODE='poll', RESEARCH_POLL_INITIAL_INTERVAL=0)
+    def test_run_requests_structured_output(self, mock_client):
+        mock_client.beta.threads.runs.create.return_value = MagicMock(id='run_1')
+        mock_client.beta.threads.runs.retrieve.return_value = MagicMock(id='run_1', status='completed')
+
+        self.service._create_and_wait_for_run('thread_1')
+
+        self.assertEqual(mock_client.beta.threads.runs.create.call_args.kwargs['response_format'],
+                         get_competitor_response_format())
+
+    @override_settings(RESEARCH_RUN_MODE='poll', RESEARCH_POLL_INITIAL_INTERVAL=0)
+    def test_run_falls_back_to_text_without_structured_output_support(self, mock_client):
+        response = httpx.Response(400, request=httpx.Request('POST', 'https://api.openai.com/v1/threads/runs'))
+        mock_client.beta.threads.runs.create.side_effect = [
+            BadRequestError("response_format is not supported", response=response, body=None),
+            MagicMock(id='run_1'),
+            MagicMock(id='run_2'),
+        ]
+        mock_client.beta.threads.runs.retrieve.return_value = MagicMock(id='run_1', status='completed')
+
+        self.service._create_and_wait_for_run('thread_1')
+        self.service._create_and_wait_for_run('thread_2')
+
+        calls = mock_client.beta.threads.runs.create.call_args_list
+        self.assertEqual(len(calls), 3)
+        self.assertNotIn('response_format', calls[1].kwargs)
+        self.assertNotIn('response_format', calls[2].kwargs)
+
+    def test_other_bad_requests_keep_structured_outputs(self, mock_client):
+        response = httpx.Response(400, request=httpx.Request('POST', 'https://api.openai.com/v1/threads/runs'))
+        mock_client.beta.threads.runs.create.side_effect = BadRequestError(
+            "Thread thread_1 already has an active run", response=response, body={'param': None})
+
+        with self.assertRaises(BadRequestError):
+            self.service._create_run('thread_1')
+
+        self.assertTrue(self.service.use_response_format)
+        self.assertEqual(mock_client.beta.threads.runs.create.call_count, 1)
+
+    @override_settings(RESEARCH_RUN_MODE='poll', RESEARCH_POLL_INITIAL_INTERVAL=0)
+    def test_poll_returns_none_on_failed_run(self, mock_client):
+        mock_client.beta.threads.runs.create.return_value = MagicMock(id='run_1')
+        mock_client.beta.threads.runs.retrieve.return_value = MagicMock(
+            id='run_1', status='failed')
+
+        self.assertIsNone(self.service._create_and_wait_for_run('thread_1'))
+
+
+def make_async_client():
+    mock_client = MagicMock()
+    for method in ('threads.create', 'threads.messages.create', 'threads.messages.list',
+                   'threads.runs.create', 'threads.runs.retrieve', 'threads.runs.submit_tool_outputs'):
+        parent = mock_client.beta
+        *path, name = method.split('.')
+        for attribute in path:
+            parent = getattr(parent, attribute)
+        setattr(parent, name, AsyncMock())
+    return mock_client
+
+
+class AsyncCompetitorResearchTestCase(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email='testuser@test.com', password='12345')
+        self.business = Business.objects.create(
+            user=self.user, name="Test Business", industry="Test Industry", description="Test Description")
+        self.service = AsyncCompetitorResearchService(assistant_id='asst_1', research_reuse=None)
+        self.mock_client = make_async_client()
+        client_patcher = patch('business.services.async_competitor_research_service.async_client', self.mock_client)
+        client_patcher.start()
+        self.addCleanup(client_patcher.stop)
+        search_patcher = patch.object(
+            CompetitorResearchService, 'internet_search', return_value=[{'title': 'Result'}])
+        search_patcher.start()
+        self.addCleanup(search_patcher.stop)
+
+        competitors = CompetitorResearchServiceTestCase.make_competitor_data(None, 2)
+        self.mock_client.beta.threads.messages.list.return_value = MagicMock(data=[MagicMock(
+            role='assistant', content=[MagicMock(text=MagicMock(value=json.dumps(competitors)))])])
+
+    @override_settings(RESEARCH_RUN_MODE='poll', RESEARCH_POLL_INITIAL_INTERVAL=0.1)
+    @patch('business.services.async_competitor_research_service.asyncio.sleep', new_callable=AsyncMock)
+    def test_research_polls_without_blocking(self, mock_sleep):
+        self.mock_client.beta.threads.runs.create.return_value = MagicMock(id='run_1')
+        self.mock_client.beta.threads.runs.retrieve.side_effect = [
+            MagicMock(id='run_1', status='queued'),
+            make_search_run(),
+            MagicMock(id='run_1', status='completed'),
+        ]
+        progress = []
+
+        async def report(phase):
+            progress.append(phase)
+
+        competitors = async_to_sync(self.service.aresearch_competitors)(self.business, on_progress=report)
+
+        self.assertEqual(sorted(competitor.name for competitor in competitors), ["Competitor 0", "Competitor 1"])
+        self.assertEqual(Competitor.objects.filter(business=self.business).count(), 2)
+        mock_sleep.assert_awaited_once_with(0.1)
+        submit_kwargs = self.mock_client.beta.threads.runs.submit_tool_outputs.call_args.kwargs
+        self.assertEqual(json.loads(submit_kwargs['tool_outputs'][0]['output']), [{'title': 'Result'}])
+        self.assertEqual(progress, ["Creating research thread", "Researching competitors", "Saving competitors"])
+
+    @override_settings(RESEARCH_RUN_MODE='stream')
+    def test_research_streams_run(self):
+        requires_action = make_event('thread.run.requires_action', id='run_1')
+        requires_action.data = make_search_run()
+        self.mock_client.beta.threads.runs.create.return_value = FakeAsyncStream([
+            make_event('thread.run.created', id='run_1'),
+            requires_action,
+        ])
+        self.mock_client.beta.threads.runs.submit_tool_outputs.return_value = FakeAsyncStream([
+            make_event('thread.run.completed', id='run_1', status='completed'),
+        ])
+
+        competitors = async_to_sync(self.service.aresearch_competitors)(self.business)
+
+        self.assertEqual(len(competitors), 2)
+        self.assertTrue(self.mock_client.beta.threads.runs.submit_tool_outputs.call_args.kwargs['stream'])
+        self.mock_client.beta.threads.runs.retrieve.assert_not_called()
+
+
+class FakeAsyncResearchService:
+    def __init__(self, fail_for=()):
+        self.fail_for = set(fail_for)
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def aresearch_competitors(self, business, on_progress=None, timer=None):
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await on_progress("Researching competitors")
+            await asyncio.sleep(0.05)
+            if business.id in self.fail_for:
+                raise RuntimeError("Research failed")
+            return [await Competitor.objects.acreate(
+                business=business, name=f"Competitor of {business.name}", industry="Tech", product="Software",
+                market_share=1, website="https://example.com", growth_trend=Competitor.GrowthTrend.STEADY)]
+        finally:
+            self.in_flight -= 1
+
+
+class AsyncResearchWorkerTestCase(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(email='owner@test.com', password='12345')
+        self.businesses = [
+            Business.objects.create(user=self.user, name=f"Business {index}", industry="Tech",
+                                    description="A test business", stage=Business.Stage.MVP)
+            for index in range(4)
+        ]
+        self.jobs = [ResearchJobService.enqueue(business) for business in self.businesses]
+
+    def test_runs_jobs_concurrently(self):
+        service = FakeAsyncResearchService(fail_for={self.businesses[3].id})
+
+        processed = async_to_sync(AsyncResearchWorker(service, max_in_flight=3).run)(once=True)
+
+        self.assertEqual(processed, 4)
+        self.assertEqual(service.max_in_flight, 3)
+        statuses = [ResearchJob.objects.get(pk=job.pk).status for job in self.jobs]
+        self.assertEqual(statuses, [ResearchJob.Status.COMPLETED] * 3 + [ResearchJob.Status.FAILED])
+        self.assertEqual(ResearchJob.objects.get(pk=self.jobs[0].pk).competitors.count(), 1)
+
+    @override_settings(RESEARCH_JOB_HEARTBEAT_INTERVAL=0.01)
+    def test_records_heartbeats(self):
+        with patch.object(ResearchJobService, 'heartbeat') as heartbeat:
+            async_to_sync(AsyncResearchWorker(FakeAsyncResearchService(), max_in_flight=1).run)(once=True)
+
+        self.assertEqual({call.args[0].pk for call in heartbeat.call_args_list}, {job.pk for job in self.jobs})
+
+    def test_keeps_running_after_claim_error(self):
+        claim_next = ResearchJobService.claim_next
+        calls = []
+
+        def flaky_claim_next():
+            calls.append(1)
+            if len(calls) == 2:
+                raise OperationalError("database is unavailable")
+            return claim_next()
+
+        with patch.object(ResearchJobService, 'claim_next', side_effect=flaky_claim_next), \
+                self.assertLogs('business.services.research_job_service', 'ERROR'):
+            processed = async_to_sync(AsyncResearchWorker(
+                FakeAsyncResearchService(), max_in_flight=4, poll_interval=0.01).run)(once=True)
+
+        self.assertEqual(processed, 4)
+        self.assertFalse(ResearchJob.objects.exclude(status=ResearchJob.Status.COMPLETED).exists())
+
+    def test_stops_when_asked(self):
+        async def run_until_stopped():
+            stop = asyncio.Event()
+            stop.set()
+            return await AsyncResearchWorker(FakeAsyncResearchService(), poll_interval=0.01).run(stop=stop)
+
+        self.assertEqual(async_to_sync(run_until_stopped)(), 0)
+        self.assertEqual(ResearchJob.objects.filter(status=ResearchJob.Status.PENDING).count(), 4)
+
+
+class AsyncToolCallTestCase(TestCase):
+    @override_settings(RESEARCH_SEARCH_CONCURRENCY=2)
+    def test_tool_calls_of_a_run_are_bounded(self):
+        service = AsyncCompetitorResearchService(
+            assistant_id='asst_1', research_reuse=None, search_executor=ThreadPoolExecutor(max_workers=8))
+        running = []
+        peak = []
+        lock = threading.Lock()
+
+        def search(query, recent_days=None, on_start=None):
+            with lock:
+                running.append(query)
+                peak.append(len(running))
+            time.sleep(0.05)
+            with lock:
+                running.remove(query)
+            return [{'title': query}]
+
+        with patch.object(service, 'internet_search', side_effect=search):
+            outputs = async_to_sync(service._arun_tool_calls)(
+                CompetitorToolCallTestCase.make_run(None, ['a', 'b', 'c', 'd', 'e']), PhaseTimer())
+
+        self.assertEqual(max(peak), 2)
+        self.assertEqual(json.loads(outputs[4]['output']), [{'title': 'e'}])
+
+    def test_async_worker_command_is_rate_limited(self):
+        with patch('business.management.commands.run_research_workers.AsyncResearchWorker') as mock_worker:
+            mock_worker.return_value.run = AsyncMock(return_value=0)
+            call_command('run_research_workers', use_async=True, once=True, max_in_flight=50,
+                         openai_rpm=120, search_rpm=0, stdout=StringIO())
+
+        service = mock_worker.call_args.args[0]
+        self.assertEqual(service.openai_rate_limiter.rate, 2)
+        self.assertIsNone(service.search_rate_limiter)
+        self.assertEqual(service.search_executor._max_workers, 50)
+
+
+class CompetitorToolCallTestCase(TestCase):
+    def setUp(self):
+        self.service = CompetitorResearchService(assistant_id='asst_1')
+
+    def make_run(self, queries):
+        tool_calls = []
+        for index, query in enumerate(queries):
+            tool_call = MagicMock(id=f'call_{index}')
+            tool_call.function.name = 'internet_search'
+            tool_call.function.arguments = json.dumps({'query': query})
+            tool_calls.append(tool_call)
+        run = MagicMock(id='run_1')
+        run.required_action.submit_tool_outputs.tool_calls = tool_calls
+        return run
+
+    @override_settings(RESEARCH_SEARCH_CONCURRENCY=4)
+    def test_tool_calls_run_concurrently(self):
+        def slow_search(query, recent_days=None, on_start=None):
+            time.sleep(0.2)
+            return [{'title': query}]
+
+        with patch.object(self.service, 'internet_search', side_effect=slow_search):
+            started = time.monotonic()
+            outputs = self.service._run_tool_calls(
+                self.make_run(['a', 'b', 'c', 'd']), PhaseTimer())
+            elapsed = time.monotonic() - started
+
+        self.assertLess(elapsed, 0.6)
+        self.assertEqual([output['tool_call_id'] for output in outputs],
+                         ['call_0', 'call_1', 'call_2', 'call_3'])
+        self.assertEqual(json.loads(outputs[2]['output']), [{'title': 'c'}])
+
+    @override_settings(RESEARCH_SEARCH_TIMEOUT=0.1)
+    def test_timed_out_search_submits_partial_results(self):
+        def search(query, recent_days=None, on_start=None):
+            on_start()
+            if query == 'slow':
+                time.sleep(0.5)
+            return [{'title': query}]
+
+        with patch.object(self.service, 'internet_search', side_effect=search):
+            outputs = self.service._run_tool_calls(
+                self.make_run(['fast', 'slow']), PhaseTimer())
+
+        self.assertEqual(json.loads(outputs[0]['output']), [{'title': 'fast'}])
+        self.assertEqual(json.loads(outputs[1]['output']), {
+                         'error': 'Search timed out'})
+
+    @override_settings(RESEARCH_SEARCH_TIMEOUT=0.3)
+    def test_queued_search_is_timed_from_its_start(self):
+        def search(query, recent_days=None, on_start=None):
+            time.sleep(0.2)
+            return [{'title': query}]
+
+        # A single search thread, as when other runs occupy the shared executor.
+        self.service.search_executor = ThreadPoolExecutor(max_workers=1)
+        with patch.object(self.service, 'internet_search', side_effect=search):
+            outputs = self.service._run_tool_calls(
+                self.make_run(['first', 'second']), PhaseTimer())
+
+        self.assertEqual(json.loads(outputs[1]['output']), [{'title': 'second'}])
+
+    @override_settings(RESEARCH_SEARCH_TIMEOUT=0.15)
+    def test_rate_limit_wait_does_not_count_against_timeout(self):
+        self.service.search_cache = None
+        self.service.search_rate_limiter = RateLimiter(rate=5, burst=1)
+
+        with patch.object(self.service, '_search_duckduckgo',
+                          side_effect=lambda query, timelimit: [{'title': query}]):
+            outputs = self.service._run_tool_calls(
+                self.make_run(['a', 'b', 'c']), PhaseTimer())
+
+        self.assertEqual([json.loads(output['output']) for output in outputs],
+                         [[{'title': 'a'}], [{'title': 'b'}], [{'title': 'c'}]])
+        self.assertGreater(self.service.search_rate_limiter.waited, 0.15)
+
+    def test_failed_search_submits_error_output(self):
+        with patch.object(self.service, 'internet_search', side_effect=Exception("rate limited")):
+            outputs = self.service._run_tool_calls(
+                self.make_run(['query']), PhaseTimer())
+
+        self.assertEqual(json.loads(outputs[0]['output']), {
+                         'error': 'Search failed'})
+
+
+class SearchCacheTestCase(TestCase):
+    def test_normalized_queries_share_an_entry(self):
+        cache = InMemorySearchCache()
+        cache.set('Competitors of  Stripe ', 'w', [{'title': 'Adyen'}])
+        self.assertEqual(cache.get('competitors of stripe', 'w'), [
+                         {'title': 'Adyen'}])
+        self.assertIsNone(cache.get('competitors of stripe', 'm'))
+        self.assertEqual(cache.stats(), {'hits': 1, 'misses': 1, 'size': 1})
+
+    def test_incomplete_backend_cannot_be_created(self):
+        class IncompleteSearchCache(SearchCache):
+            def _get(self, key):
+                return None
+
+        with self.assertRaises(TypeError):
+            IncompleteSearchCache()
+
+    def test_lru_eviction(self):
+        cache = InMemorySearchCache(max_entries=2)
+        cache.set('a', None, [{'title': 'a'}])
+        cache.set('b', None, [{'title': 'b'}])
+        cache.get('a', None)
+        cache.set('c', None, [{'title': 'c'}])
+        self.assertIsNone(cache.get('b', None))
+        self.assertIsNotNone(cache.get('a', None))
+        self.assertIsNotNone(cache.get('c', None))
+
+    def test_entries_expire_after_window_ttl(self):
+        cache = InMemorySearchCache()
+        with patch('business.services.search_cache.time.monotonic', return_value=0):
+            cache.set('news', 'd', [{'title': 'news'}])
+        with patch('business.services.search_cache.time.monotonic', return_value=cache.ttl_for('d') + 1):
+            self.assertIsNone(cache.get('news', 'd'))
+
+    def test_django_cache_backend(self):
+        cache = DjangoSearchCache()
+        cache.set('query', 'y', [{'title': 'result'}])
+        self.assertEqual(DjangoSearchCache().get(
+            'query', 'y'), [{'title': 'result'}])
+
+    def test_internet_search_uses_cache(self):
+        service = CompetitorResearchService(
+            assistant_id='asst_1', search_cache=InMemorySearchCache())
+        with patch.object(service, '_search_duckduckgo', return_value=[{'title': 'result'}]) as mock_search:
+            service.internet_search('fintech competitors', recent_days=5)
+            results = service.internet_search('Fintech competitors', recent_days=7)
+
+        mock_search.assert_called_once_with('fintech competitors', 'w')
+        self.assertEqual(results, [{'title': 'result'}])
+
+
+class SearchClientPoolTestCase(TestCase):
+    def test_clients_are_reused(self):
+        pool = SearchClientPool(max_size=2, client_factory=MagicMock)
+        with pool.client() as first:
+            pass
+        with pool.client() as second:
+            pass
+        self.assertIs(first, second)
+        self.assertEqual(pool.stats(), {'idle': 1, 'created': 1, 'recycled': 0})
+
+    def test_client_recycled_after_error(self):
+        pool = SearchClientPool(max_size=2, client_factory=MagicMock)
+        with self.assertRaises(ValueError):
+            with pool.client() as failed:
+                raise ValueError("rate limited")
+        with pool.client() as fresh:
+            pass
+        self.assertIsNot(failed, fresh)
+        self.assertEqual(pool.stats()['recycled'], 1)
+
+    def test_client_recycled_after_max_uses(self):
+        pool = SearchClientPool(max_size=1, max_uses=2, client_factory=MagicMock)
+        clients = []
+        for _ in range(3):
+            with pool.client() as ddgs:
+                clients.append(ddgs)
+        self.assertIs(clients[0], clients[1])
+        self.assertIsNot(clients[1], clients[2])
+
+    def test_pool_is_bounded(self):
+        pool = SearchClientPool(max_size=1, timeout=0.01, client_factory=MagicMock)
+        with pool.client():
+            with self.assertRaises(TimeoutException):
+                with pool.client():
+                    pass
+
+
+class ResearchReuseTestCase(TestCase):
+    DESCRIPTION = "Mobile app that delivers fresh groceries from local farms within an hour"
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email='testuser@test.com', password='12345')
+        self.source = Business.objects.create(
+            user=self.user, name="Farm Fresh", industry="Food & Beverage", description=self.DESCRIPTION)
+        self.business = Business.objects.create(
+            user=self.user, name="Green Basket", industry="food and beverage",
+            description=self.DESCRIPTION + " in the city")
+        self.reuse = ResearchReuseService(mode='replace', threshold=0.6, max_age=3600, max_candidates=10)
+        self.competitor_data = CompetitorResearchServiceTestCase.make_competitor_data(None, 2)
+
+    def test_reuse_is_off_by_default(self):
+        self.assertIsNone(get_research_reuse())
+        with override_settings(RESEARCH_REUSE_MODE='seed'):
+            self.assertEqual(get_research_reuse().mode, 'seed')
+
+    def test_industry_fingerprint_is_normalized(self):
+        self.assertEqual(ResearchReuseService.industry_fingerprint("Food & Beverage"),
+                         ResearchReuseService.industry_fingerprint(" beverage and FOOD "))
+        self.assertNotEqual(ResearchReuseService.industry_fingerprint("Food & Beverage"),
+                            ResearchReuseService.industry_fingerprint("Fintech"))
+
+    def test_similarity(self):
+        shingles = ResearchReuseService.shingles(self.DESCRIPTION)
+        self.assertEqual(ResearchReuseService.similarity(shingles, shingles), 1.0)
+        self.assertGreater(ResearchReuseService.similarity(
+            shingles, ResearchReuseService.shingles(self.business.description)), 0.6)
+        self.assertLess(ResearchReuseService.similarity(
+            shingles, ResearchReuseService.shingles("Payroll software for small restaurants")), 0.1)
+        self.assertEqual(ResearchReuseService.similarity([], shingles), 0.0)
+
+    def test_find_similar_skips_existing_competitors(self):
+        self.reuse.save(self.source, self.competitor_data)
+
+        match = self.reuse.find_similar(self.business, exclude_names=["competitor 0"])
+
+        self.assertGreaterEqual(match.similarity, 0.6)
+        self.assertEqual([competitor['name'] for competitor in match.competitors], ["Competitor 1"])
+        self.assertIsNone(self.reuse.find_similar(
+            self.business, exclude_names=["Competitor 0", "Competitor 1"]))
+
+    def test_find_similar_ignores_own_stale_and_dissimilar_snapshots(self):
+        self.reuse.save(self.business, self.competitor_data)
+        self.assertIsNone(self.reuse.find_similar(self.business))
+
+        stale = self.reuse.save(self.source, self.competitor_data)
+        ResearchSnapshot.objects.filter(pk=stale.pk).update(
+            created_at=timezone.now() - timedelta(hours=2))
+        self.assertIsNone(self.reuse.find_similar(self.business))
+
+        self.source.description = "Payroll software for small restaurants"
+        self.reuse.save(self.source, self.competitor_data)
+        self.assertIsNone(self.reuse.find_similar(self.business))
+
+    def test_save_drops_stale_snapshots(self):
+        stale = self.reuse.save(self.source, self.competitor_data)
+        ResearchSnapshot.objects.filter(pk=stale.pk).update(
+            created_at=timezone.now() - timedelta(hours=2))
+
+        self.reuse.save(self.source, self.competitor_data)
+
+        self.assertFalse(ResearchSnapshot.objects.filter(pk=stale.pk).exists())
+
+    @patch('business.services.competitor_research_service.client')
+    def test_research_replaced_by_similar_result(self, mock_client):
+        self.reuse.save(self.source, CompetitorResponseParser.parse(json.dumps(self.competitor_data)))
+        service = CompetitorResearchService(assistant_id='asst_1', research_reuse=self.reuse)
+
+        competitors = service.research_competitors(self.business)
+
+        mock_client.beta.threads.create.assert_not_called()
+        self.assertEqual(sorted(competitor.name for competitor in competitors), ["Competitor 0", "Competitor 1"])
+        competitor = Competitor.objects.get(business=self.business, name="Competitor 0")
+        self.assertEqual(competitor.market_share, Decimal('10.50'))
+        self.assertEqual(competitor.strengths.count(), 2)
+
+    @patch('business.services.competitor_research_service.client')
+    def test_research_seeded_by_similar_result(self, mock_client):
+        self.reuse.save(self.source, self.competitor_data)
+        self.reuse.mode = 'seed'
+        service = CompetitorResearchService(assistant_id='asst_1', research_reuse=self.reuse)
+
+        with patch.object(service, '_create_and_wait_for_run', return_value=None):
+            service.research_competitors(self.business)
+
+        prompt = mock_client.beta.threads.messages.create.call_args.kwargs['content']
+        self.assertIn("similar business, to verify and include if relevant: Competitor 0, Competitor 1", prompt)
+
+    def test_process_response_saves_snapshot(self):
+        service = CompetitorResearchService(assistant_id='asst_1', research_reuse=self.reuse)
+        messages = MagicMock(data=[MagicMock(
+            role='assistant', content=[MagicMock(text=MagicMock(value=json.dumps(self.competitor_data)))])])
+
+        service._process_response(messages, self.source)
+
+        snapshot = ResearchSnapshot.objects.get(business=self.source)
+        self.assertEqual(snapshot.industry_fingerprint, ResearchReuseService.industry_fingerprint("Food & Beverage"))
+        self.assertEqual([competitor['name'] for competitor in snapshot.competitors],
+                         ["Competitor 0", "Competitor 1"])
+        self.assertEqual(snapshot.competitors[0]['market_share'], "10.50")
+
 
 class BusinessListCreateViewTestCase(APITestCase):
     def setUp(self):
@@ -375,6 +1195,27 @@ class BusinessListCreateViewTestCase(APITestCase):
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(len(response.data), 1)
 
+    def test_list_businesses_paginated_on_request(self):
+        for index in range(3):
+            Business.objects.create(
+                user=self.user, name=f'Business {index}', description='A business',
+                industry='Tech', stage=Business.Stage.IDEA)
+        url = reverse('business:business-list-create')
+
+        response = self.client.get(url, {'page_size': 2})
+        self.assertEqual(response.data['count'], 4)
+        self.assertEqual(len(response.data['results']), 2)
+
+        response = self.client.get(
+            url, {'pagination': 'cursor', 'page_size': 3})
+        self.assertNotIn('count', response.data)
+        names = [business['name'] for business in response.data['results']]
+        response = self.client.get(response.data['next'])
+        names += [business['name'] for business in response.data['results']]
+        self.assertEqual(names, ['Business 2', 'Business 1',
+                         'Business 0', 'Test Business'])
+        self.assertIsNone(response.data['next'])
+
     def test_create_business(self):
         url = reverse('business:business-list-create')
         new_business_data = {
@@ -487,6 +1328,59 @@ class CompetitorListViewTestCase(APITestCase):
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(len(response.data['results']), 1)
 
+    def test_list_competitors_query_count_is_constant(self):
+        url = reverse('business:competitor-list')
+        CompetitorStrength.objects.create(
+            competitor=self.competitor, description="Strength")
+        for index in range(10):
+            competitor = Competitor.objects.create(
+                business=self.business,
+                name=f"Competitor {index}",
+                industry="Tech",
+                product="Software",
+                market_share=5,
+                website="https://example.com",
+                customer_reviews=10,
+                growth_trend=Competitor.GrowthTrend.STEADY
+            )
+            CompetitorStrength.objects.create(
+                competitor=competitor, description="Strength")
+            CompetitorWeakness.objects.create(
+                competitor=competitor, description="Weakness")
+
+        for page_size in (1, 10):
+            with self.assertNumQueries(4):
+                response = self.client.get(
+                    url, {'businessId': self.business.id, 'page_size': page_size})
+            self.assertEqual(len(response.data['results']), page_size)
+            self.assertEqual(response.data['results'][-1]['strengths'], [
+                             {'description': 'Strength'}])
+
+    def test_list_competitors_with_cursor_pagination(self):
+        for index in range(4):
+            Competitor.objects.create(
+                business=self.business,
+                name=f"Competitor {index}",
+                industry="Tech",
+                product="Software",
+                market_share=5,
+                website="https://example.com",
+                growth_trend=Competitor.GrowthTrend.STEADY
+            )
+        url = reverse('business:competitor-list')
+
+        with self.assertNumQueries(3):
+            response = self.client.get(
+                url, {'businessId': self.business.id, 'pagination': 'cursor', 'page_size': 3})
+        self.assertNotIn('count', response.data)
+        names = [competitor['name'] for competitor in response.data['results']]
+
+        response = self.client.get(response.data['next'])
+        names += [competitor['name'] for competitor in response.data['results']]
+        self.assertEqual(names, ['Test Competitor', 'Competitor 0',
+                         'Competitor 1', 'Competitor 2', 'Competitor 3'])
+        self.assertIsNone(response.data['next'])
+
     def test_delete_competitors(self):
         url = reverse('business:competitor-list')
         response = self.client.delete(url, {'businessId': self.business.id})
@@ -532,6 +1426,377 @@ class CompetitorDetailViewTestCase(APITestCase):
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(response.data['name'], 'Test Competitor')
 
+    def test_retrieve_competitor_query_count(self):
+        CompetitorStrength.objects.create(
+            competitor=self.competitor, description="Strength")
+        url = reverse('business:competitor-detail',
+                      kwargs={'pk': self.competitor.pk})
+        with self.assertNumQueries(3):
+            response = self.client.get(url)
+        self.assertEqual(response.data['strengths'], [
+                         {'description': 'Strength'}])
+
+    def test_retrieve_competitor_of_other_user(self):
+        other_user = User.objects.create_user(
+            email='otheruser', password='testpass')
+        self.client.force_authenticate(user=other_user)
+        url = reverse('business:competitor-detail',
+                      kwargs={'pk': self.competitor.pk})
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+
+class ResearchJobServiceTestCase(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email='testuser@test.com', password='12345')
+        self.business = Business.objects.create(
+            user=self.user,
+            name="Test Business",
+            industry="Tech",
+            description="A test business",
+            stage=Business.Stage.MVP
+        )
+        self.competitor = Competitor.objects.create(
+            business=self.business,
+            name="Test Competitor",
+            industry="Tech",
+            product="Software",
+            market_share=10.5,
+            website="https://example.com",
+            customer_reviews=100,
+            growth_trend=Competitor.GrowthTrend.INCREASING
+        )
+
+    def test_enqueue_creates_pending_job(self):
+        job = ResearchJobService.enqueue(self.business)
+        self.assertEqual(job.status, ResearchJob.Status.PENDING)
+        self.assertEqual(job.business, self.business)
+
+    def test_enqueue_reuses_active_job(self):
+        job = ResearchJobService.enqueue(self.business)
+        self.assertEqual(ResearchJobService.enqueue(self.business), job)
+        self.assertEqual(ResearchJob.objects.count(), 1)
+
+    def test_claim_next_marks_job_running(self):
+        job = ResearchJobService.enqueue(self.business)
+        claimed = ResearchJobService.claim_next()
+        self.assertEqual(claimed, job)
+        self.assertEqual(claimed.status, ResearchJob.Status.RUNNING)
+        self.assertEqual(claimed.attempts, 1)
+        self.assertIsNotNone(claimed.started_at)
+        self.assertIsNone(ResearchJobService.claim_next())
+
+    def test_run_completes_job_with_competitors(self):
+        ResearchJobService.enqueue(self.business)
+        job = ResearchJobService.claim_next()
+        research_service = MagicMock()
+        research_service.research_competitors.return_value = [self.competitor]
+
+        ResearchJobService.run(job, research_service)
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, ResearchJob.Status.COMPLETED)
+        self.assertEqual(list(job.competitors.all()), [self.competitor])
+        self.assertIsNotNone(job.finished_at)
+
+    def test_run_records_failure(self):
+        ResearchJobService.enqueue(self.business)
+        job = ResearchJobService.claim_next()
+        research_service = MagicMock()
+        research_service.research_competitors.side_effect = Exception("boom")
+
+        ResearchJobService.run(job, research_service)
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, ResearchJob.Status.FAILED)
+        self.assertEqual(job.error, "boom")
+
+    def test_requeue_stale_jobs(self):
+        ResearchJobService.enqueue(self.business)
+        job = ResearchJobService.claim_next()
+        ResearchJob.objects.filter(pk=job.pk).update(
+            started_at=job.started_at - timedelta(hours=1), heartbeat_at=job.heartbeat_at - timedelta(hours=1))
+
+        self.assertEqual(ResearchJobService.requeue_stale(stale_after=60), 1)
+        job.refresh_from_db()
+        self.assertEqual(job.status, ResearchJob.Status.PENDING)
+
+    def test_requeue_stale_keeps_long_running_batch_job(self):
+        job = ResearchJobService.start(self.business)
+        ResearchJob.objects.filter(pk=job.pk).update(started_at=job.started_at - timedelta(hours=1))
+        ResearchJobService.update_progress(job, "Searching")
+
+        self.assertEqual(ResearchJobService.requeue_stale(stale_after=60), 0)
+        job.refresh_from_db()
+        self.assertEqual(job.status, ResearchJob.Status.RUNNING)
+
+    def test_run_records_heartbeats(self):
+        job = ResearchJobService.start(self.business)
+        ResearchJob.objects.filter(pk=job.pk).update(heartbeat_at=job.heartbeat_at - timedelta(hours=1))
+        research_service = MagicMock()
+        research_service.research_competitors.side_effect = lambda *args, **kwargs: time.sleep(0.2) or []
+
+        with override_settings(RESEARCH_JOB_HEARTBEAT_INTERVAL=0.05), \
+                patch.object(ResearchJobService, 'heartbeat') as heartbeat:
+            ResearchJobService.run(job, research_service)
+
+        self.assertGreater(heartbeat.call_count, 1)
+        heartbeat.assert_called_with(job)
+
+    def test_worker_pool_drains_queue(self):
+        other_business = Business.objects.create(
+            user=self.user,
+            name="Other Business",
+            industry="Tech",
+            description="Another test business",
+            stage=Business.Stage.IDEA
+        )
+        ResearchJobService.enqueue(self.business)
+        ResearchJobService.enqueue(other_business)
+        research_service = MagicMock()
+        research_service.research_competitors.return_value = []
+
+        processed = ResearchWorkerPool(research_service).run_until_empty()
+
+        self.assertEqual(processed, 2)
+        self.assertFalse(ResearchJob.objects.exclude(
+            status=ResearchJob.Status.COMPLETED).exists())
+
+
+@skipUnlessDBFeature('has_select_for_update')
+class ResearchJobStartConcurrencyTestCase(TransactionTestCase):
+    def test_queue_and_batch_create_one_active_job(self):
+        user = User.objects.create_user(email='testuser@test.com', password='12345')
+        business = Business.objects.create(user=user, name="Test Business", industry="Tech",
+                                           description="A test business", stage=Business.Stage.MVP)
+        barrier = threading.Barrier(6)
+
+        def create_job(create):
+            barrier.wait()
+            try:
+                create(business)
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=create_job, args=(create,))
+                   for create in [ResearchJobService.enqueue, ResearchJobService.start] * 3]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(ResearchJob.objects.filter(business=business).count(), 1)
+
+
+class ResearchJobViewTestCase(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email='testuser', password='testpass')
+        self.client.force_authenticate(user=self.user)
+        self.business = Business.objects.create(
+            user=self.user,
+            name="Test Business",
+            industry="Tech",
+            description="A test business",
+            stage=Business.Stage.MVP
+        )
+
+    def test_create_competitors_enqueues_job(self):
+        url = reverse('business:competitor-list')
+        response = self.client.post(url, {'id': self.business.id})
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        self.assertEqual(response.data['status'], ResearchJob.Status.PENDING)
+        self.assertEqual(response['Location'], reverse(
+            'business:research-job-detail', kwargs={'pk': response.data['id']}))
+
+    def test_retrieve_research_job(self):
+        job = ResearchJobService.enqueue(self.business)
+        url = reverse('business:research-job-detail', kwargs={'pk': job.pk})
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['status'], ResearchJob.Status.PENDING)
+        self.assertEqual(response.data['competitors'], [])
+
+    def test_retrieve_finished_research_job(self):
+        job = ResearchJobService.enqueue(self.business)
+        ResearchJob.objects.filter(pk=job.pk).update(
+            status=ResearchJob.Status.COMPLETED, timings={'assistant': 12.0})
+
+        url = reverse('business:research-job-detail', kwargs={'pk': job.pk})
+        response = self.client.get(url, {'wait': 60})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['status'], ResearchJob.Status.COMPLETED)
+        self.assertEqual(response.data['timings'], {'assistant': 12.0})
+
+    def test_retrieve_research_job_query_count(self):
+        job = ResearchJobService.enqueue(self.business)
+        for index in range(3):
+            competitor = Competitor.objects.create(
+                business=self.business, name=f"Competitor {index}", industry="Tech", product="Product",
+                market_share=10.0, website=f"https://competitor{index}.com", customer_reviews=4.0)
+            CompetitorStrength.objects.create(competitor=competitor, description="Strength")
+            CompetitorWeakness.objects.create(competitor=competitor, description="Weakness")
+            job.competitors.add(competitor)
+
+        url = reverse('business:research-job-detail', kwargs={'pk': job.pk})
+        with self.assertNumQueries(4):
+            response = self.client.get(url)
+        self.assertEqual(len(response.data['competitors']), 3)
+        self.assertEqual(response.data['competitors'][0]['weaknesses'], [{'description': 'Weakness'}])
+
+    def test_retrieve_research_job_of_other_user(self):
+        other_user = User.objects.create_user(
+            email='otheruser', password='testpass')
+        other_business = Business.objects.create(
+            user=other_user,
+            name="Other Business",
+            industry="Tech",
+            description="Another test business",
+            stage=Business.Stage.MVP
+        )
+        job = ResearchJobService.enqueue(other_business)
+        url = reverse('business:research-job-detail', kwargs={'pk': job.pk})
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
 
 if __name__ == '__main__':
     unittest.main()
+
+
+class RateLimiterTestCase(unittest.TestCase):
+    def test_allows_burst_then_limits_rate(self):
+        limiter = RateLimiter(rate=20, burst=2)
+
+        started = time.monotonic()
+        for _ in range(4):
+            limiter.acquire()
+        elapsed = time.monotonic() - started
+
+        self.assertGreaterEqual(elapsed, 0.09)
+        self.assertGreater(limiter.waited, 0)
+
+    def test_per_minute(self):
+        self.assertIsNone(RateLimiter.per_minute(0))
+        self.assertEqual(RateLimiter.per_minute(120).rate, 2)
+
+
+class FakeResearchService:
+    def __init__(self, fail_for=()):
+        self.fail_for = set(fail_for)
+        self.researched = []
+        self.search_cache = None
+
+    def research_competitors(self, business, on_progress=None, timer=None):
+        self.researched.append(business.id)
+        if business.id in self.fail_for:
+            raise RuntimeError("Research failed")
+        return [Competitor.objects.create(
+            business=business, name=f"Competitor of {business.name}", industry="Tech", product="Software",
+            market_share=1, website="https://example.com", growth_trend=Competitor.GrowthTrend.STEADY)]
+
+
+class ResearchBatchTestCase(TransactionTestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(email='owner@test.com', password='12345')
+        self.other_user = User.objects.create_user(email='other@test.com', password='12345')
+        self.businesses = [
+            Business.objects.create(user=self.user, name=f"Business {index}", industry="Tech",
+                                    description="A test business", stage=Business.Stage.MVP)
+            for index in range(4)
+        ]
+        self.other_business = Business.objects.create(
+            user=self.other_user, name="Other", industry="Retail", description="Other", stage=Business.Stage.IDEA)
+        checkpoint_dir = tempfile.mkdtemp()
+        self.checkpoint_path = os.path.join(checkpoint_dir, 'checkpoint.json')
+
+    def test_select_businesses(self):
+        researched = self.businesses[0]
+        ResearchJob.objects.create(business=researched, status=ResearchJob.Status.COMPLETED,
+                                   finished_at=timezone.now())
+
+        selected = ResearchBatch.select_businesses(
+            user_emails=['owner@test.com'], industries=['Tech'],
+            stale_since=timezone.now() - timedelta(days=1))
+
+        self.assertEqual(list(selected), self.businesses[1:])
+
+    def test_runs_research_concurrently_and_checkpoints(self):
+        service = FakeResearchService(fail_for={self.businesses[1].id})
+        checkpoint = ResearchCheckpoint(self.checkpoint_path)
+        batch = ResearchBatch(service, concurrency=2, checkpoint=checkpoint)
+
+        # The shared in-memory SQLite test database fails concurrent writes
+        # instead of waiting for them, so workers take turns on it.
+        database_lock = threading.Lock()
+        research = batch._research
+
+        def research_serially(business_id):
+            with database_lock:
+                return research(business_id)
+
+        with patch.object(batch, '_research', side_effect=research_serially):
+            batch = batch.run([business.id for business in self.businesses])
+
+        self.assertEqual((batch.completed, batch.failed, batch.competitors), (3, 1, 3))
+        self.assertGreater(batch.throughput, 0)
+        self.assertEqual(ResearchJob.objects.filter(status=ResearchJob.Status.COMPLETED).count(), 3)
+
+        # A rerun only retries the failed business.
+        service = FakeResearchService()
+        batch = ResearchBatch(service, checkpoint=ResearchCheckpoint(self.checkpoint_path)).run(
+            [business.id for business in self.businesses])
+
+        self.assertEqual(service.researched, [self.businesses[1].id])
+        self.assertEqual((batch.completed, batch.resumed), (1, 3))
+
+    def test_skips_business_with_active_job(self):
+        ResearchJobService.enqueue(self.businesses[0])
+        service = FakeResearchService()
+
+        batch = ResearchBatch(service).run([self.businesses[0].id])
+
+        self.assertEqual(batch.skipped, 1)
+        self.assertEqual(service.researched, [])
+
+    def test_command(self):
+        service = FakeResearchService()
+        out = StringIO()
+        with patch('business.management.commands.research_competitors.CompetitorResearchService',
+                   return_value=service) as mock_service:
+            call_command('research_competitors', user=['other@test.com'], checkpoint=self.checkpoint_path,
+                         openai_rpm=60, stdout=out)
+
+        self.assertEqual(service.researched, [self.other_business.id])
+        self.assertIsNotNone(mock_service.call_args.kwargs['openai_rate_limiter'])
+        self.assertIn("1 researched, 0 failed", out.getvalue())
+        # A finished batch leaves no checkpoint behind for the next run.
+        self.assertFalse(os.path.exists(self.checkpoint_path))
+
+    def test_command_keeps_checkpoint_of_its_selection(self):
+        service = FakeResearchService(fail_for={self.businesses[1].id})
+        with patch('business.management.commands.research_competitors.CompetitorResearchService',
+                   return_value=service):
+            call_command('research_competitors', user=['owner@test.com'], concurrency=1,
+                         checkpoint=self.checkpoint_path, stdout=StringIO())
+            with open(self.checkpoint_path) as checkpoint:
+                self.assertEqual(len(json.load(checkpoint)['completed']), 3)
+
+            # Another selection starts afresh instead of skipping these.
+            out = StringIO()
+            call_command('research_competitors', industry=['Tech'], checkpoint=self.checkpoint_path,
+                         dry_run=True, stdout=out)
+            self.assertIn("4 left to research", out.getvalue())
+
+            out = StringIO()
+            call_command('research_competitors', user=['owner@test.com'], checkpoint=self.checkpoint_path,
+                         dry_run=True, stdout=out)
+            self.assertIn("1 left to research", out.getvalue())
+
+            out = StringIO()
+            call_command('research_competitors', user=['owner@test.com'], checkpoint=self.checkpoint_path,
+                         fresh=True, dry_run=True, stdout=out)
+            self.assertIn("4 left to research", out.getvalue())
+            self.assertFalse(os.path.exists(self.checkpoint_path))
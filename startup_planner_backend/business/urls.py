@@ -1,5 +1,5 @@
 from django.urls import path
-from .views import BusinessListCreateView, BusinessRetrieveUpdateDestroyView, CompetitorListView, CompetitorDetailView
+from .views import BusinessListCreateView, BusinessRetrieveUpdateDestroyView, CompetitorListView, CompetitorDetailView, ResearchJobDetailView
 
 app_name = "business"
 
@@ -11,4 +11,6 @@ urlpatterns = [
     path('competitors', CompetitorListView.as_view(), name='competitor-list'),
     path('competitors/<int:pk>/', CompetitorDetailView.as_view(),
          name='competitor-detail'),
+    path('research-jobs/<int:pk>/', ResearchJobDetailView.as_view(),
+         name='research-job-detail'),
 ]
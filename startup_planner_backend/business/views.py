@@ -1,25 +1,20 @@
 from rest_framework import generics, status
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
-from rest_framework.pagination import PageNumberPagination
 from django.db import transaction
+from django.db.models import Prefetch
 from django.shortcuts import get_object_or_404
-from .serializers import BusinessSerializer, CompetitorSerializer
-from .models import Business, Competitor
-from .services.competitor_research_service import CompetitorResearchService
-
-competitor_research_service = CompetitorResearchService()
-
-
-class StandardResultsSetPagination(PageNumberPagination):
-    page_size = 10
-    page_size_query_param = 'page_size'
-    max_page_size = 100
+from django.urls import reverse
+from .serializers import BusinessSerializer, CompetitorSerializer, ResearchJobSerializer
+from .models import Business, Competitor, ResearchJob
+from .services.research_job_service import ResearchJobService
+from .pagination import BusinessPagination, CompetitorPagination
 
 
 class BusinessListCreateView(generics.ListCreateAPIView):
     serializer_class = BusinessSerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = BusinessPagination
 
     def get_queryset(self):
         return Business.objects.filter(user=self.request.user)
@@ -36,15 +31,14 @@ class BusinessRetrieveUpdateDestroyView(generics.RetrieveUpdateDestroyAPIView):
 class CompetitorListView(generics.ListCreateAPIView):
     serializer_class = CompetitorSerializer
     permission_classes = [IsAuthenticated]
-    pagination_class = StandardResultsSetPagination
+    pagination_class = CompetitorPagination
 
     def get_queryset(self):
         business_id = self.request.query_params.get('businessId')
         if not business_id:
             return Competitor.objects.none()
-        return Competitor.objects.filter(business_id=business_id, business__user=self.request.user)
+        return Competitor.objects.for_user(self.request.user).filter(business_id=business_id).order_by('id').with_details()
 
-    @transaction.atomic
     def create(self, request, *args, **kwargs):
         business_id = request.data.get('id')
         if not business_id:
@@ -53,13 +47,11 @@ class CompetitorListView(generics.ListCreateAPIView):
         business = get_object_or_404(
             Business, id=business_id, user=request.user)
 
-        try:
-            competitors = competitor_research_service.research_competitors(
-                business)
-            serializer = self.get_serializer(competitors, many=True)
-            return Response(serializer.data, status=status.HTTP_201_CREATED)
-        except Exception as e:
-            return Response({'error': str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+        job = ResearchJobService.enqueue(business)
+        serializer = ResearchJobSerializer(job)
+        status_url = reverse('business:research-job-detail',
+                             kwargs={'pk': job.pk})
+        return Response(serializer.data, status=status.HTTP_202_ACCEPTED, headers={'Location': status_url})
 
     @transaction.atomic
     def delete(self, request, *args, **kwargs):
@@ -79,13 +71,16 @@ class CompetitorListView(generics.ListCreateAPIView):
 
 
 class CompetitorDetailView(generics.RetrieveUpdateDestroyAPIView):
-    queryset = Competitor.objects.all()
     serializer_class = CompetitorSerializer
     permission_classes = [IsAuthenticated]
 
+    def get_queryset(self):
+        return Competitor.objects.with_details().select_related('business').only(
+            *(field.name for field in Competitor._meta.concrete_fields), 'business__user')
+
     def get_object(self):
         obj = super().get_object()
-        if obj.business.user != self.request.user:
+        if obj.business.user_id != self.request.user.pk:
             self.permission_denied(self.request)
         return obj
 
@@ -93,3 +88,16 @@ class CompetitorDetailView(generics.RetrieveUpdateDestroyAPIView):
         instance = self.get_object()
         self.perform_destroy(instance)
         return Response(status=status.HTTP_204_NO_CONTENT)
+
+
+class ResearchJobDetailView(generics.RetrieveAPIView):
+    """
+    Reports the status of a research job. It answers immediately, so clients
+    poll it with a delay between requests instead of holding a server thread.
+    """
+    serializer_class = ResearchJobSerializer
+    permission_classes = [IsAuthenticated]
+
+    def get_queryset(self):
+        return ResearchJob.objects.filter(business__user=self.request.user).prefetch_related(
+            Prefetch('competitors', queryset=Competitor.objects.with_details()))
@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class CanvaAuthConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'canva_auth'
+
+    def ready(self):
+        from . import signals  # noqa: F401
@@ -0,0 +1,86 @@
+import statistics
+import time
+from importlib import import_module
+
+from django.conf import settings
+from django.contrib.auth import BACKEND_SESSION_KEY, HASH_SESSION_KEY, SESSION_KEY, get_user_model
+from django.contrib.auth.middleware import AuthenticationMiddleware
+from django.contrib.sessions.middleware import SessionMiddleware
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test import RequestFactory
+from django.test.utils import CaptureQueriesContext
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from canva_auth.views import CheckAuthAPIView
+
+User = get_user_model()
+
+BENCHMARK_EMAIL = 'check-auth@benchmark.startup-planner.test'
+
+
+class FullAuthCheckAPIView(APIView):
+    """
+    The check-auth view as it was before the fast path: DRF session
+    authentication, which loads the whole user row.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, *args, **kwargs):
+        return Response({'isAuthenticated': True})
+
+
+class Command(BaseCommand):
+    help = (
+        "Measures the per-request latency and queries of the check-auth endpoint with full DRF "
+        "authentication, with the cached fast path, and with a matching ETag (304), using the "
+        "configured session engine and cache."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=2000)
+
+    def handle(self, *args, **options):
+        # The benchmark user and its session are removed again, so the
+        # command can be run against a real database.
+        user, _ = User.objects.get_or_create(email=BENCHMARK_EMAIL, defaults={'password': '!'})
+        session = import_module(settings.SESSION_ENGINE).SessionStore()
+        try:
+            session[SESSION_KEY] = str(user.pk)
+            session[BACKEND_SESSION_KEY] = settings.AUTHENTICATION_BACKENDS[0]
+            session[HASH_SESSION_KEY] = user.get_session_auth_hash()
+            session.save()
+            self._run(session, options['requests'])
+        finally:
+            session.delete()
+            user.delete()
+
+    def _run(self, session, count):
+        factory = RequestFactory()
+        factory.cookies[settings.SESSION_COOKIE_NAME] = session.session_key
+        full_view = SessionMiddleware(AuthenticationMiddleware(FullAuthCheckAPIView.as_view()))
+        fast_view = SessionMiddleware(AuthenticationMiddleware(CheckAuthAPIView.as_view()))
+        etag = fast_view(factory.get('/api/v1/auth/check-auth/'))['ETag']
+
+        self.stdout.write(f"Session engine {settings.SESSION_ENGINE}, cache {settings.CACHES['default']['BACKEND']}")
+        self._benchmark('full authentication', full_view, lambda: factory.get('/'), count)
+        self._benchmark('fast path', fast_view, lambda: factory.get('/'), count)
+        self._benchmark('fast path, 304', fast_view, lambda: factory.get('/', HTTP_IF_NONE_MATCH=etag), count)
+
+    def _benchmark(self, name, view, make_request, count):
+        timings = []
+        with CaptureQueriesContext(connection) as queries:
+            for _ in range(count):
+                request = make_request()
+                started = time.perf_counter()
+                response = view(request)
+                response.render()
+                timings.append((time.perf_counter() - started) * 1000)
+
+        timings.sort()
+        p95 = timings[min(len(timings) - 1, int(len(timings) * 0.95))]
+        self.stdout.write(
+            f"{name:<20} status {response.status_code}  mean {statistics.mean(timings):6.3f}ms  "
+            f"p95 {p95:6.3f}ms  {len(queries) / count:.2f} queries/request")
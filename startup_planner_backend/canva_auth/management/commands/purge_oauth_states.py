@@ -0,0 +1,35 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from canva_auth.models import OAuthState
+
+
+class Command(BaseCommand):
+    help = (
+        "Deletes OAuth states left behind by logins that never reached the callback. "
+        "Meant to run periodically, e.g. from a scheduler."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--older-than', type=int,
+                            help="Age in seconds after which states are purged (defaults to OAUTH_STATE_TTL)")
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        max_age = options['older_than'] if options['older_than'] is not None else settings.OAUTH_STATE_TTL
+        cutoff = timezone.now() - timedelta(seconds=max_age)
+        expired = OAuthState.objects.filter(created_at__lt=cutoff)
+
+        # Delete in batches so a large backlog never holds a long lock.
+        purged = 0
+        while True:
+            ids = list(expired.values_list('id', flat=True)[:options['batch_size']])
+            if not ids:
+                break
+            deleted, _ = OAuthState.objects.filter(id__in=ids).delete()
+            purged += deleted
+
+        self.stdout.write(self.style.SUCCESS(f"Purged {purged} expired OAuth states"))
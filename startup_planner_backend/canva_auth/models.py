@@ -1,4 +1,5 @@
 from django.contrib.auth.models import AbstractBaseUser, BaseUserManager, PermissionsMixin, Group, Permission
+from django.conf import settings
 from django.db import models
 from django.utils import timezone
 from django.core.validators import RegexValidator, MinLengthValidator, MaxLengthValidator
@@ -54,6 +55,8 @@ class CustomUser(AbstractBaseUser, PermissionsMixin):
     token_expiry = models.DateTimeField(blank=True, null=True)
     bio = models.TextField(blank=True)
     avatar = models.URLField(max_length=1024, blank=True, null=True)
+    # Resized copies of the avatar keyed by edge length in pixels, e.g. {"64": url}.
+    avatar_variants = models.JSONField(default=dict, blank=True)
 
     groups = models.ManyToManyField(
         Group,
@@ -85,7 +88,8 @@ class CustomUser(AbstractBaseUser, PermissionsMixin):
         self.access_token = access_token
         self.refresh_token = refresh_token
         self.token_expiry = timezone.now() + timedelta(seconds=expires_in)
-        self.save()
+        self.save(update_fields=['access_token',
+                  'refresh_token', 'token_expiry'])
 
     def is_first_time_login(self):
         """
@@ -104,9 +108,9 @@ class OAuthState(models.Model):
 
     def is_expired(self):
         """
-        Checks if the OAuth state has expired (10 minutes lifetime).
+        Checks if the OAuth state has expired (OAUTH_STATE_TTL lifetime).
         """
-        expiration_time = timezone.now() - timezone.timedelta(minutes=10)
+        expiration_time = timezone.now() - timezone.timedelta(seconds=settings.OAUTH_STATE_TTL)
         return self.created_at < expiration_time
 
 
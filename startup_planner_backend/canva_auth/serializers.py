@@ -49,7 +49,8 @@ class AccountSerializer(serializers.ModelSerializer):
     """
     class Meta:
         model = User
-        fields = ['display_name', 'email', 'bio', 'avatar']
+        fields = ['display_name', 'email', 'bio', 'avatar', 'avatar_variants']
+        read_only_fields = ['avatar_variants']
 
 
 class BillingSerializer(serializers.ModelSerializer):
@@ -0,0 +1,86 @@
+import hashlib
+from typing import Optional
+
+from django.conf import settings
+from django.contrib.auth import BACKEND_SESSION_KEY, HASH_SESSION_KEY, SESSION_KEY, get_user_model
+from django.core.cache import caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+from django.http import HttpRequest
+from django.utils.crypto import constant_time_compare
+
+User = get_user_model()
+
+
+class AuthCheckService:
+    """
+    Tells whether a request's session is logged in without loading the user.
+
+    A session stores the user id and a hash derived from the user's password.
+    The current hash of each user is cached after the first check, so a
+    session whose hash matches is authenticated with no query when sessions
+    live in the cache or in the cookie. On a cache miss only the password is
+    read, not the whole user row. Entries are dropped when a user's password
+    changes or the user is deleted (see ``canva_auth.signals``).
+    """
+
+    KEY_PREFIX = 'auth_check'
+
+    @staticmethod
+    def get_cache():
+        """
+        Returns the hash cache, or None when it is disabled or local to the
+        process, since invalidations would not reach the other workers.
+        """
+        cache = caches[settings.AUTH_CHECK_CACHE_ALIAS]
+        if settings.AUTH_CHECK_CACHE_TIMEOUT <= 0 or isinstance(cache, (LocMemCache, DummyCache)):
+            return None
+        return cache
+
+    @classmethod
+    def _cache_key(cls, user_id) -> str:
+        return f"{cls.KEY_PREFIX}:{user_id}"
+
+    @classmethod
+    def check(cls, request: HttpRequest) -> Optional[str]:
+        """
+        Returns an ETag for the logged in session, or None when the request
+        is not authenticated.
+        """
+        user_id = request.session.get(SESSION_KEY)
+        session_hash = request.session.get(HASH_SESSION_KEY)
+        if not user_id or not session_hash:
+            return None
+        if request.session.get(BACKEND_SESSION_KEY) not in settings.AUTHENTICATION_BACKENDS:
+            return None
+
+        cache = cls.get_cache()
+        cached_hash = cache.get(cls._cache_key(user_id)) if cache is not None else None
+        if cached_hash is None:
+            cached_hash = cls._load_hash(user_id)
+            if cached_hash is not None and cache is not None:
+                cache.set(cls._cache_key(user_id), cached_hash, settings.AUTH_CHECK_CACHE_TIMEOUT)
+
+        if cached_hash is None or not constant_time_compare(session_hash, cached_hash):
+            # Let Django decide, e.g. for sessions signed with a SECRET_KEY_FALLBACKS key.
+            if not request.user.is_authenticated:
+                return None
+        return cls._make_etag(user_id, session_hash)
+
+    @staticmethod
+    def _load_hash(user_id) -> Optional[str]:
+        password = User.objects.filter(pk=user_id).values_list('password', flat=True).first()
+        if password is None:
+            return None
+        return User(pk=user_id, password=password).get_session_auth_hash()
+
+    @staticmethod
+    def _make_etag(user_id, session_hash: str) -> str:
+        digest = hashlib.sha256(f"{user_id}:{session_hash}".encode('utf-8')).hexdigest()
+        return f'"{digest[:32]}"'
+
+    @classmethod
+    def invalidate(cls, user_id):
+        cache = cls.get_cache()
+        if cache is not None:
+            cache.delete(cls._cache_key(user_id))
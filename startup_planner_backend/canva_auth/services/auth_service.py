@@ -6,7 +6,7 @@ from rest_framework.response import Response
 from rest_framework.request import Request
 from rest_framework.serializers import Serializer
 
-from .utils import upload_to_vercel_blob
+from .user_service import UserService
 
 User = get_user_model()
 
@@ -21,19 +21,7 @@ class AuthService:
 
     @classmethod
     def update_account_details(cls, user: User, data: Dict[str, Any], serializer_class: Serializer) -> Response:
-        avatar_file = data.get('avatar')
-        if avatar_file:
-            try:
-                blob_url = upload_to_vercel_blob(avatar_file)
-                data['avatar'] = blob_url
-            except Exception as e:
-                return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
-
-        serializer = serializer_class(user, data=data, partial=True)
-        if serializer.is_valid():
-            serializer.save()
-            return Response(serializer.data)
-        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        return UserService.update_account_details(user, data, serializer_class)
 
     @classmethod
     def register_user(cls, request: Request, serializer: Serializer) -> Response:
@@ -0,0 +1,83 @@
+import logging
+import os
+import secrets
+import shutil
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.files import File
+from django.db import connection, transaction
+
+from .blob_service import BlobService
+from .image_service import ImageService
+
+logger = logging.getLogger(__name__)
+User = get_user_model()
+
+avatar_executor = ThreadPoolExecutor(
+    max_workers=settings.AVATAR_UPLOAD_WORKERS, thread_name_prefix='avatar-upload')
+
+
+class AvatarService:
+
+    @staticmethod
+    def upload(user_id: int, file) -> tuple[str, dict[str, str]]:
+        """
+        Streams the avatar to blob storage along with its resized variants.
+        Returns the URL of the original and the variant URLs keyed by size.
+
+        Every upload gets its own directory under the user's, so uploads of
+        files with the same name never overwrite each other.
+        """
+        BlobService.check_image(file)
+        variants = ImageService.make_variants(file)
+        directory = f"avatars/{user_id}/{secrets.token_hex(8)}"
+        name = os.path.basename(file.name)
+        url = BlobService.upload_image(file, path=f"{directory}/{name}")
+
+        stem = os.path.splitext(name)[0]
+        variant_urls = {
+            str(size): BlobService.upload(f"{directory}/{stem}-{size}.webp", data, 'image/webp')
+            for size, data in variants.items()
+        }
+        return url, variant_urls
+
+    @staticmethod
+    def spool(file) -> str:
+        """
+        Validates the avatar and copies it to a temporary file, since the
+        uploaded file is deleted when the request ends. Returns its path.
+        """
+        BlobService.check_image(file)
+        with tempfile.NamedTemporaryFile(delete=False, suffix='.avatar') as spooled:
+            shutil.copyfileobj(file, spooled, settings.BLOB_UPLOAD_CHUNK_SIZE)
+        return spooled.name
+
+    @classmethod
+    def upload_in_background(cls, user: User, path: str, name: str):
+        """
+        Uploads a spooled avatar on a background thread once the current
+        transaction commits, then sets it as the user's avatar.
+        """
+        transaction.on_commit(lambda: avatar_executor.submit(
+            cls._upload_spooled, user.pk, path, name))
+
+    @staticmethod
+    def discard(path: str):
+        os.remove(path)
+
+    @classmethod
+    def _upload_spooled(cls, user_id: int, path: str, name: str):
+        try:
+            with open(path, 'rb') as spooled:
+                url, variant_urls = cls.upload(user_id, File(spooled, name=name))
+            User.objects.filter(pk=user_id).update(avatar=url, avatar_variants=variant_urls)
+            return url, variant_urls
+        except Exception:
+            logger.exception(f"Background avatar upload failed for user {user_id}")
+            raise
+        finally:
+            os.remove(path)
+            connection.close()
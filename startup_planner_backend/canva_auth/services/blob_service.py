@@ -0,0 +1,135 @@
+import logging
+import os
+from typing import Iterator, Optional
+
+import requests
+from django.conf import settings
+from requests.adapters import HTTPAdapter
+
+logger = logging.getLogger(__name__)
+
+BLOB_API_URL = 'https://blob.vercel-storage.com'
+BLOB_API_VERSION = '7'
+
+# Leading bytes of the image formats accepted as avatars.
+IMAGE_SIGNATURES = (
+    (b'\x89PNG\r\n\x1a\n', 'image/png'),
+    (b'\xff\xd8\xff', 'image/jpeg'),
+    (b'GIF87a', 'image/gif'),
+    (b'GIF89a', 'image/gif'),
+)
+
+
+class BlobUploadError(Exception):
+    pass
+
+
+def sniff_image_type(head: bytes) -> Optional[str]:
+    """
+    Detects the image content type from the first bytes of a file, ignoring
+    the client supplied name and content type.
+    """
+    for signature, content_type in IMAGE_SIGNATURES:
+        if head.startswith(signature):
+            return content_type
+    if head[:4] == b'RIFF' and head[8:12] == b'WEBP':
+        return 'image/webp'
+    return None
+
+
+class BlobService:
+    """
+    Streams uploads to the Vercel Blob store.
+
+    Files are sent in chunks with chunked transfer encoding, so at most one
+    chunk is held in memory, and the size cap is enforced while streaming in
+    case the declared size is wrong.
+    """
+
+    _session = None
+
+    @classmethod
+    def get_session(cls) -> requests.Session:
+        if cls._session is None:
+            session = requests.Session()
+            session.mount('https://', HTTPAdapter(pool_maxsize=settings.BLOB_UPLOAD_POOL_SIZE))
+            cls._session = session
+        return cls._session
+
+    @classmethod
+    def check_image(cls, file, max_size: Optional[int] = None) -> str:
+        """
+        Validates the declared size and sniffed type of an image upload and
+        returns its content type, leaving the file at its start.
+        """
+        max_size = max_size or settings.AVATAR_MAX_UPLOAD_SIZE
+        size = getattr(file, 'size', None)
+        if size is not None and size > max_size:
+            raise BlobUploadError(f"File is larger than {max_size} bytes")
+
+        file.seek(0)
+        content_type = sniff_image_type(file.read(16))
+        file.seek(0)
+        if content_type is None:
+            raise BlobUploadError("Unsupported image format")
+        return content_type
+
+    @classmethod
+    def upload_image(cls, file, max_size: Optional[int] = None, chunk_size: Optional[int] = None,
+                     path: Optional[str] = None) -> str:
+        """
+        Uploads an image file to ``path`` (its file name by default) and
+        returns its public URL.
+        """
+        max_size = max_size or settings.AVATAR_MAX_UPLOAD_SIZE
+        chunk_size = chunk_size or settings.BLOB_UPLOAD_CHUNK_SIZE
+        content_type = cls.check_image(file, max_size)
+        chunks = cls._limit_size(cls._iter_chunks(file, chunk_size), max_size)
+        return cls.upload(path or os.path.basename(file.name), chunks, content_type)
+
+    @classmethod
+    def upload(cls, path: str, data, content_type: str) -> str:
+        """
+        Uploads bytes or an iterator of byte chunks and returns the public URL.
+        """
+        token = settings.BLOB_READ_WRITE_TOKEN
+        if not token:
+            raise BlobUploadError('BLOB_READ_WRITE_TOKEN is not set')
+
+        headers = {
+            'access': 'public',
+            'authorization': f'Bearer {token}',
+            'x-api-version': BLOB_API_VERSION,
+            'x-content-type': content_type,
+            'x-cache-control-max-age': str(settings.BLOB_CACHE_MAX_AGE),
+        }
+        try:
+            response = cls.get_session().put(f"{BLOB_API_URL}/{path}", data=data, headers=headers,
+                                             timeout=settings.BLOB_UPLOAD_TIMEOUT)
+        except requests.RequestException as e:
+            raise BlobUploadError(f"Upload failed: {e}") from e
+
+        if response.status_code != 200:
+            logger.error(f"Blob upload of {path} failed: {response.status_code} {response.text}")
+            raise BlobUploadError('Upload failed')
+        return response.json()['url']
+
+    @staticmethod
+    def _iter_chunks(file, chunk_size: int) -> Iterator[bytes]:
+        if hasattr(file, 'chunks'):
+            yield from file.chunks(chunk_size)
+            return
+        while True:
+            chunk = file.read(chunk_size)
+            if not chunk:
+                return
+            yield chunk
+
+    @staticmethod
+    def _limit_size(chunks: Iterator[bytes], max_size: int) -> Iterator[bytes]:
+        sent = 0
+        for chunk in chunks:
+            sent += len(chunk)
+            if sent > max_size:
+                raise BlobUploadError(f"File is larger than {max_size} bytes")
+            yield chunk
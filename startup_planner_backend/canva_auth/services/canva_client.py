@@ -0,0 +1,106 @@
+import logging
+import random
+import time
+from email.utils import parsedate_to_datetime
+from http.cookiejar import DefaultCookiePolicy
+from typing import Optional
+
+import requests
+from django.conf import settings
+from django.utils import timezone
+from requests.adapters import HTTPAdapter
+
+logger = logging.getLogger(__name__)
+
+
+class CanvaAPIClient:
+    """
+    Shared HTTP client for the Canva REST API.
+
+    Reuses keep-alive connections from a bounded pool, applies connect and
+    read timeouts to every call, and retries rate limited and failed calls
+    with jittered exponential backoff, honoring Retry-After. Non-idempotent
+    requests are only retried when Canva cannot have processed them.
+    """
+
+    BASE_URL = 'https://api.canva.com/rest/v1'
+    IDEMPOTENT_METHODS = {'GET', 'HEAD', 'OPTIONS', 'PUT', 'DELETE'}
+    IDEMPOTENT_RETRY_STATUSES = {429, 500, 502, 503, 504}
+    RETRY_STATUSES = {429, 503}
+
+    def __init__(self, pool_size: Optional[int] = None, connect_timeout: Optional[float] = None,
+                 read_timeout: Optional[float] = None, max_retries: Optional[int] = None,
+                 backoff: Optional[float] = None, max_backoff: Optional[float] = None):
+        self.timeout = (connect_timeout or settings.CANVA_API_CONNECT_TIMEOUT,
+                        read_timeout or settings.CANVA_API_READ_TIMEOUT)
+        self.max_retries = max_retries if max_retries is not None else settings.CANVA_API_MAX_RETRIES
+        self.backoff = backoff if backoff is not None else settings.CANVA_API_BACKOFF
+        self.max_backoff = max_backoff if max_backoff is not None else settings.CANVA_API_MAX_BACKOFF
+
+        pool_size = pool_size or settings.CANVA_API_POOL_SIZE
+        self.session = requests.Session()
+        # The session is shared between users, so never carry cookies across calls.
+        self.session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+        self.session.mount('https://', HTTPAdapter(
+            pool_connections=1, pool_maxsize=pool_size, pool_block=True))
+
+    def get(self, path: str, **kwargs) -> requests.Response:
+        return self.request('GET', path, **kwargs)
+
+    def post(self, path: str, **kwargs) -> requests.Response:
+        return self.request('POST', path, **kwargs)
+
+    def request(self, method: str, path: str, **kwargs) -> requests.Response:
+        url = f"{self.BASE_URL}{path}"
+        idempotent = method.upper() in self.IDEMPOTENT_METHODS
+        retry_statuses = self.IDEMPOTENT_RETRY_STATUSES if idempotent else self.RETRY_STATUSES
+        kwargs.setdefault('timeout', self.timeout)
+
+        attempt = 0
+        while True:
+            try:
+                response = self.session.request(method, url, **kwargs)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                # A read timeout may mean the request was processed.
+                retryable = idempotent or isinstance(e, requests.ConnectTimeout)
+                if not retryable or attempt >= self.max_retries:
+                    raise
+                delay = self._get_backoff(attempt)
+                logger.warning(
+                    f"Canva {method} {path} failed ({e}), retrying in {delay:.2f}s")
+            else:
+                if response.status_code not in retry_statuses or attempt >= self.max_retries:
+                    return response
+                retry_after = self._get_retry_after(response)
+                if retry_after is not None and retry_after > self.max_backoff:
+                    logger.warning(
+                        f"Canva {method} {path} asked to retry after {retry_after:.0f}s, giving up")
+                    return response
+                delay = retry_after if retry_after is not None else self._get_backoff(
+                    attempt)
+                logger.warning(
+                    f"Canva {method} {path} returned {response.status_code}, retrying in {delay:.2f}s")
+                response.close()
+
+            time.sleep(delay)
+            attempt += 1
+
+    def _get_backoff(self, attempt: int) -> float:
+        return random.uniform(0, min(self.max_backoff, self.backoff * 2 ** attempt))
+
+    @staticmethod
+    def _get_retry_after(response: requests.Response) -> Optional[float]:
+        value = response.headers.get('Retry-After')
+        if not value:
+            return None
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            pass
+        try:
+            return max(0.0, (parsedate_to_datetime(value) - timezone.now()).total_seconds())
+        except (TypeError, ValueError):
+            return None
+
+
+canva_client = CanvaAPIClient()
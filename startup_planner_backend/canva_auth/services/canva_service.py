@@ -1,6 +1,6 @@
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional
 from django.contrib.auth import get_user_model
-import requests
 from django.conf import settings
 import logging
 from .utils import (
@@ -8,12 +8,22 @@ from .utils import (
     generate_code_challenge,
     generate_state)
 
-from ..models import OAuthState
+from .canva_client import canva_client
+from .oauth_state_store import get_oauth_state_store
+from .token_service import canva_token_manager
 from datetime import timedelta
 from django.utils import timezone
+from startup_planner_backend.metrics import LatencyHistogram
 logger = logging.getLogger(__name__)
 User = get_user_model()
 
+# Runs independent Canva calls of a single request side by side.
+canva_executor = ThreadPoolExecutor(
+    max_workers=settings.CANVA_API_POOL_SIZE, thread_name_prefix='canva-api')
+
+# Latency of each phase of the OAuth callback in this process.
+callback_latency = LatencyHistogram()
+
 
 class CanvaService:
 
@@ -38,7 +48,6 @@ class CanvaService:
 
     @staticmethod
     def exchange_code_for_tokens(code: str, code_verifier: str) -> Optional[dict[str, any]]:
-        token_url = 'https://api.canva.com/rest/v1/oauth/token'
         data = {
             'grant_type': 'authorization_code',
             'client_id': settings.CANVA_CLIENT_ID,
@@ -47,8 +56,8 @@ class CanvaService:
             'code_verifier': code_verifier,
             'redirect_uri': settings.CANVA_REDIRECT_URI,
         }
-        response = requests.post(token_url, data=data, headers={
-                                 'Content-Type': 'application/x-www-form-urlencoded'})
+        response = canva_client.post('/oauth/token', data=data, headers={
+                                     'Content-Type': 'application/x-www-form-urlencoded'})
         if response.status_code != 200:
             logger.error(
                 'Failed to exchange authorization code for access token')
@@ -57,40 +66,47 @@ class CanvaService:
 
     @staticmethod
     def get_user_info(access_token: str) -> Optional[dict[str, any]]:
-        user_info_url = 'https://api.canva.com/rest/v1/users/me'
-        user_info_response = requests.get(
-            user_info_url, headers={'Authorization': f'Bearer {access_token}'})
+        user_info_response = canva_client.get(
+            '/users/me', headers={'Authorization': f'Bearer {access_token}'})
         if user_info_response.status_code != 200:
             logger.error('Failed to fetch user info from Canva')
             return None
         return user_info_response.json()
 
     @staticmethod
-    def validate_oauth_state(state: OAuthState) -> Optional[OAuthState]:
+    def save_oauth_state(state: str, code_verifier: str):
+        get_oauth_state_store().save(state, code_verifier)
 
-        try:
-            oauth_state = OAuthState.objects.get(state=state)
-        except OAuthState.DoesNotExist:
-            logger.error(f'Invalid state parameter: {state}')
-            return None
-
-        if oauth_state.is_expired():
-            oauth_state.delete()
-            logger.error(f'State parameter expired: {state}')
-            return None
-
-        return oauth_state
+    @staticmethod
+    def consume_oauth_state(state: str) -> Optional[str]:
+        """
+        Returns the code verifier saved for the state, which can be used once.
+        """
+        code_verifier = get_oauth_state_store().pop(state)
+        if code_verifier is None:
+            logger.error(f'Invalid or expired state parameter: {state}')
+        return code_verifier
 
     @staticmethod
     def get_user_profile(access_token: str) -> Optional[dict[str, any]]:
-        user_profile_url = 'https://api.canva.com/rest/v1/users/me/profile'
-        user_profile_response = requests.get(user_profile_url, headers={
-                                             'Authorization': f'Bearer {access_token}'})
+        user_profile_response = canva_client.get('/users/me/profile', headers={
+                                                 'Authorization': f'Bearer {access_token}'})
         if user_profile_response.status_code != 200:
             logger.error('Failed to fetch user profile from Canva')
             return None
         return user_profile_response.json()
 
+    @staticmethod
+    def get_user_details(access_token: str) -> tuple[Optional[dict[str, any]], Optional[dict[str, any]]]:
+        """
+        Fetches the user info and profile concurrently, so the caller waits
+        for the slower of the two calls instead of both.
+        """
+        user_profile = canva_executor.submit(
+            CanvaService.get_user_profile, access_token)
+        user_info = CanvaService.get_user_info(access_token)
+        return user_info, user_profile.result()
+
     @staticmethod
     def create_or_update_user(user_info: dict[str, any], user_profile: dict[str, any], access_token: str, refresh_token: str, expires_in: int) -> User:
 
@@ -110,5 +126,6 @@ class CanvaService:
                 'token_expiry': timezone.now() + timedelta(seconds=expires_in)
             }
         )
+        canva_token_manager.invalidate(user.pk)
 
         return user
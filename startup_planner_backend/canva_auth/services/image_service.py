@@ -0,0 +1,45 @@
+from io import BytesIO
+from typing import Iterable, Optional
+
+from django.conf import settings
+from PIL import Image, ImageOps, UnidentifiedImageError
+
+from .blob_service import BlobUploadError
+
+
+class ImageService:
+    """
+    Builds the square, resized variants served in place of full size avatars.
+    """
+
+    @staticmethod
+    def make_variants(file, sizes: Optional[Iterable[int]] = None) -> dict[int, bytes]:
+        """
+        Decodes the image once and returns WebP encoded thumbnails keyed by
+        their edge length in pixels, leaving the file at its start.
+        """
+        sizes = sorted(sizes or settings.AVATAR_VARIANT_SIZES, reverse=True)
+
+        file.seek(0)
+        try:
+            with Image.open(file) as image:
+                if image.width * image.height > settings.AVATAR_MAX_PIXELS:
+                    raise BlobUploadError("Image dimensions are too large")
+                # Lets JPEG decode straight at a reduced scale.
+                image.draft('RGB', (sizes[0], sizes[0]))
+                image = ImageOps.exif_transpose(image)
+                image = image.convert('RGBA' if image.mode in ('RGBA', 'LA', 'P') else 'RGB')
+                # Each variant is scaled down from the next larger one.
+                image = ImageOps.fit(image, (sizes[0], sizes[0]), Image.Resampling.LANCZOS)
+                variants = {}
+                for size in sizes:
+                    if image.width != size:
+                        image = image.resize((size, size), Image.Resampling.LANCZOS)
+                    buffer = BytesIO()
+                    image.save(buffer, 'WEBP', quality=settings.AVATAR_VARIANT_QUALITY, method=4)
+                    variants[size] = buffer.getvalue()
+        except (UnidentifiedImageError, Image.DecompressionBombError, OSError) as e:
+            raise BlobUploadError(f"Invalid image: {e}") from e
+        finally:
+            file.seek(0)
+        return variants
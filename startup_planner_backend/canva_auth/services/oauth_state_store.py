@@ -0,0 +1,115 @@
+import hashlib
+import logging
+from abc import ABC, abstractmethod
+from datetime import timedelta
+from functools import lru_cache
+from typing import Optional
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+from django.utils import timezone
+
+from ..models import OAuthState
+
+logger = logging.getLogger(__name__)
+
+
+class OAuthStateStore(ABC):
+    """
+    Base class for storing the PKCE code verifier of a pending OAuth login,
+    keyed by its state parameter. Each state can be consumed once, and states
+    older than ``ttl`` seconds are treated as missing.
+    """
+
+    def __init__(self, ttl: Optional[int] = None):
+        self.ttl = ttl or settings.OAUTH_STATE_TTL
+
+    @abstractmethod
+    def save(self, state: str, code_verifier: str):
+        ...
+
+    @abstractmethod
+    def pop(self, state: str) -> Optional[str]:
+        """
+        Returns the code verifier of the state and forgets it, or None when
+        the state is unknown, expired or was already consumed.
+        """
+
+
+class CacheOAuthStateStore(OAuthStateStore):
+    """
+    Keeps states in a Django cache, which expires abandoned logins natively.
+    """
+
+    def __init__(self, alias: Optional[str] = None, ttl: Optional[int] = None):
+        super().__init__(ttl)
+        self.alias = alias or settings.OAUTH_STATE_CACHE_ALIAS
+
+    @property
+    def cache(self):
+        return caches[self.alias]
+
+    def save(self, state: str, code_verifier: str):
+        self.cache.set(self._make_key(state), code_verifier, self.ttl)
+
+    def pop(self, state: str) -> Optional[str]:
+        key = self._make_key(state)
+        code_verifier = self.cache.get(key)
+        # Only the caller whose delete removed the key may use the verifier,
+        # so a replayed callback cannot consume the same state twice.
+        if code_verifier is None or not self.cache.delete(key):
+            return None
+        return code_verifier
+
+    @staticmethod
+    def _make_key(state: str) -> str:
+        return f"oauth_state:{hashlib.sha256(state.encode('utf-8')).hexdigest()}"
+
+
+class DatabaseOAuthStateStore(OAuthStateStore):
+    """
+    Keeps states in the OAuthState table. Abandoned rows are removed by the
+    purge_oauth_states command.
+    """
+
+    def save(self, state: str, code_verifier: str):
+        OAuthState.objects.create(state=state, code_verifier=code_verifier)
+
+    def pop(self, state: str) -> Optional[str]:
+        oauth_state = OAuthState.objects.filter(state=state).only(
+            'id', 'code_verifier', 'created_at').first()
+        if oauth_state is None:
+            return None
+
+        deleted, _ = OAuthState.objects.filter(pk=oauth_state.pk).delete()
+        if not deleted or oauth_state.created_at < timezone.now() - timedelta(seconds=self.ttl):
+            return None
+        return oauth_state.code_verifier
+
+
+def get_oauth_state_store() -> OAuthStateStore:
+    """
+    Builds the state store selected by the OAUTH_STATE_STORE setting.
+
+    The cache store falls back to the database when the cache is local to
+    the process, since the callback may be served by a different worker than
+    the one that started the login.
+    """
+    backend = settings.OAUTH_STATE_STORE
+    if backend == 'cache':
+        cache = caches[settings.OAUTH_STATE_CACHE_ALIAS]
+        if isinstance(cache, (LocMemCache, DummyCache)):
+            _warn_process_local_cache(settings.OAUTH_STATE_CACHE_ALIAS)
+            return DatabaseOAuthStateStore()
+        return CacheOAuthStateStore()
+    if backend == 'database':
+        return DatabaseOAuthStateStore()
+    raise ValueError(f"Unknown OAUTH_STATE_STORE: {backend}")
+
+
+@lru_cache(maxsize=None)
+def _warn_process_local_cache(alias: str):
+    logger.warning(
+        f"Cache '{alias}' is not shared between processes, storing OAuth states in the database")
@@ -0,0 +1,174 @@
+import logging
+import threading
+import weakref
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Optional
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.utils import timezone
+
+from .canva_client import canva_client
+
+logger = logging.getLogger(__name__)
+User = get_user_model()
+
+
+def request_token_refresh(refresh_token: str) -> dict[str, any]:
+    """
+    Exchanges a refresh token for a new access token at Canva.
+    """
+    data = {
+        'grant_type': 'refresh_token',
+        'refresh_token': refresh_token,
+        'client_id': settings.CANVA_CLIENT_ID,
+        'client_secret': settings.CANVA_CLIENT_SECRET,
+    }
+
+    response = canva_client.post('/oauth/token', data=data, headers={
+                                 'Content-Type': 'application/x-www-form-urlencoded'})
+
+    if response.status_code != 200:
+        raise Exception('Failed to refresh access token')
+    return response.json()
+
+
+class CanvaTokenManager:
+    """
+    Hands out valid Canva access tokens.
+
+    Tokens are served from a process-local LRU cache of ``max_local_tokens``
+    users, then the shared Django cache, before touching the user row. Tokens
+    are refreshed CANVA_TOKEN_REFRESH_MARGIN seconds ahead of expiry, and
+    refreshes are single-flight within a process: a per-user lock serializes
+    its threads, so a burst of requests causes one call to Canva instead of
+    one per request. The call to Canva holds no transaction or row lock;
+    concurrent refreshes from other processes are resolved when saving (see
+    ``_refresh_tokens``).
+    """
+
+    def __init__(self, refresh_margin: Optional[int] = None, cache_alias: Optional[str] = None,
+                 max_local_tokens: int = 1024):
+        self.refresh_margin = timedelta(
+            seconds=refresh_margin if refresh_margin is not None else settings.CANVA_TOKEN_REFRESH_MARGIN)
+        self.cache_alias = cache_alias or settings.CANVA_TOKEN_CACHE_ALIAS
+        self.max_local_tokens = max_local_tokens
+        self._tokens = OrderedDict()
+        self._lock = threading.Lock()
+        # Locks only live while a thread holds or waits for them.
+        self._refresh_locks = weakref.WeakValueDictionary()
+
+    def get_access_token(self, user: User) -> str:
+        access_token = self._get_cached_token(user.pk)
+        if access_token:
+            return access_token
+
+        with self._get_refresh_lock(user.pk):
+            # Another thread may have refreshed the token while we waited.
+            access_token = self._get_cached_token(user.pk)
+            if access_token:
+                return access_token
+            return self._load_or_refresh(user)
+
+    def refresh(self, user: User) -> str:
+        """
+        Refreshes the user's token regardless of its expiry.
+        """
+        with self._get_refresh_lock(user.pk):
+            return self._load_or_refresh(user, force=True)
+
+    def invalidate(self, user_id: int):
+        with self._lock:
+            self._tokens.pop(user_id, None)
+        caches[self.cache_alias].delete(self._cache_key(user_id))
+
+    def _load_or_refresh(self, user: User, force: bool = False) -> str:
+        current = self._load_tokens(user.pk)
+        if force or not self._is_fresh(current.token_expiry):
+            logger.info(f"Refreshing Canva access token for user {user.pk}")
+            current = self._refresh_tokens(current)
+
+        user.access_token = current.access_token
+        user.refresh_token = current.refresh_token
+        user.token_expiry = current.token_expiry
+        self._remember(user.pk, user.access_token, user.token_expiry)
+        return user.access_token
+
+    @staticmethod
+    def _load_tokens(user_id: int) -> User:
+        return User.objects.only('id', 'access_token', 'refresh_token', 'token_expiry').get(pk=user_id)
+
+    def _refresh_tokens(self, current: User) -> User:
+        """
+        Refreshes the tokens at Canva and saves them only if the row still
+        holds the refresh token that was used. When another process refreshed
+        first, its tokens are used instead.
+        """
+        try:
+            tokens = request_token_refresh(current.refresh_token)
+        except Exception:
+            latest = self._load_tokens(current.pk)
+            if latest.refresh_token != current.refresh_token and self._is_fresh(latest.token_expiry):
+                return latest
+            raise
+
+        token_expiry = timezone.now() + timedelta(seconds=tokens.get('expires_in'))
+        updated = User.objects.filter(pk=current.pk, refresh_token=current.refresh_token).update(
+            access_token=tokens.get('access_token'), refresh_token=tokens.get('refresh_token'),
+            token_expiry=token_expiry)
+        if not updated:
+            logger.info(f"Canva access token of user {current.pk} was refreshed concurrently")
+            return self._load_tokens(current.pk)
+
+        current.access_token = tokens.get('access_token')
+        current.refresh_token = tokens.get('refresh_token')
+        current.token_expiry = token_expiry
+        return current
+
+    def _get_cached_token(self, user_id: int) -> Optional[str]:
+        with self._lock:
+            entry = self._tokens.get(user_id)
+            if entry:
+                self._tokens.move_to_end(user_id)
+        if entry and self._is_fresh(entry[1]):
+            return entry[0]
+
+        entry = caches[self.cache_alias].get(self._cache_key(user_id))
+        if entry and self._is_fresh(entry[1]):
+            self._remember_locally(user_id, entry)
+            return entry[0]
+        return None
+
+    def _remember(self, user_id: int, access_token: str, expiry: datetime):
+        entry = (access_token, expiry)
+        self._remember_locally(user_id, entry)
+        timeout = (expiry - timezone.now()).total_seconds()
+        if timeout > 0:
+            caches[self.cache_alias].set(
+                self._cache_key(user_id), entry, timeout)
+
+    def _remember_locally(self, user_id: int, entry: tuple):
+        with self._lock:
+            self._tokens[user_id] = entry
+            self._tokens.move_to_end(user_id)
+            while len(self._tokens) > self.max_local_tokens:
+                self._tokens.popitem(last=False)
+
+    def _get_refresh_lock(self, user_id: int) -> threading.Lock:
+        with self._lock:
+            lock = self._refresh_locks.get(user_id)
+            if lock is None:
+                lock = self._refresh_locks[user_id] = threading.Lock()
+            return lock
+
+    def _is_fresh(self, expiry: Optional[datetime]) -> bool:
+        return expiry is not None and expiry - self.refresh_margin > timezone.now()
+
+    @staticmethod
+    def _cache_key(user_id: int) -> str:
+        return f'canva_token:{user_id}'
+
+
+canva_token_manager = CanvaTokenManager()
@@ -1,6 +1,9 @@
 from rest_framework.response import Response
 from rest_framework import status
-from .utils import upload_to_vercel_blob
+from django.conf import settings
+from django.core.files.uploadedfile import UploadedFile
+from .avatar_service import AvatarService
+from .blob_service import BlobUploadError
 from rest_framework.serializers import Serializer
 from django.contrib.auth import get_user_model
 
@@ -18,15 +21,35 @@ class UserService:
     @classmethod
     def update_account_details(cls, user: User, data: dict[str, any], serializer_class: Serializer):
         file = data.get('avatar')
+        spooled_avatar = None
+        avatar_fields = {}
         if file:
+            if not isinstance(file, UploadedFile):
+                return Response({"error": "Avatar must be an uploaded image file"},
+                                status=status.HTTP_400_BAD_REQUEST)
             try:
-                blob_url = upload_to_vercel_blob(file)
-                data['avatar'] = blob_url
-            except Exception as e:
+                if settings.AVATAR_UPLOAD_IN_BACKGROUND:
+                    spooled_avatar = AvatarService.spool(file)
+                    data.pop('avatar')
+                else:
+                    data['avatar'], avatar_fields['avatar_variants'] = AvatarService.upload(user.pk, file)
+            except BlobUploadError as e:
                 return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
 
         serializer = serializer_class(user, data=data, partial=True)
         if serializer.is_valid():
-            serializer.save()
+            try:
+                serializer.save(**avatar_fields)
+            except Exception:
+                if spooled_avatar:
+                    AvatarService.discard(spooled_avatar)
+                raise
+            if spooled_avatar:
+                # Started after the save so it cannot be overwritten by it.
+                AvatarService.upload_in_background(user, spooled_avatar, file.name)
+                return Response({**serializer.data, 'avatar_pending': True}, status=status.HTTP_202_ACCEPTED)
             return Response(serializer.data)
+
+        if spooled_avatar:
+            AvatarService.discard(spooled_avatar)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
@@ -2,7 +2,6 @@ import os
 import base64
 import hashlib
 import logging
-from vercel_blob import put
 
 logger = logging.getLogger(__name__)
 
@@ -28,8 +27,3 @@ def generate_state() -> str:
     Generates a secure random string for the state parameter.
     """
     return base64.urlsafe_b64encode(os.urandom(16)).decode('utf-8').rstrip('=')
-
-
-def upload_to_vercel_blob(file):
-    response = put(file.name, file.read(), {'access': 'public'})
-    return response['url']
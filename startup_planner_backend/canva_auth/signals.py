@@ -0,0 +1,25 @@
+from functools import partial
+
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .services.auth_check_service import AuthCheckService
+
+User = get_user_model()
+
+
+# Invalidating before the transaction commits would let a concurrent check
+# cache the old hash again, so the cached hash is dropped on commit.
+@receiver(post_save, sender=User)
+def invalidate_auth_check_on_save(sender, instance, update_fields=None, **kwargs):
+    # Session auth hashes derive from the password; token refreshes keep them.
+    if update_fields is not None and 'password' not in update_fields:
+        return
+    transaction.on_commit(partial(AuthCheckService.invalidate, instance.pk))
+
+
+@receiver(post_delete, sender=User)
+def invalidate_auth_check_on_delete(sender, instance, **kwargs):
+    transaction.on_commit(partial(AuthCheckService.invalidate, instance.pk))
@@ -1,2 +1,645 @@
+import os
+import tempfile
+import threading
+import uuid
+from datetime import timedelta
+from io import BytesIO, StringIO
+from unittest import skipUnless
+from unittest.mock import Mock, patch
 
-# Create your tests here.
+import requests
+from PIL import Image
+from django.contrib.auth import get_user_model
+from django.contrib.sessions.models import Session
+from django.core.cache import cache
+from django.core.files import File
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.test.client import BOUNDARY, MULTIPART_CONTENT, encode_multipart
+from django.urls import reverse
+from django.utils import timezone
+
+from startup_planner_backend.metrics import LatencyHistogram
+from .management.commands.benchmark_check_auth import BENCHMARK_EMAIL
+from .models import OAuthState
+from .services.auth_check_service import AuthCheckService
+from .services.avatar_service import AvatarService, avatar_executor
+from .services.blob_service import BlobService, BlobUploadError, sniff_image_type
+from .services.canva_client import CanvaAPIClient
+from .services.canva_service import CanvaService, callback_latency
+from .services.image_service import ImageService
+from .services.oauth_state_store import (CacheOAuthStateStore, DatabaseOAuthStateStore, OAuthStateStore,
+                                         get_oauth_state_store)
+from .services.token_service import CanvaTokenManager
+
+try:
+    import redis
+except ImportError:
+    redis = None
+
+User = get_user_model()
+
+
+def reachable_redis_url():
+    """
+    Returns REDIS_URL when a Redis server answers there, so tests against a
+    real Redis run only where one is available.
+    """
+    url = os.getenv('REDIS_URL')
+    if redis is None or not url:
+        return None
+    try:
+        redis.Redis.from_url(url, socket_connect_timeout=1).ping()
+    except redis.RedisError:
+        return None
+    return url
+
+
+REDIS_URL = reachable_redis_url()
+
+
+def make_tokens(access_token='new-access', refresh_token='new-refresh', expires_in=3600):
+    return {'access_token': access_token, 'refresh_token': refresh_token, 'expires_in': expires_in}
+
+
+@patch('canva_auth.services.token_service.request_token_refresh', return_value=make_tokens())
+class CanvaTokenManagerTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(email='testuser@test.com', password='12345')
+        self.user.set_tokens('old-access', 'old-refresh', 3600)
+        self.manager = CanvaTokenManager(refresh_margin=300)
+
+    def test_valid_token_served_from_cache(self, mock_refresh):
+        self.assertEqual(self.manager.get_access_token(self.user), 'old-access')
+        with self.assertNumQueries(0):
+            self.assertEqual(self.manager.get_access_token(self.user), 'old-access')
+        mock_refresh.assert_not_called()
+
+    def test_token_shared_between_managers(self, mock_refresh):
+        self.manager.get_access_token(self.user)
+        with self.assertNumQueries(0):
+            self.assertEqual(CanvaTokenManager().get_access_token(self.user), 'old-access')
+
+    def test_token_refreshed_ahead_of_expiry(self, mock_refresh):
+        self.user.set_tokens('old-access', 'old-refresh', 60)
+
+        self.assertEqual(self.manager.get_access_token(self.user), 'new-access')
+
+        mock_refresh.assert_called_once_with('old-refresh')
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.refresh_token, 'new-refresh')
+        self.assertGreater(self.user.token_expiry, timezone.now() + timedelta(minutes=50))
+
+    def test_invalidate_drops_cached_token(self, mock_refresh):
+        self.manager.get_access_token(self.user)
+        User.objects.filter(pk=self.user.pk).update(access_token='rotated-access')
+
+        self.manager.invalidate(self.user.pk)
+
+        self.assertEqual(self.manager.get_access_token(self.user), 'rotated-access')
+
+    def test_concurrent_refresh_of_other_process_wins(self, mock_refresh):
+        self.user.set_tokens('old-access', 'old-refresh', 60)
+
+        def refreshed_elsewhere(refresh_token):
+            # Another process saves its refresh while this one calls Canva.
+            User.objects.get(pk=self.user.pk).set_tokens('other-access', 'other-refresh', 3600)
+            return make_tokens()
+
+        mock_refresh.side_effect = refreshed_elsewhere
+
+        self.assertEqual(self.manager.get_access_token(self.user), 'other-access')
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.refresh_token, 'other-refresh')
+
+    def test_local_tokens_and_locks_are_bounded(self, mock_refresh):
+        manager = CanvaTokenManager(refresh_margin=300, max_local_tokens=2)
+        for index in range(3):
+            user = User.objects.create_user(email=f'user{index}@test.com', password='12345')
+            user.set_tokens(f'access-{index}', 'refresh', 3600)
+            manager.get_access_token(user)
+
+        self.assertEqual(len(manager._tokens), 2)
+        self.assertEqual(len(manager._refresh_locks), 0)
+
+
+class CanvaTokenManagerConcurrencyTest(TransactionTestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(email='testuser@test.com', password='12345')
+        self.user.set_tokens('old-access', 'old-refresh', 0)
+
+    def test_concurrent_requests_refresh_once(self):
+        manager = CanvaTokenManager(refresh_margin=300)
+        tokens = []
+        barrier = threading.Barrier(5)
+
+        def get_token():
+            barrier.wait()
+            tokens.append(manager.get_access_token(User.objects.get(pk=self.user.pk)))
+
+        with patch('canva_auth.services.token_service.request_token_refresh', return_value=make_tokens()) as mock_refresh:
+            threads = [threading.Thread(target=get_token) for _ in range(5)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        mock_refresh.assert_called_once()
+        self.assertEqual(tokens, ['new-access'] * 5)
+
+
+def make_response(status_code=200, headers=None):
+    response = Mock(status_code=status_code, headers=headers or {})
+    response.json.return_value = {}
+    return response
+
+
+@patch('canva_auth.services.canva_client.time.sleep')
+class CanvaAPIClientTest(TestCase):
+    def setUp(self):
+        self.client = CanvaAPIClient(max_retries=2, backoff=0.5, max_backoff=8)
+        self.request = patch.object(self.client.session, 'request').start()
+        self.addCleanup(patch.stopall)
+
+    def test_requests_use_timeouts_and_base_url(self, mock_sleep):
+        self.request.return_value = make_response()
+
+        self.client.get('/users/me')
+
+        self.request.assert_called_once_with(
+            'GET', 'https://api.canva.com/rest/v1/users/me', timeout=self.client.timeout)
+
+    def test_retries_server_errors_with_backoff(self, mock_sleep):
+        self.request.side_effect = [make_response(502), make_response(503), make_response()]
+
+        response = self.client.get('/users/me')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.request.call_count, 3)
+        self.assertEqual(mock_sleep.call_count, 2)
+        self.assertLessEqual(mock_sleep.call_args_list[1].args[0], 1.0)
+
+    def test_honors_retry_after(self, mock_sleep):
+        self.request.side_effect = [make_response(429, {'Retry-After': '2'}), make_response()]
+
+        self.client.get('/users/me')
+
+        mock_sleep.assert_called_once_with(2.0)
+
+    def test_gives_up_when_retry_after_exceeds_max_backoff(self, mock_sleep):
+        self.request.return_value = make_response(429, {'Retry-After': '120'})
+
+        self.assertEqual(self.client.get('/users/me').status_code, 429)
+        mock_sleep.assert_not_called()
+
+    def test_returns_last_response_after_max_retries(self, mock_sleep):
+        self.request.return_value = make_response(500)
+
+        self.assertEqual(self.client.get('/users/me').status_code, 500)
+        self.assertEqual(self.request.call_count, 3)
+
+    def test_post_not_retried_when_possibly_processed(self, mock_sleep):
+        self.request.side_effect = [make_response(500)]
+        self.assertEqual(self.client.post('/oauth/token').status_code, 500)
+
+        self.request.side_effect = requests.ReadTimeout()
+        with self.assertRaises(requests.ReadTimeout):
+            self.client.post('/oauth/token')
+        mock_sleep.assert_not_called()
+
+    def test_post_retried_on_connect_timeout(self, mock_sleep):
+        self.request.side_effect = [requests.ConnectTimeout(), make_response()]
+
+        self.assertEqual(self.client.post('/oauth/token').status_code, 200)
+        self.assertEqual(self.request.call_count, 2)
+
+
+class CanvaCallbackTest(TestCase):
+    def setUp(self):
+        callback_latency.reset()
+        CanvaService.save_oauth_state('state', 'verifier')
+        self.url = reverse('canva_auth:canva_callback')
+
+    def test_user_info_and_profile_fetched_concurrently(self):
+        barrier = threading.Barrier(2, timeout=5)
+
+        def fetch(payload):
+            def call(access_token):
+                barrier.wait()
+                return payload
+            return call
+
+        with patch.object(CanvaService, 'get_user_info', side_effect=fetch({'team_user': {}})), \
+                patch.object(CanvaService, 'get_user_profile', side_effect=fetch({'display_name': 'Jo'})):
+            user_info, user_profile = CanvaService.get_user_details('access')
+
+        self.assertEqual(user_info, {'team_user': {}})
+        self.assertEqual(user_profile, {'display_name': 'Jo'})
+
+    @patch.object(CanvaService, 'get_user_profile', return_value={'display_name': 'Jo'})
+    @patch.object(CanvaService, 'get_user_info', return_value={'team_user': {'user_id': 'u1', 'team_id': 't1'}})
+    @patch.object(CanvaService, 'exchange_code_for_tokens', return_value=make_tokens())
+    def test_callback_logs_in_and_records_latency(self, mock_exchange, mock_info, mock_profile):
+        response = self.client.get(self.url, {'code': 'code', 'state': 'state'})
+
+        self.assertEqual(response.status_code, 302)
+        user = User.objects.get(canva_user_id='u1')
+        self.assertEqual(user.display_name, 'Jo')
+        self.assertEqual(int(self.client.session['_auth_user_id']), user.pk)
+        self.assertFalse(OAuthState.objects.exists())
+
+        snapshot = callback_latency.snapshot()
+        for phase in ('total', 'validate_state', 'exchange_code', 'fetch_user', 'login'):
+            self.assertEqual(snapshot[phase]['count'], 1)
+
+    @patch.object(CanvaService, 'get_user_profile', return_value=None)
+    @patch.object(CanvaService, 'get_user_info', return_value={'team_user': {}})
+    @patch.object(CanvaService, 'exchange_code_for_tokens', return_value=make_tokens())
+    def test_callback_fails_without_profile(self, mock_exchange, mock_info, mock_profile):
+        response = self.client.get(self.url, {'code': 'code', 'state': 'state'})
+
+        self.assertEqual(response.status_code, 500)
+        self.assertFalse(User.objects.exists())
+
+
+class LatencyHistogramTest(TestCase):
+    def test_percentiles_and_buckets(self):
+        histogram = LatencyHistogram(buckets=(10, 100, 1000))
+        for seconds in (0.005, 0.05, 0.05, 0.5, 5):
+            histogram.observe('total', seconds)
+
+        snapshot = histogram.snapshot()['total']
+
+        self.assertEqual(snapshot['count'], 5)
+        self.assertEqual(snapshot['p50'], 100)
+        self.assertEqual(snapshot['p95'], float('inf'))
+        self.assertEqual(snapshot['buckets'], {'10': 1, '100': 3, '1000': 4, '+Inf': 5})
+        self.assertIsNone(histogram.percentile('missing', 0.5))
+
+
+class OAuthStateStoreTest(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_cache_store_consumes_state_once(self):
+        store = CacheOAuthStateStore(ttl=60)
+        store.save('state', 'verifier')
+
+        with self.assertNumQueries(0):
+            self.assertEqual(store.pop('state'), 'verifier')
+            self.assertIsNone(store.pop('state'))
+        self.assertFalse(OAuthState.objects.exists())
+
+    def test_database_store_consumes_state_once(self):
+        store = DatabaseOAuthStateStore(ttl=60)
+        store.save('state', 'verifier')
+
+        self.assertEqual(store.pop('state'), 'verifier')
+        self.assertIsNone(store.pop('state'))
+        self.assertFalse(OAuthState.objects.exists())
+
+    def test_database_store_rejects_expired_state(self):
+        store = DatabaseOAuthStateStore(ttl=60)
+        store.save('state', 'verifier')
+        OAuthState.objects.update(created_at=timezone.now() - timedelta(minutes=5))
+
+        self.assertIsNone(store.pop('state'))
+        self.assertFalse(OAuthState.objects.exists())
+
+    def test_process_local_cache_falls_back_to_database(self):
+        self.assertIsInstance(get_oauth_state_store(), DatabaseOAuthStateStore)
+
+        with override_settings(OAUTH_STATE_STORE='database'):
+            self.assertIsInstance(get_oauth_state_store(), DatabaseOAuthStateStore)
+
+        with override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+                                                   'LOCATION': '/tmp/oauth-state-test'}}):
+            self.assertIsInstance(get_oauth_state_store(), CacheOAuthStateStore)
+
+    def test_incomplete_store_cannot_be_created(self):
+        class IncompleteOAuthStateStore(OAuthStateStore):
+            def save(self, state, code_verifier):
+                pass
+
+        with self.assertRaises(TypeError):
+            IncompleteOAuthStateStore(ttl=60)
+
+    def test_purge_command_deletes_expired_states(self):
+        OAuthState.objects.create(state='old', code_verifier='verifier')
+        OAuthState.objects.update(created_at=timezone.now() - timedelta(hours=1))
+        OAuthState.objects.create(state='new', code_verifier='verifier')
+
+        call_command('purge_oauth_states', batch_size=1, stdout=StringIO())
+
+        self.assertEqual(list(OAuthState.objects.values_list('state', flat=True)), ['new'])
+
+
+class SessionEngineTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(email='session@test.com', password='12345')
+
+    def check_auth_queries(self, engine, expected_queries):
+        client = self.client_class()
+        with override_settings(SESSION_ENGINE=f'django.contrib.sessions.backends.{engine}'):
+            client.force_login(self.user)
+            with self.assertNumQueries(expected_queries):
+                response = client.get(reverse('canva_auth:check_auth'))
+        self.assertEqual(response.status_code, 200)
+
+    def test_database_sessions_read_session_and_user(self):
+        self.check_auth_queries('db', 2)
+
+    def test_cached_sessions_only_read_user(self):
+        self.check_auth_queries('cached_db', 1)
+        self.check_auth_queries('cache', 1)
+
+    def test_signed_cookie_sessions_only_read_user(self):
+        self.check_auth_queries('signed_cookies', 1)
+
+    def test_logout_ends_cached_session(self):
+        with override_settings(SESSION_ENGINE='django.contrib.sessions.backends.cached_db'):
+            self.client.force_login(self.user)
+            self.client.post(reverse('canva_auth:logout'))
+            response = self.client.get(reverse('canva_auth:check_auth'))
+        self.assertEqual(response.status_code, 403)
+
+
+# The cache is not cleared, as that would flush the whole Redis database;
+# a unique key prefix keeps runs apart instead.
+@skipUnless(REDIS_URL, "Requires a Redis server at REDIS_URL")
+@override_settings(
+    CACHES={'default': {'BACKEND': 'django.core.cache.backends.redis.RedisCache', 'LOCATION': REDIS_URL,
+                        'KEY_PREFIX': f'startup_planner_test_{uuid.uuid4().hex}', 'TIMEOUT': 60}},
+    SESSION_ENGINE='django.contrib.sessions.backends.cached_db')
+class RedisSessionTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(email='redis@test.com', password='12345')
+        self.client.force_login(self.user)
+        self.url = reverse('canva_auth:check_auth')
+
+    def test_session_is_read_from_redis(self):
+        with self.assertNumQueries(1):
+            response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+
+        with self.assertNumQueries(0):
+            response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+
+    def test_logout_ends_session(self):
+        self.client.post(reverse('canva_auth:logout'))
+
+        self.assertEqual(self.client.get(self.url).status_code, 403)
+
+
+@override_settings(
+    CACHES={'default': {'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+                        'LOCATION': tempfile.mkdtemp(prefix='auth-check-test')}},
+    SESSION_ENGINE='django.contrib.sessions.backends.cached_db')
+class CheckAuthFastPathTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(email='poll@test.com', password='12345')
+        self.client.force_login(self.user)
+        self.url = reverse('canva_auth:check_auth')
+
+    def test_cached_check_does_not_query(self):
+        with self.assertNumQueries(1):
+            response = self.client.get(self.url)
+        self.assertEqual(response.json(), {'isAuthenticated': True})
+
+        with self.assertNumQueries(0):
+            response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+
+        with self.assertNumQueries(0):
+            response = self.client.get(self.url, HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(response.status_code, 304)
+
+    def test_anonymous_request_is_rejected(self):
+        self.client.logout()
+        with self.assertNumQueries(0):
+            response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 403)
+
+    def test_password_change_ends_sessions(self):
+        self.client.get(self.url)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.set_password('new-password')
+            self.user.save()
+
+        self.assertEqual(self.client.get(self.url).status_code, 403)
+
+    def test_cached_hash_is_dropped_on_commit(self):
+        self.client.get(self.url)
+        key = AuthCheckService._cache_key(self.user.pk)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.set_password('new-password')
+            self.user.save()
+            self.assertIsNotNone(cache.get(key))
+        self.assertIsNone(cache.get(key))
+
+    def test_cached_hash_is_dropped_when_user_is_deleted(self):
+        self.client.get(self.url)
+        key = AuthCheckService._cache_key(self.user.pk)
+        self.assertIsNotNone(cache.get(key))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.delete()
+        self.assertIsNone(cache.get(key))
+
+    def test_token_refresh_keeps_cached_check(self):
+        self.client.get(self.url)
+        self.user.access_token = 'token'
+        self.user.save(update_fields=['access_token'])
+
+        with self.assertNumQueries(0):
+            self.assertEqual(self.client.get(self.url).status_code, 200)
+
+    def test_benchmark_removes_its_user_and_session(self):
+        sessions = Session.objects.count()
+
+        call_command('benchmark_check_auth', requests=2, stdout=StringIO())
+
+        self.assertFalse(User.objects.filter(email=BENCHMARK_EMAIL).exists())
+        self.assertEqual(Session.objects.count(), sessions)
+
+    def test_process_local_cache_is_not_used(self):
+        with override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}):
+            self.assertIsNone(AuthCheckService.get_cache())
+
+
+PNG = b'\x89PNG\r\n\x1a\n' + b'\x00' * 200
+
+
+def make_image(size=(300, 200), mode='RGB', format='PNG') -> bytes:
+    buffer = BytesIO()
+    Image.new(mode, size, 'red').save(buffer, format)
+    return buffer.getvalue()
+
+
+def fake_blob_upload(path, data, content_type):
+    if not isinstance(data, bytes):
+        data = b''.join(data)
+    return f'https://blob.test/{path}'
+
+
+def make_blob_response(url='https://blob.test/avatar.png'):
+    response = make_response()
+    response.json.return_value = {'url': url}
+    return response
+
+
+@override_settings(BLOB_READ_WRITE_TOKEN='token')
+class BlobServiceTest(TestCase):
+    def setUp(self):
+        self.put = patch.object(BlobService.get_session(), 'put', side_effect=self._consume).start()
+        self.addCleanup(patch.stopall)
+        self.sent_chunks = []
+
+    def _consume(self, url, data, headers, timeout):
+        self.sent_chunks = list(data)
+        return make_blob_response()
+
+    def test_sniffs_image_types(self):
+        self.assertEqual(sniff_image_type(PNG), 'image/png')
+        self.assertEqual(sniff_image_type(b'\xff\xd8\xff\xe0'), 'image/jpeg')
+        self.assertEqual(sniff_image_type(b'GIF89a'), 'image/gif')
+        self.assertEqual(sniff_image_type(b'RIFF\x00\x00\x00\x00WEBPVP8 '), 'image/webp')
+        self.assertIsNone(sniff_image_type(b'<svg xmlns='))
+
+    def test_streams_image_in_chunks(self):
+        file = File(BytesIO(PNG), name='avatar.jpg')
+
+        url = BlobService.upload_image(file, chunk_size=64)
+
+        self.assertEqual(url, 'https://blob.test/avatar.png')
+        self.assertEqual(b''.join(self.sent_chunks), PNG)
+        self.assertEqual(len(self.sent_chunks), 4)
+        headers = self.put.call_args.kwargs['headers']
+        self.assertEqual(headers['x-content-type'], 'image/png')
+
+    def test_rejects_non_images(self):
+        file = SimpleUploadedFile('avatar.png', b'<html></html>', content_type='image/png')
+
+        with self.assertRaisesMessage(BlobUploadError, 'Unsupported image format'):
+            BlobService.upload_image(file)
+        self.put.assert_not_called()
+
+    def test_enforces_size_cap(self):
+        with self.assertRaises(BlobUploadError):
+            BlobService.upload_image(SimpleUploadedFile('avatar.png', PNG), max_size=100)
+        self.put.assert_not_called()
+
+        # A file that is larger than it claims is cut off while streaming.
+        file = File(BytesIO(PNG), name='avatar.png')
+        file.size = 10
+        with self.assertRaises(BlobUploadError):
+            BlobService.upload_image(file, max_size=100, chunk_size=64)
+
+
+class AvatarUploadTest(TransactionTestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(email='testuser@test.com', password='12345')
+        self.client.force_login(self.user)
+        self.url = reverse('canva_auth:account')
+
+    def put_multipart(self, data):
+        return self.client.put(self.url, encode_multipart(BOUNDARY, data), content_type=MULTIPART_CONTENT)
+
+    @patch.object(BlobService, 'upload', side_effect=fake_blob_upload)
+    def test_avatar_uploaded_during_request(self, mock_upload):
+        response = self.put_multipart({'avatar': SimpleUploadedFile('avatar.png', make_image())})
+
+        self.assertEqual(response.status_code, 200)
+        avatar = response.json()['avatar']
+        self.assertRegex(avatar, rf'^https://blob\.test/avatars/{self.user.pk}/[0-9a-f]{{16}}/avatar\.png$')
+        directory = avatar.rsplit('/', 1)[0]
+        self.assertEqual(response.json()['avatar_variants'], {
+            '256': f'{directory}/avatar-256.webp',
+            '128': f'{directory}/avatar-128.webp',
+            '64': f'{directory}/avatar-64.webp',
+        })
+
+    @patch.object(BlobService, 'upload', side_effect=fake_blob_upload)
+    def test_avatars_with_the_same_name_do_not_collide(self, mock_upload):
+        other_user = User.objects.create_user(email='otheruser@test.com', password='12345')
+
+        first = AvatarService.upload(self.user.pk, SimpleUploadedFile('avatar.png', make_image()))
+        second = AvatarService.upload(other_user.pk, SimpleUploadedFile('avatar.png', make_image()))
+        again = AvatarService.upload(self.user.pk, SimpleUploadedFile('avatar.png', make_image()))
+
+        urls = [url for upload in (first, second, again) for url in [upload[0], *upload[1].values()]]
+        self.assertEqual(len(set(urls)), len(urls))
+
+    def test_invalid_avatar_rejected(self):
+        response = self.put_multipart({'avatar': SimpleUploadedFile('avatar.png', b'not an image')})
+
+        self.assertEqual(response.status_code, 400)
+
+    def test_undecodable_avatar_rejected(self):
+        response = self.put_multipart({'avatar': SimpleUploadedFile('avatar.png', PNG)})
+
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('Invalid image', response.json()['error'])
+
+    def test_avatar_url_rejected(self):
+        response = self.put_multipart({'avatar': 'https://blob.test/avatar.png'})
+
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('uploaded image file', response.json()['error'])
+
+    @override_settings(AVATAR_UPLOAD_IN_BACKGROUND=True)
+    def test_spooled_avatar_removed_when_save_fails(self):
+        spooled = []
+        spool = AvatarService.spool
+        with patch.object(AvatarService, 'spool', side_effect=lambda file: spooled.append(spool(file)) or spooled[-1]), \
+                patch('rest_framework.serializers.ModelSerializer.save', side_effect=RuntimeError("database is down")):
+            with self.assertRaises(RuntimeError):
+                self.put_multipart({'avatar': SimpleUploadedFile('avatar.png', make_image())})
+
+        self.assertFalse(os.path.exists(spooled[0]))
+
+    @override_settings(AVATAR_UPLOAD_IN_BACKGROUND=True)
+    @patch.object(BlobService, 'upload', side_effect=fake_blob_upload)
+    def test_avatar_uploaded_in_background(self, mock_upload):
+        futures = []
+        submit = avatar_executor.submit
+        with patch.object(avatar_executor, 'submit', side_effect=lambda *args: futures.append(submit(*args)) or futures[-1]):
+            response = self.put_multipart({'avatar': SimpleUploadedFile('avatar.png', make_image()), 'bio': 'Founder'})
+
+        self.assertEqual(response.status_code, 202)
+        self.assertTrue(response.json()['avatar_pending'])
+        url = futures[0].result(timeout=5)[0]
+        self.assertRegex(url, rf'^https://blob\.test/avatars/{self.user.pk}/[0-9a-f]{{16}}/avatar\.png$')
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.avatar, url)
+        self.assertEqual(set(self.user.avatar_variants), {'64', '128', '256'})
+        self.assertEqual(self.user.bio, 'Founder')
+
+
+class ImageServiceTest(TestCase):
+    def test_variants_are_square_webp(self):
+        variants = ImageService.make_variants(BytesIO(make_image((640, 480), 'RGBA')), sizes=[64, 256])
+
+        self.assertEqual(list(variants), [256, 64])
+        for size, data in variants.items():
+            with Image.open(BytesIO(data)) as image:
+                self.assertEqual(image.format, 'WEBP')
+                self.assertEqual(image.size, (size, size))
+
+    def test_jpeg_decoded_at_reduced_scale(self):
+        variants = ImageService.make_variants(BytesIO(make_image((2000, 2000), format='JPEG')), sizes=[128])
+
+        with Image.open(BytesIO(variants[128])) as image:
+            self.assertEqual(image.size, (128, 128))
+
+    @override_settings(AVATAR_MAX_PIXELS=100)
+    def test_rejects_oversized_images(self):
+        with self.assertRaisesMessage(BlobUploadError, 'too large'):
+            ImageService.make_variants(BytesIO(make_image()))
@@ -2,12 +2,13 @@ from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework import status
+from rest_framework.exceptions import NotAuthenticated
 from django.conf import settings
 from django.shortcuts import redirect
 from django.contrib.auth import get_user_model
 from django.views.decorators.csrf import csrf_exempt
 from django.utils.decorators import method_decorator
-from .models import OAuthState
+from django.utils.http import parse_etags
 import logging
 from dotenv import load_dotenv
 from urllib.parse import urlencode
@@ -18,11 +19,13 @@ from .serializers import (
     UserRegistrationSerializer,
     UserLoginSerializer
 )
+from .services.auth_check_service import AuthCheckService
 from .services.auth_service import AuthService
 from .services.user_service import UserService
-from .services.canva_service import CanvaService
+from .services.canva_service import CanvaService, callback_latency
 from .services.billing_service import BillingService
 from django.contrib.auth import login
+from startup_planner_backend.metrics import PhaseTimer
 
 # Load environment variables from .env file
 load_dotenv()
@@ -39,7 +42,7 @@ class CanvaAuthAPIView(APIView):
 
     def get(self, request, *args, **kwargs):
         code_verifier, code_challenge, state = CanvaService.generate_oauth_params()
-        OAuthState.objects.create(state=state, code_verifier=code_verifier)
+        CanvaService.save_oauth_state(state, code_verifier)
 
         params = CanvaService.get_auth_params(code_challenge, state)
         auth_url = f"https://www.canva.com/api/oauth/authorize?{urlencode(params)}"
@@ -57,15 +60,23 @@ class CanvaCallbackAPIView(APIView):
         if not code or not state:
             return Response({'error': 'Missing code or state parameter'}, status=status.HTTP_400_BAD_REQUEST)
 
-        oauth_state = CanvaService.validate_oauth_state(state)
+        timer = PhaseTimer(histogram=callback_latency)
+        with timer.phase('total'):
+            response = self._complete_login(request, code, state, timer)
+        logger.info(
+            f"Canva callback latency: {timer.summary()}, p95 {callback_latency.percentile('total', 0.95)}ms")
+        return response
 
-        if not oauth_state:
-            return Response({'error': 'Invalid or expired state parameter'}, status=status.HTTP_400_BAD_REQUEST)
+    @staticmethod
+    def _complete_login(request, code, state, timer: PhaseTimer):
+        with timer.phase('validate_state'):
+            code_verifier = CanvaService.consume_oauth_state(state)
 
-        code_verifier = oauth_state.code_verifier
-        oauth_state.delete()  # Clean up the state record
+        if not code_verifier:
+            return Response({'error': 'Invalid or expired state parameter'}, status=status.HTTP_400_BAD_REQUEST)
 
-        tokens = CanvaService.exchange_code_for_tokens(code, code_verifier)
+        with timer.phase('exchange_code'):
+            tokens = CanvaService.exchange_code_for_tokens(code, code_verifier)
         if not tokens:
             return Response({'error': 'Failed to exchange authorization code for access token'}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
@@ -73,18 +84,19 @@ class CanvaCallbackAPIView(APIView):
         refresh_token = tokens.get('refresh_token')
         expires_in = tokens.get('expires_in')
 
-        user_info = CanvaService.get_user_info(access_token)
+        with timer.phase('fetch_user'):
+            user_info, user_profile = CanvaService.get_user_details(access_token)
         if not user_info:
             return Response({'error': 'Failed to fetch user info from Canva'}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
-        user_profile = CanvaService.get_user_profile(access_token)
         if not user_profile:
             return Response({'error': 'Failed to fetch user profile from Canva'}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
-        user = CanvaService.create_or_update_user(
-            user_info, user_profile, access_token, refresh_token, expires_in)
+        with timer.phase('login'):
+            user = CanvaService.create_or_update_user(
+                user_info, user_profile, access_token, refresh_token, expires_in)
 
-        login(request, user)
+            login(request, user)
 
         if user.is_first_time_login():
             return redirect(f"{settings.FRONTEND_URL}/business/create")
@@ -120,10 +132,23 @@ class LogoutAPIView(APIView):
 
 
 class CheckAuthAPIView(APIView):
-    permission_classes = [IsAuthenticated]
+    """
+    Polled by the frontend, so the session is checked by AuthCheckService
+    instead of DRF authentication, which would load the full user row.
+    Answers 304 Not Modified while the client's ETag is current.
+    """
+    permission_classes = [AllowAny]
+    authentication_classes = []
 
     def get(self, request, *args, **kwargs):
-        return Response({'isAuthenticated': True})
+        etag = AuthCheckService.check(request._request)
+        if etag is None:
+            raise NotAuthenticated()
+
+        headers = {'ETag': etag, 'Cache-Control': 'private, no-cache'}
+        if etag in parse_etags(request.headers.get('If-None-Match', '')):
+            return Response(status=status.HTTP_304_NOT_MODIFIED, headers=headers)
+        return Response({'isAuthenticated': True}, headers=headers)
 
 
 class AccountView(APIView):
@@ -0,0 +1,60 @@
+"""
+Gunicorn server profile, loaded automatically when gunicorn is started from
+this directory. Every value can be overridden through the environment:
+
+- GUNICORN_WORKER_CLASS: 'sync', 'gthread' (default) or 'uvicorn'. uvicorn
+  serves asgi.py; the others serve wsgi.py.
+- WEB_CONCURRENCY: worker processes; 4 for sync and 2 otherwise by default.
+- GUNICORN_THREADS: threads per gthread worker.
+- GUNICORN_TIMEOUT, GUNICORN_GRACEFUL_TIMEOUT, GUNICORN_KEEPALIVE: seconds.
+- GUNICORN_MAX_REQUESTS, GUNICORN_MAX_REQUESTS_JITTER: recycle workers after
+  this many requests, so slow memory growth never accumulates.
+
+Each worker thread holds its own persistent database connection, so one
+server opens up to workers x threads connections: 8 with the defaults. The
+defaults are fixed rather than derived from the CPU count, which reports the
+host's cores inside containers and dynos. Raise WEB_CONCURRENCY only as far
+as the database's connection limit allows.
+
+Research runs in the research workers, so requests here are short CRUD calls
+that mostly wait on the database. gthread overlaps that wait within a process
+at a lower memory cost than more sync workers. Under uvicorn, Django runs the
+(synchronous) DRF views on one thread per worker, so it only pays off for
+async views and long-polling clients.
+"""
+
+import os
+
+WORKER_CLASSES = {
+    'sync': 'sync',
+    'gthread': 'gthread',
+    'uvicorn': 'uvicorn_worker.UvicornWorker',
+}
+
+profile = os.getenv('GUNICORN_WORKER_CLASS', 'gthread')
+if profile not in WORKER_CLASSES:
+    raise ValueError(f"Unknown GUNICORN_WORKER_CLASS: {profile}")
+
+# Sync workers block for the whole request, so they need more processes;
+# gthread and uvicorn workers already overlap I/O within a process.
+default_workers = 4 if profile == 'sync' else 2
+
+worker_class = WORKER_CLASSES[profile]
+workers = int(os.getenv('WEB_CONCURRENCY', default_workers))
+threads = int(os.getenv('GUNICORN_THREADS', 4 if profile == 'gthread' else 1))
+wsgi_app = ('startup_planner_backend.asgi:application' if profile == 'uvicorn'
+            else 'startup_planner_backend.wsgi:application')
+
+bind = os.getenv('GUNICORN_BIND', f"0.0.0.0:{os.getenv('PORT', '8000')}")
+timeout = int(os.getenv('GUNICORN_TIMEOUT', 120))
+graceful_timeout = int(os.getenv('GUNICORN_GRACEFUL_TIMEOUT', 30))
+keepalive = int(os.getenv('GUNICORN_KEEPALIVE', 5))
+max_requests = int(os.getenv('GUNICORN_MAX_REQUESTS', 1000))
+max_requests_jitter = int(os.getenv('GUNICORN_MAX_REQUESTS_JITTER', 100))
+
+accesslog = os.getenv('GUNICORN_ACCESS_LOG', '-') or None
+
+
+def when_ready(server):
+    server.log.info(
+        f"Serving {wsgi_app} with {workers} {profile} workers x {threads} threads")
@@ -0,0 +1,111 @@
+import bisect
+import time
+from contextlib import contextmanager
+from threading import Lock
+from typing import Optional
+
+
+class PhaseTimer:
+    """
+    Accumulates wall-clock latency per named phase of a multi-step operation.
+    """
+
+    def __init__(self, histogram: Optional['LatencyHistogram'] = None):
+        self.histogram = histogram
+        self._durations = {}
+        self._lock = Lock()
+
+    @contextmanager
+    def phase(self, name: str):
+        started = time.monotonic()
+        try:
+            yield
+        finally:
+            self.record(name, time.monotonic() - started)
+
+    def record(self, name: str, seconds: float):
+        with self._lock:
+            self._durations[name] = self._durations.get(name, 0.0) + seconds
+        if self.histogram is not None:
+            self.histogram.observe(name, seconds)
+
+    def summary(self) -> dict[str, float]:
+        """
+        Returns the accumulated latency of each phase in milliseconds.
+        """
+        with self._lock:
+            return {name: round(seconds * 1000, 1) for name, seconds in self._durations.items()}
+
+
+class LatencyHistogram:
+    """
+    Process-wide latency distribution per phase, bucketed in milliseconds.
+    """
+
+    BUCKETS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000)
+
+    def __init__(self, buckets: tuple = BUCKETS):
+        self.buckets = tuple(buckets)
+        self._counts = {}
+        self._totals = {}
+        self._lock = Lock()
+
+    def observe(self, name: str, seconds: float):
+        milliseconds = seconds * 1000
+        index = bisect.bisect_left(self.buckets, milliseconds)
+        with self._lock:
+            counts = self._counts.setdefault(name, [0] * (len(self.buckets) + 1))
+            counts[index] += 1
+            self._totals[name] = self._totals.get(name, 0.0) + milliseconds
+
+    def percentile(self, name: str, quantile: float) -> Optional[float]:
+        """
+        Returns the upper bound in milliseconds of the bucket holding the
+        given quantile, or None when nothing was observed. Observations above
+        the last bucket are reported as infinity.
+        """
+        with self._lock:
+            counts = list(self._counts.get(name, ()))
+        total = sum(counts)
+        if not total:
+            return None
+
+        rank = quantile * total
+        seen = 0
+        for index, count in enumerate(counts):
+            seen += count
+            if seen >= rank:
+                break
+        return self.buckets[index] if index < len(self.buckets) else float('inf')
+
+    def snapshot(self) -> dict[str, dict]:
+        """
+        Returns the count, mean, p50, p95 and p99 in milliseconds, and the
+        cumulative bucket counts of each phase.
+        """
+        with self._lock:
+            names = list(self._counts)
+            counts = {name: list(self._counts[name]) for name in names}
+            totals = dict(self._totals)
+
+        snapshot = {}
+        for name in names:
+            count = sum(counts[name])
+            cumulative, buckets = 0, {}
+            for bound, bucket_count in zip(self.buckets + ('+Inf',), counts[name]):
+                cumulative += bucket_count
+                buckets[str(bound)] = cumulative
+            snapshot[name] = {
+                'count': count,
+                'mean': round(totals[name] / count, 1),
+                'p50': self.percentile(name, 0.5),
+                'p95': self.percentile(name, 0.95),
+                'p99': self.percentile(name, 0.99),
+                'buckets': buckets,
+            }
+        return snapshot
+
+    def reset(self):
+        with self._lock:
+            self._counts.clear()
+            self._totals.clear()
@@ -11,6 +11,7 @@ https://docs.djangoproject.com/en/3.x/ref/settings/
 """
 
 import os
+import tempfile
 from pathlib import Path
 from dotenv import load_dotenv
 import dj_database_url
@@ -88,17 +89,200 @@ WSGI_APPLICATION = 'startup_planner_backend.wsgi.application'
 CANVA_CLIENT_ID = os.getenv("CANVA_CLIENT_ID")
 CANVA_CLIENT_SECRET = os.getenv("CANVA_CLIENT_SECRET")
 CANVA_REDIRECT_URI = os.getenv("CANVA_REDIRECT_URI")
+# Access tokens are refreshed this many seconds before they expire.
+CANVA_TOKEN_REFRESH_MARGIN = int(os.getenv("CANVA_TOKEN_REFRESH_MARGIN", 300))
+CANVA_TOKEN_CACHE_ALIAS = os.getenv("CANVA_TOKEN_CACHE_ALIAS", "default")
+
+CANVA_API_POOL_SIZE = int(os.getenv("CANVA_API_POOL_SIZE", 10))
+CANVA_API_CONNECT_TIMEOUT = float(os.getenv("CANVA_API_CONNECT_TIMEOUT", 3.05))
+CANVA_API_READ_TIMEOUT = float(os.getenv("CANVA_API_READ_TIMEOUT", 10))
+CANVA_API_MAX_RETRIES = int(os.getenv("CANVA_API_MAX_RETRIES", 3))
+CANVA_API_BACKOFF = float(os.getenv("CANVA_API_BACKOFF", 0.5))
+CANVA_API_MAX_BACKOFF = float(os.getenv("CANVA_API_MAX_BACKOFF", 8))
+
+# Where pending OAuth states live: "cache" (falls back to "database" when the
+# cache is not shared between processes) or "database".
+OAUTH_STATE_STORE = os.getenv("OAUTH_STATE_STORE", "cache")
+OAUTH_STATE_CACHE_ALIAS = os.getenv("OAUTH_STATE_CACHE_ALIAS", "default")
+OAUTH_STATE_TTL = int(os.getenv("OAUTH_STATE_TTL", 600))
+# Session auth hashes cached for the check-auth endpoint, so polling it does
+# not load the user. Needs a cache shared by all workers; 0 disables it.
+AUTH_CHECK_CACHE_ALIAS = os.getenv("AUTH_CHECK_CACHE_ALIAS", "default")
+AUTH_CHECK_CACHE_TIMEOUT = int(os.getenv("AUTH_CHECK_CACHE_TIMEOUT", 300))
+
+# BLOB STORAGE
+
+BLOB_READ_WRITE_TOKEN = os.getenv("BLOB_READ_WRITE_TOKEN")
+BLOB_CACHE_MAX_AGE = int(os.getenv("BLOB_CACHE_MAX_AGE", 31536000))
+BLOB_UPLOAD_CHUNK_SIZE = int(os.getenv("BLOB_UPLOAD_CHUNK_SIZE", 64 * 1024))
+BLOB_UPLOAD_POOL_SIZE = int(os.getenv("BLOB_UPLOAD_POOL_SIZE", 10))
+BLOB_UPLOAD_TIMEOUT = float(os.getenv("BLOB_UPLOAD_TIMEOUT", 30))
+AVATAR_MAX_UPLOAD_SIZE = int(os.getenv("AVATAR_MAX_UPLOAD_SIZE", 5 * 1024 * 1024))
+# Upload avatars on a background thread and answer the request right away.
+AVATAR_UPLOAD_IN_BACKGROUND = os.getenv(
+    "AVATAR_UPLOAD_IN_BACKGROUND", "False").lower() in ('true', '1', 'yes')
+AVATAR_UPLOAD_WORKERS = int(os.getenv("AVATAR_UPLOAD_WORKERS", 4))
+# Edge lengths in pixels of the square WebP thumbnails made for each avatar.
+AVATAR_VARIANT_SIZES = [int(size) for size in os.getenv(
+    "AVATAR_VARIANT_SIZES", "64,128,256").split(',')]
+AVATAR_VARIANT_QUALITY = int(os.getenv("AVATAR_VARIANT_QUALITY", 80))
+# Larger images are rejected before they are decoded.
+AVATAR_MAX_PIXELS = int(os.getenv("AVATAR_MAX_PIXELS", 40_000_000))
 
 # FRONTEND
 
 FRONTEND_URL = os.getenv("FRONTEND_URL")
 
+# OPENAI
+
+# Pins the research assistant; otherwise it is looked up in the
+# AssistantRegistration table by a hash of its definition (created on first use).
+OPENAI_ASSISTANT_ID = os.getenv('OPENAI_ASSISTANT_ID')
+
+# Competitor research jobs
+
+RESEARCH_WORKER_CONCURRENCY = int(os.getenv('RESEARCH_WORKER_CONCURRENCY', 4))
+RESEARCH_WORKER_POLL_INTERVAL = float(
+    os.getenv('RESEARCH_WORKER_POLL_INTERVAL', 1.0))
+RESEARCH_JOB_STALE_AFTER = int(os.getenv('RESEARCH_JOB_STALE_AFTER', 600))
+# Running jobs record a heartbeat this often; a job without one for
+# RESEARCH_JOB_STALE_AFTER seconds is requeued, so keep it well below that.
+RESEARCH_JOB_HEARTBEAT_INTERVAL = float(
+    os.getenv('RESEARCH_JOB_HEARTBEAT_INTERVAL', 60))
+RESEARCH_JOB_MAX_ATTEMPTS = int(os.getenv('RESEARCH_JOB_MAX_ATTEMPTS', 3))
+# Jobs one `run_research_workers --async` process keeps running at once.
+RESEARCH_ASYNC_MAX_IN_FLIGHT = int(
+    os.getenv('RESEARCH_ASYNC_MAX_IN_FLIGHT', 200))
+
+# Assistant runs are executed by consuming run events ('stream') or by polling
+# the run with exponential backoff ('poll').
+RESEARCH_RUN_MODE = os.getenv('RESEARCH_RUN_MODE', 'stream')
+RESEARCH_POLL_INITIAL_INTERVAL = float(
+    os.getenv('RESEARCH_POLL_INITIAL_INTERVAL', 0.25))
+RESEARCH_POLL_MAX_INTERVAL = float(
+    os.getenv('RESEARCH_POLL_MAX_INTERVAL', 4.0))
+
+# Tool calls of a run step are searched concurrently, bounded by these limits.
+RESEARCH_SEARCH_CONCURRENCY = int(os.getenv('RESEARCH_SEARCH_CONCURRENCY', 4))
+RESEARCH_SEARCH_TIMEOUT = float(os.getenv('RESEARCH_SEARCH_TIMEOUT', 15))
+# Default request budgets of the research_competitors batch command and of
+# `run_research_workers --async`, shared by all of their jobs. 0 disables a limit.
+RESEARCH_OPENAI_RPM = float(os.getenv('RESEARCH_OPENAI_RPM', 300))
+RESEARCH_SEARCH_RPM = float(os.getenv('RESEARCH_SEARCH_RPM', 30))
+# "json_schema" asks for structured outputs validated against the competitor
+# models, "text" relies on the assistant instructions alone.
+RESEARCH_RESPONSE_FORMAT = os.getenv('RESEARCH_RESPONSE_FORMAT', 'json_schema')
+# Longer assistant answers are cut to this many characters before parsing.
+RESEARCH_RESPONSE_MAX_CHARS = int(
+    os.getenv('RESEARCH_RESPONSE_MAX_CHARS', 200_000))
+# Research for a business in the same industry with a similar description
+# (Jaccard similarity of description shingles) is reused when it is at most
+# MAX_AGE seconds old: 'replace' skips the assistant run, 'seed' passes the
+# reused competitors to the run as candidates, 'off' always researches afresh.
+# Reused research may come from another user's business, so it is opt-in.
+RESEARCH_REUSE_MODE = os.getenv('RESEARCH_REUSE_MODE', 'off')
+RESEARCH_REUSE_THRESHOLD = float(os.getenv('RESEARCH_REUSE_THRESHOLD', 0.6))
+RESEARCH_REUSE_MAX_AGE = int(os.getenv('RESEARCH_REUSE_MAX_AGE', 7 * 24 * 60 * 60))
+RESEARCH_REUSE_MAX_CANDIDATES = int(os.getenv('RESEARCH_REUSE_MAX_CANDIDATES', 50))
+
+# Search results cache: 'memory' (per-process LRU), 'django' (shared through
+# the SEARCH_CACHE_ALIAS cache backend) or 'none'.
+SEARCH_CACHE_BACKEND = os.getenv('SEARCH_CACHE_BACKEND', 'memory')
+SEARCH_CACHE_MAX_ENTRIES = int(os.getenv('SEARCH_CACHE_MAX_ENTRIES', 1024))
+SEARCH_CACHE_ALIAS = os.getenv('SEARCH_CACHE_ALIAS', 'default')
+
+# Pooled DuckDuckGo clients are recycled after errors, MAX_AGE seconds or
+# MAX_USES searches.
+SEARCH_CLIENT_POOL_SIZE = int(
+    os.getenv('SEARCH_CLIENT_POOL_SIZE', RESEARCH_SEARCH_CONCURRENCY))
+SEARCH_CLIENT_MAX_AGE = float(os.getenv('SEARCH_CLIENT_MAX_AGE', 300))
+SEARCH_CLIENT_MAX_USES = int(os.getenv('SEARCH_CLIENT_MAX_USES', 100))
+SEARCH_CLIENT_TIMEOUT = int(os.getenv('SEARCH_CLIENT_TIMEOUT', 10))
+
 # Database
 # https://docs.djangoproject.com/en/3.x/ref/settings/#databases
 
+# Connections are kept open for DATABASE_CONN_MAX_AGE seconds (0 closes them
+# after every request) and checked before reuse. Each gunicorn thread keeps
+# its own connection. Under the uvicorn (ASGI) profile, requests run on
+# changing threads, so connections are never kept. DATABASE_POOL uses
+# psycopg 3's connection pool instead (PostgreSQL only). SSL is required by
+# default for a PostgreSQL DATABASE_URL.
+DATABASE_IS_POSTGRES = os.getenv('DATABASE_URL', '').startswith(('postgres://', 'postgresql://', 'postgis://'))
+DATABASE_CONN_MAX_AGE = int(os.getenv('DATABASE_CONN_MAX_AGE', 600))
+if os.getenv('GUNICORN_WORKER_CLASS') == 'uvicorn':
+    DATABASE_CONN_MAX_AGE = 0
+DATABASE_CONN_HEALTH_CHECKS = os.getenv(
+    'DATABASE_CONN_HEALTH_CHECKS', 'True').lower() in ('true', '1', 'yes')
+DATABASE_SSL_REQUIRE = DATABASE_IS_POSTGRES and os.getenv(
+    'DATABASE_SSL_REQUIRE', 'True').lower() in ('true', '1', 'yes')
+DATABASE_POOL = os.getenv('DATABASE_POOL', 'False').lower() in ('true', '1', 'yes')
+if DATABASE_POOL and not DATABASE_IS_POSTGRES:
+    raise ValueError("DATABASE_POOL requires a PostgreSQL DATABASE_URL")
+DATABASE_POOL_MIN_SIZE = int(os.getenv('DATABASE_POOL_MIN_SIZE', 2))
+DATABASE_POOL_MAX_SIZE = int(os.getenv('DATABASE_POOL_MAX_SIZE', 10))
+DATABASE_POOL_TIMEOUT = float(os.getenv('DATABASE_POOL_TIMEOUT', 10))
+
 DATABASES = {
-    'default': dj_database_url.config(default=f"sqlite:///{BASE_DIR}/db.sqlite3")
+    'default': dj_database_url.config(
+        default=f"sqlite:///{BASE_DIR}/db.sqlite3",
+        # Pooled connections are returned to the pool after each request.
+        conn_max_age=0 if DATABASE_POOL else DATABASE_CONN_MAX_AGE,
+        conn_health_checks=DATABASE_CONN_HEALTH_CHECKS,
+        ssl_require=DATABASE_SSL_REQUIRE,
+    )
+}
+if DATABASE_POOL:
+    DATABASES['default'].setdefault('OPTIONS', {})['pool'] = {
+        'min_size': DATABASE_POOL_MIN_SIZE,
+        'max_size': DATABASE_POOL_MAX_SIZE,
+        'timeout': DATABASE_POOL_TIMEOUT,
+    }
+
+# Cache
+# https://docs.djangoproject.com/en/5.0/topics/cache/
+
+# 'locmem' (per process), 'file' (shared by the processes of one host) or
+# 'redis' (shared by all hosts). CACHE_LOCATION is the cache name, directory
+# or Redis URL respectively.
+CACHE_BACKEND = os.getenv('CACHE_BACKEND', 'locmem')
+CACHE_BACKENDS = {
+    'locmem': ('django.core.cache.backends.locmem.LocMemCache', 'startup-planner'),
+    'file': ('django.core.cache.backends.filebased.FileBasedCache',
+             os.path.join(tempfile.gettempdir(), 'startup_planner_cache')),
+    'redis': ('django.core.cache.backends.redis.RedisCache',
+              os.getenv('REDIS_URL', 'redis://127.0.0.1:6379/0')),
+}
+if CACHE_BACKEND not in CACHE_BACKENDS:
+    raise ValueError(f"Unknown CACHE_BACKEND: {CACHE_BACKEND}")
+
+CACHES = {
+    'default': {
+        'BACKEND': CACHE_BACKENDS[CACHE_BACKEND][0],
+        'LOCATION': os.getenv('CACHE_LOCATION', CACHE_BACKENDS[CACHE_BACKEND][1]),
+        'KEY_PREFIX': os.getenv('CACHE_KEY_PREFIX', 'startup_planner'),
+        'TIMEOUT': int(os.getenv('CACHE_TIMEOUT', 300)),
+    }
+}
+
+# Sessions: 'cached_db' reads sessions from the cache and writes them through
+# to the database, 'cache' keeps them in the cache only (use a shared cache),
+# 'signed_cookies' stores them in the cookie (they cannot be revoked on the
+# server until they expire) and 'db' always reads the database. The default
+# avoids caching sessions in a per-process cache, where a logout would not
+# reach the copies cached by other workers.
+SESSION_STORE = os.getenv(
+    'SESSION_STORE', 'db' if CACHE_BACKEND == 'locmem' else 'cached_db')
+SESSION_ENGINES = {
+    'db': 'django.contrib.sessions.backends.db',
+    'cached_db': 'django.contrib.sessions.backends.cached_db',
+    'cache': 'django.contrib.sessions.backends.cache',
+    'signed_cookies': 'django.contrib.sessions.backends.signed_cookies',
 }
+if SESSION_STORE not in SESSION_ENGINES:
+    raise ValueError(f"Unknown SESSION_STORE: {SESSION_STORE}")
+SESSION_ENGINE = SESSION_ENGINES[SESSION_STORE]
+SESSION_CACHE_ALIAS = os.getenv('SESSION_CACHE_ALIAS', 'default')
 
 # CSRF
 
@@ -169,4 +353,5 @@ STATIC_ROOT = os.path.join(BASE_DIR, 'staticfiles')
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
-django_heroku.settings(locals())
+# DATABASES is configured above, so django_heroku must not replace it.
+django_heroku.settings(locals(), databases=False)
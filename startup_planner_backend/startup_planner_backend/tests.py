@@ -0,0 +1,93 @@
+import os
+import runpy
+from pathlib import Path
+from unittest.mock import patch
+
+from django.test import SimpleTestCase
+
+SETTINGS_PATH = Path(__file__).resolve().parent / 'settings.py'
+
+
+def load_settings(**environ) -> dict:
+    """
+    Evaluates settings.py with the given environment variables set, or unset
+    when None, and returns the resulting settings.
+    """
+    environ.setdefault('DATABASE_URL', None)
+    with patch.dict(os.environ):
+        for name, value in environ.items():
+            if value is None:
+                os.environ.pop(name, None)
+            else:
+                os.environ[name] = value
+        return runpy.run_path(str(SETTINGS_PATH))
+
+
+class DatabaseSettingsTest(SimpleTestCase):
+    def test_persistent_connections_by_default(self):
+        database = load_settings()['DATABASES']['default']
+
+        self.assertEqual(database['CONN_MAX_AGE'], 600)
+        self.assertTrue(database['CONN_HEALTH_CHECKS'])
+
+    def test_asgi_profile_closes_connections(self):
+        settings = load_settings(GUNICORN_WORKER_CLASS='uvicorn', DATABASE_CONN_MAX_AGE='600')
+
+        self.assertEqual(settings['DATABASES']['default']['CONN_MAX_AGE'], 0)
+
+    def test_ssl_only_required_for_postgres(self):
+        sqlite = load_settings(DATABASE_URL='sqlite:////tmp/startup-planner.sqlite3')
+        self.assertFalse(sqlite['DATABASE_SSL_REQUIRE'])
+        self.assertNotIn('sslmode', sqlite['DATABASES']['default'].get('OPTIONS', {}))
+
+        postgres = load_settings(DATABASE_URL='postgres://user:password@db:5432/app')
+        self.assertEqual(postgres['DATABASES']['default']['OPTIONS']['sslmode'], 'require')
+
+    def test_pool(self):
+        settings = load_settings(DATABASE_URL='postgres://user:password@db:5432/app', DATABASE_POOL='true',
+                                 DATABASE_POOL_MAX_SIZE='4')
+
+        database = settings['DATABASES']['default']
+        self.assertEqual(database['CONN_MAX_AGE'], 0)
+        self.assertEqual(database['OPTIONS']['pool']['max_size'], 4)
+
+        with self.assertRaisesMessage(ValueError, "DATABASE_POOL requires a PostgreSQL DATABASE_URL"):
+            load_settings(DATABASE_POOL='true')
+
+
+class CacheAndSessionSettingsTest(SimpleTestCase):
+    def test_cache_backend_selection(self):
+        locmem = load_settings(CACHE_BACKEND=None, CACHE_LOCATION=None)['CACHES']['default']
+        self.assertEqual(locmem['BACKEND'], 'django.core.cache.backends.locmem.LocMemCache')
+
+        redis = load_settings(CACHE_BACKEND='redis', CACHE_LOCATION=None,
+                              REDIS_URL='redis://cache:6379/1')['CACHES']['default']
+        self.assertEqual(redis['BACKEND'], 'django.core.cache.backends.redis.RedisCache')
+        self.assertEqual(redis['LOCATION'], 'redis://cache:6379/1')
+
+        file = load_settings(CACHE_BACKEND='file', CACHE_LOCATION='/tmp/cache')['CACHES']['default']
+        self.assertEqual(file['BACKEND'], 'django.core.cache.backends.filebased.FileBasedCache')
+        self.assertEqual(file['LOCATION'], '/tmp/cache')
+
+    def test_session_store_defaults_to_database_with_local_cache(self):
+        settings = load_settings(CACHE_BACKEND='locmem', SESSION_STORE=None)
+
+        self.assertEqual(settings['SESSION_ENGINE'], 'django.contrib.sessions.backends.db')
+
+    def test_session_store_defaults_to_cached_database_with_shared_cache(self):
+        for backend in ('file', 'redis'):
+            with self.subTest(backend=backend):
+                settings = load_settings(CACHE_BACKEND=backend, SESSION_STORE=None)
+                self.assertEqual(settings['SESSION_ENGINE'], 'django.contrib.sessions.backends.cached_db')
+
+    def test_session_store_selection(self):
+        settings = load_settings(CACHE_BACKEND='redis', SESSION_STORE='signed_cookies')
+
+        self.assertEqual(settings['SESSION_ENGINE'], 'django.contrib.sessions.backends.signed_cookies')
+
+    def test_unknown_backends_are_rejected(self):
+        with self.assertRaisesMessage(ValueError, "Unknown CACHE_BACKEND: memcached"):
+            load_settings(CACHE_BACKEND='memcached')
+
+        with self.assertRaisesMessage(ValueError, "Unknown SESSION_STORE: redis"):
+            load_settings(CACHE_BACKEND='locmem', SESSION_STORE='redis')